@@ -23,6 +23,15 @@ CREATE TABLE "doctors" (
     "phone" TEXT,
     "bio" TEXT,
     "approved" BOOLEAN NOT NULL DEFAULT false,
+    "rating_sum" INTEGER NOT NULL DEFAULT 0,
+    "rating_count" INTEGER NOT NULL DEFAULT 0,
+    "rating_avg" REAL NOT NULL DEFAULT 0,
+    "rating_1" INTEGER NOT NULL DEFAULT 0,
+    "rating_2" INTEGER NOT NULL DEFAULT 0,
+    "rating_3" INTEGER NOT NULL DEFAULT 0,
+    "rating_4" INTEGER NOT NULL DEFAULT 0,
+    "rating_5" INTEGER NOT NULL DEFAULT 0,
+    "subscription_count" INTEGER NOT NULL DEFAULT 0,
     "created_at" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     "updated_at" DATETIME NOT NULL,
     CONSTRAINT "doctors_user_id_fkey" FOREIGN KEY ("user_id") REFERENCES "users" ("id") ON DELETE CASCADE ON UPDATE CASCADE
@@ -110,6 +119,16 @@ CREATE TABLE "reviews" (
     CONSTRAINT "reviews_doctor_id_fkey" FOREIGN KEY ("doctor_id") REFERENCES "doctors" ("id") ON DELETE CASCADE ON UPDATE CASCADE
 );
 
+-- CreateTable
+-- Full-text index of doctors, rowid = doctors.id. Holds text normalized by
+-- src/lib/arabic.ts, kept in sync by src/lib/search.ts and rebuilt by
+-- `npm run db:search-index`
+CREATE VIRTUAL TABLE "doctors_fts" USING fts5(
+    name, specialty, city, clinic_address, bio,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
 -- CreateIndex
 CREATE UNIQUE INDEX "users_email_key" ON "users"("email");
 
@@ -125,6 +144,12 @@ CREATE INDEX "doctors_city_idx" ON "doctors"("city");
 -- CreateIndex
 CREATE INDEX "doctors_approved_idx" ON "doctors"("approved");
 
+-- CreateIndex
+CREATE INDEX "doctors_rating_avg_idx" ON "doctors"("rating_avg");
+
+-- CreateIndex
+CREATE INDEX "doctors_subscription_count_idx" ON "doctors"("subscription_count");
+
 -- CreateIndex
 CREATE INDEX "appointments_doctor_id_idx" ON "appointments"("doctor_id");
 
@@ -134,3 +159,7 @@ CREATE INDEX "appointments_date_idx" ON "appointments"("date");
 -- CreateIndex
 CREATE INDEX "appointments_status_idx" ON "appointments"("status");
 
+-- CreateIndex
+-- One active booking per doctor, day and time. Cancelled ones free the slot, which Prisma cannot express
+CREATE UNIQUE INDEX "appointments_active_slot_key" ON "appointments"("doctor_id", "date", "time") WHERE "status" <> 'CANCELLED';
+
@@ -4,6 +4,10 @@ import { createClient } from '@libsql/client';
 import * as bcrypt from 'bcryptjs';
 import * as dotenv from 'dotenv';
 import * as path from 'path';
+import { repairRatings } from '../scripts/repair-ratings';
+import { repairSubscriptionCounts } from '../scripts/repair-subscription-counts';
+import { ensureBookingIndex } from '../scripts/booking-index';
+import { rebuildSearchIndex } from '../scripts/rebuild-search-index';
 
 dotenv.config({ path: path.join(__dirname, '..', '.env') });
 
@@ -173,6 +177,8 @@ async function main() {
             comment: 'طبيب ممتاز ومعاملة راقية',
         },
     });
+    // Upserted, so count it from the reviews table rather than incrementing
+    await repairRatings(libsql);
     console.log('✅ Sample review created');
 
     const doctorAccount = await prisma.user.upsert({
@@ -223,6 +229,8 @@ async function main() {
             endDate: new Date(Date.now() + 30 * 24 * 60 * 60 * 1000),
         },
     });
+    // Upserted like the reviews, so count them from the table
+    await repairSubscriptionCounts(libsql);
     console.log('✅ Specific doctor and subscription created:', doctorProfile.name);
 
     // Create appointment for second doctor so patient shows in their dashboard
@@ -240,6 +248,13 @@ async function main() {
     });
     console.log('✅ Appointment for second doctor created');
 
+    // `prisma db push` does not know the partial index and leaves it out
+    await ensureBookingIndex(libsql);
+    console.log('✅ Booking slot index created');
+
+    const indexed = await rebuildSearchIndex(libsql);
+    console.log(`✅ Search index built for ${indexed} doctors`);
+
     console.log('🎉 Database seeding completed!');
     console.log('\n📋 Default credentials:');
     console.log('   Admin: admin@docteur.dz / admin123');
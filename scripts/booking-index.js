@@ -0,0 +1,87 @@
+const { createClient } = require('@libsql/client');
+const path = require('path');
+require('dotenv').config({ path: path.join(__dirname, '..', '.env') });
+
+// Creates appointments_active_slot_key, the unique index that keeps a slot
+// (doctor, day, time) to one non-cancelled appointment, on databases created
+// before it existed or after `prisma db push` dropped it. Appointment dates
+// written with a time of day are moved to midnight UTC of that day first, as
+// the booking route stores them. Where a slot is already held twice, the
+// first booking keeps it and the later ones are cancelled.
+//
+//   npm run db:booking-index             normalize, resolve and create the index
+//   npm run db:booking-index -- --check  only list slots booked more than once
+
+const CREATE_INDEX = `
+    CREATE UNIQUE INDEX IF NOT EXISTS "appointments_active_slot_key"
+    ON "appointments"("doctor_id", "date", "time") WHERE "status" <> 'CANCELLED'`;
+
+// DateTime as the Prisma libSQL adapter writes it: 2025-03-01T00:00:00.000+00:00
+const NORMALIZE_DATES = `
+    UPDATE appointments SET date = substr(date, 1, 10) || 'T00:00:00.000+00:00'
+    WHERE typeof(date) = 'text' AND date NOT LIKE '____-__-__T00:00:00.000+00:00'`;
+
+const DAY = `substr(date, 1, 10)`;
+
+const DUPLICATES_QUERY = `
+    SELECT doctor_id, ${DAY} AS day, time, COUNT(*) AS bookings, MIN(id) AS kept
+    FROM appointments WHERE status <> 'CANCELLED'
+    GROUP BY doctor_id, ${DAY}, time HAVING COUNT(*) > 1
+    ORDER BY doctor_id, day, time`;
+
+const CANCEL_DUPLICATES = `
+    UPDATE appointments
+    SET status = 'CANCELLED', updated_at = strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')
+    WHERE status <> 'CANCELLED' AND id NOT IN (
+        SELECT MIN(id) FROM appointments WHERE status <> 'CANCELLED'
+        GROUP BY doctor_id, ${DAY}, time
+    )`;
+
+// One write transaction: duplicates go first so that moving dates to
+// midnight cannot collide with an index that already exists
+async function ensureBookingIndex(db) {
+    const [cancelled] = await db.batch([CANCEL_DUPLICATES, NORMALIZE_DATES, CREATE_INDEX], 'write');
+    return cancelled.rowsAffected;
+}
+
+async function main() {
+    const url = process.env.TURSO_DATABASE_URL;
+    if (!url) {
+        console.error('Missing TURSO_DATABASE_URL');
+        process.exit(1);
+    }
+    const db = createClient({ url, authToken: process.env.TURSO_AUTH_TOKEN });
+    const checkOnly = process.argv.includes('--check');
+    try {
+        const duplicates = (await db.execute(DUPLICATES_QUERY)).rows;
+        if (duplicates.length > 0) {
+            console.log(`⚠️ ${duplicates.length} slots are held by more than one active appointment`);
+            console.table(duplicates.slice(0, 20));
+        }
+        if (checkOnly) {
+            if (duplicates.length === 0) {
+                console.log('✅ No slot is booked twice');
+            } else {
+                process.exitCode = 1;
+            }
+            return;
+        }
+
+        const cancelled = await ensureBookingIndex(db);
+        if (cancelled > 0) {
+            console.log(`➖ Cancelled ${cancelled} later bookings of those slots`);
+        }
+        console.log('✅ Booking slot index in place');
+    } finally {
+        db.close();
+    }
+}
+
+if (require.main === module) {
+    main().catch(e => {
+        console.error('❌ Booking index failed:', e);
+        process.exit(1);
+    });
+}
+
+module.exports = { ensureBookingIndex };
@@ -0,0 +1,73 @@
+import { createClient, type Client } from '@libsql/client';
+import * as dotenv from 'dotenv';
+import * as path from 'path';
+import { indexText } from '../src/lib/arabic';
+
+dotenv.config({ path: path.join(__dirname, '..', '.env') });
+
+// Creates the doctors_fts full-text index if it is missing and refills it
+// from the doctors table. Run after `prisma db push`, a bulk import or a
+// change to the normalization in src/lib/arabic.ts:
+//
+//   npm run db:search-index
+
+const CREATE_INDEX = `
+    CREATE VIRTUAL TABLE IF NOT EXISTS "doctors_fts" USING fts5(
+        name, specialty, city, clinic_address, bio,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )`;
+
+const BATCH_SIZE = 500;
+
+export async function rebuildSearchIndex(db: Client): Promise<number> {
+    await db.execute(CREATE_INDEX);
+    const doctors = await db.execute('SELECT id, name, specialty, city, clinic_address, bio FROM doctors');
+
+    // One transaction: searches keep seeing the old index until the new one is complete
+    const tx = await db.transaction('write');
+    try {
+        await tx.execute('DELETE FROM doctors_fts');
+        for (let i = 0; i < doctors.rows.length; i += BATCH_SIZE) {
+            await tx.batch(doctors.rows.slice(i, i + BATCH_SIZE).map((row) => ({
+                sql: `INSERT INTO doctors_fts (rowid, name, specialty, city, clinic_address, bio)
+                      VALUES (?, ?, ?, ?, ?, ?)`,
+                args: [
+                    row.id,
+                    indexText(row.name as string),
+                    indexText(row.specialty as string),
+                    indexText(row.city as string),
+                    indexText(row.clinic_address as string | null),
+                    indexText(row.bio as string | null),
+                ],
+            })));
+        }
+        await tx.commit();
+    } finally {
+        tx.close();
+    }
+    await db.execute(`INSERT INTO doctors_fts (doctors_fts) VALUES ('optimize')`);
+    return doctors.rows.length;
+}
+
+async function main() {
+    const url = process.env.TURSO_DATABASE_URL;
+    if (!url) {
+        console.error('Missing TURSO_DATABASE_URL');
+        process.exit(1);
+    }
+    const db = createClient({ url, authToken: process.env.TURSO_AUTH_TOKEN });
+    try {
+        const count = await rebuildSearchIndex(db);
+        console.log(`✅ Indexed ${count} doctors for search`);
+    } finally {
+        db.close();
+    }
+}
+
+if (require.main === module) {
+    main().catch((e) => {
+        console.error('❌ Search index rebuild failed:', e);
+        process.exit(1);
+    });
+}
@@ -0,0 +1,106 @@
+const { createClient } = require('@libsql/client');
+const path = require('path');
+require('dotenv').config({ path: path.join(__dirname, '..', '.env') });
+
+// Rebuilds the rating aggregates stored on doctors (rating_sum, rating_count,
+// rating_avg and the rating_1..rating_5 histogram) from the reviews table.
+// Adds the columns first on databases created before they existed.
+//
+//   npm run db:repair-ratings             recompute every doctor
+//   npm run db:repair-ratings -- --check  only list doctors that drifted
+
+const COLUMNS = [
+    ['rating_sum', 'INTEGER NOT NULL DEFAULT 0'],
+    ['rating_count', 'INTEGER NOT NULL DEFAULT 0'],
+    ['rating_avg', 'REAL NOT NULL DEFAULT 0'],
+    ['rating_1', 'INTEGER NOT NULL DEFAULT 0'],
+    ['rating_2', 'INTEGER NOT NULL DEFAULT 0'],
+    ['rating_3', 'INTEGER NOT NULL DEFAULT 0'],
+    ['rating_4', 'INTEGER NOT NULL DEFAULT 0'],
+    ['rating_5', 'INTEGER NOT NULL DEFAULT 0'],
+];
+
+const AGGREGATES = `
+    SELECT doctor_id,
+        SUM(rating) AS rating_sum,
+        COUNT(*) AS rating_count,
+        CAST(SUM(rating) AS REAL) / COUNT(*) AS rating_avg,
+        SUM(rating = 1) AS rating_1,
+        SUM(rating = 2) AS rating_2,
+        SUM(rating = 3) AS rating_3,
+        SUM(rating = 4) AS rating_4,
+        SUM(rating = 5) AS rating_5
+    FROM reviews GROUP BY doctor_id`;
+
+// Both statements run in one write transaction, so reviews added meanwhile
+// are either fully counted or not yet inserted
+const REPAIR_STATEMENTS = [
+    `UPDATE doctors SET ${COLUMNS.map(([name]) => `${name} = 0`).join(', ')}
+     WHERE id NOT IN (SELECT doctor_id FROM reviews)`,
+    `UPDATE doctors SET ${COLUMNS.map(([name]) => `${name} = agg.${name}`).join(', ')}
+     FROM (${AGGREGATES}) AS agg WHERE agg.doctor_id = doctors.id`,
+];
+
+const DRIFT_QUERY = `
+    SELECT d.id, d.name, d.rating_sum, d.rating_count,
+        COALESCE(agg.rating_sum, 0) AS expected_sum, COALESCE(agg.rating_count, 0) AS expected_count
+    FROM doctors d LEFT JOIN (${AGGREGATES}) AS agg ON agg.doctor_id = d.id
+    WHERE ${COLUMNS.map(([name]) => `d.${name} IS NOT COALESCE(agg.${name}, 0)`).join(' OR ')}`;
+
+async function ensureColumns(db) {
+    const existing = new Set((await db.execute('PRAGMA table_info(doctors)')).rows.map(row => row.name));
+    const missing = COLUMNS.filter(([name]) => !existing.has(name));
+    for (const [name, type] of missing) {
+        await db.execute(`ALTER TABLE doctors ADD COLUMN ${name} ${type}`);
+    }
+    await db.execute('CREATE INDEX IF NOT EXISTS "doctors_rating_avg_idx" ON "doctors"("rating_avg")');
+    return missing.map(([name]) => name);
+}
+
+async function repairRatings(db) {
+    await db.batch(REPAIR_STATEMENTS, 'write');
+}
+
+async function main() {
+    const url = process.env.TURSO_DATABASE_URL;
+    if (!url) {
+        console.error('Missing TURSO_DATABASE_URL');
+        process.exit(1);
+    }
+    const db = createClient({ url, authToken: process.env.TURSO_AUTH_TOKEN });
+    const checkOnly = process.argv.includes('--check');
+    try {
+        if (!checkOnly) {
+            const added = await ensureColumns(db);
+            if (added.length > 0) {
+                console.log(`➕ Added columns: ${added.join(', ')}`);
+            }
+        }
+
+        const drift = (await db.execute(DRIFT_QUERY)).rows;
+        if (drift.length === 0) {
+            console.log('✅ Rating aggregates match the reviews table');
+            return;
+        }
+        console.log(`⚠️ ${drift.length} doctors have rating aggregates that differ from their reviews`);
+        console.table(drift.slice(0, 20));
+
+        if (checkOnly) {
+            process.exitCode = 1;
+            return;
+        }
+        await repairRatings(db);
+        console.log(`✅ Recomputed rating aggregates for ${drift.length} doctors`);
+    } finally {
+        db.close();
+    }
+}
+
+if (require.main === module) {
+    main().catch(e => {
+        console.error('❌ Rating repair failed:', e);
+        process.exit(1);
+    });
+}
+
+module.exports = { repairRatings };
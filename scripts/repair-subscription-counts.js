@@ -0,0 +1,78 @@
+const { createClient } = require('@libsql/client');
+const path = require('path');
+require('dotenv').config({ path: path.join(__dirname, '..', '.env') });
+
+// Recomputes doctors.subscription_count, the default order of /api/doctors,
+// from the doctor_subscriptions table. Adds the column and its index first on
+// databases created before they existed.
+//
+//   npm run db:repair-subscriptions             recompute every doctor
+//   npm run db:repair-subscriptions -- --check  only list doctors that drifted
+
+const COUNTS = `SELECT doctor_id, COUNT(*) AS n FROM doctor_subscriptions GROUP BY doctor_id`;
+
+const REPAIR = `
+    UPDATE doctors SET subscription_count = COALESCE(
+        (SELECT COUNT(*) FROM doctor_subscriptions s WHERE s.doctor_id = doctors.id), 0)`;
+
+const DRIFT_QUERY = `
+    SELECT d.id, d.name, d.subscription_count, COALESCE(c.n, 0) AS expected
+    FROM doctors d LEFT JOIN (${COUNTS}) AS c ON c.doctor_id = d.id
+    WHERE d.subscription_count IS NOT COALESCE(c.n, 0)`;
+
+async function ensureColumn(db) {
+    const existing = new Set((await db.execute('PRAGMA table_info(doctors)')).rows.map(row => row.name));
+    const added = !existing.has('subscription_count');
+    if (added) {
+        await db.execute('ALTER TABLE doctors ADD COLUMN subscription_count INTEGER NOT NULL DEFAULT 0');
+    }
+    await db.execute(
+        'CREATE INDEX IF NOT EXISTS "doctors_subscription_count_idx" ON "doctors"("subscription_count")'
+    );
+    return added;
+}
+
+async function repairSubscriptionCounts(db) {
+    await db.execute(REPAIR);
+}
+
+async function main() {
+    const url = process.env.TURSO_DATABASE_URL;
+    if (!url) {
+        console.error('Missing TURSO_DATABASE_URL');
+        process.exit(1);
+    }
+    const db = createClient({ url, authToken: process.env.TURSO_AUTH_TOKEN });
+    const checkOnly = process.argv.includes('--check');
+    try {
+        if (!checkOnly && await ensureColumn(db)) {
+            console.log('➕ Added column: subscription_count');
+        }
+
+        const drift = (await db.execute(DRIFT_QUERY)).rows;
+        if (drift.length === 0) {
+            console.log('✅ Subscription counts match the subscriptions table');
+            return;
+        }
+        console.log(`⚠️ ${drift.length} doctors have a subscription count that differs from their subscriptions`);
+        console.table(drift.slice(0, 20));
+
+        if (checkOnly) {
+            process.exitCode = 1;
+            return;
+        }
+        await repairSubscriptionCounts(db);
+        console.log(`✅ Recomputed subscription counts for ${drift.length} doctors`);
+    } finally {
+        db.close();
+    }
+}
+
+if (require.main === module) {
+    main().catch(e => {
+        console.error('❌ Subscription count repair failed:', e);
+        process.exit(1);
+    });
+}
+
+module.exports = { repairSubscriptionCounts };
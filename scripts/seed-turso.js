@@ -1,5 +1,7 @@
 const { createClient } = require('@libsql/client');
 const bcrypt = require('bcryptjs');
+const { repairRatings } = require('./repair-ratings');
+const { repairSubscriptionCounts } = require('./repair-subscription-counts');
 const path = require('path');
 require('dotenv').config({ path: path.join(__dirname, '..', '.env') });
 
@@ -65,6 +67,7 @@ async function seed() {
 
     // --- Sample review ---
     await db.execute({ sql: `INSERT OR IGNORE INTO reviews (id, doctor_id, patient_name, rating, comment) VALUES (1,?,'كريم',5,?)`, args: [doctorId, 'طبيب ممتاز ومعاملة راقية'] });
+    await repairRatings(db);
     console.log('✅ Sample review created');
 
     // --- Specific doctor account (abdourbab3@gmail.com) ---
@@ -78,9 +81,11 @@ async function seed() {
     const specificDoctorId = specificDoctorRow.rows[0].id;
 
     await db.execute({ sql: `INSERT OR IGNORE INTO doctor_subscriptions (id, doctor_id, plan_id, status, start_date, end_date) VALUES (2,?,2,'ACTIVE',?,?)`, args: [specificDoctorId, now, future] });
+    await repairSubscriptionCounts(db);
     console.log('✅ Specific doctor (abdourbab3@gmail.com) created');
 
     console.log('\n🎉 Database seeding completed!');
+    console.log('   Build the search index with: npm run db:search-index');
     console.log('\n📋 Default credentials:');
     console.log('   Admin:  admin@docteur.dz / admin123');
     console.log('   Doctor: doctor@example.com / doctor123');
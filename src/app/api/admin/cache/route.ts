@@ -0,0 +1,59 @@
+import { NextResponse } from 'next/server';
+import { getServerSession } from 'next-auth';
+import { authOptions } from '@/lib/auth';
+import { responseCache } from '@/lib/cache';
+
+export const dynamic = 'force-dynamic';
+
+// GET /api/admin/cache - Response cache hit/miss counters for this server instance
+export async function GET() {
+    try {
+        const session = await getServerSession(authOptions);
+
+        if (!session || session.user.role !== 'ADMIN') {
+            return NextResponse.json(
+                { success: false, error: 'غير مصرح' },
+                { status: 403 }
+            );
+        }
+
+        return NextResponse.json({
+            success: true,
+            data: responseCache.stats(),
+        });
+    } catch (error) {
+        console.error('Error fetching cache stats:', error);
+        return NextResponse.json(
+            { success: false, error: 'حدث خطأ أثناء جلب البيانات' },
+            { status: 500 }
+        );
+    }
+}
+
+// DELETE /api/admin/cache - Empty the response cache of this server instance
+export async function DELETE() {
+    try {
+        const session = await getServerSession(authOptions);
+
+        if (!session || session.user.role !== 'ADMIN') {
+            return NextResponse.json(
+                { success: false, error: 'غير مصرح' },
+                { status: 403 }
+            );
+        }
+
+        const cleared = responseCache.clear();
+
+        return NextResponse.json({
+            success: true,
+            message: 'تم مسح ذاكرة التخزين المؤقت',
+            data: { cleared },
+        });
+    } catch (error) {
+        console.error('Error clearing cache:', error);
+        return NextResponse.json(
+            { success: false, error: 'حدث خطأ أثناء مسح ذاكرة التخزين المؤقت' },
+            { status: 500 }
+        );
+    }
+}
@@ -2,6 +2,8 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import prisma from '@/lib/prisma';
 import { authOptions } from '@/lib/auth';
+import { doctorTags, responseCache } from '@/lib/cache';
+import { indexDoctor, unindexDoctor } from '@/lib/search';
 
 // PUT /api/admin/doctors/[id] - Approve/Suspend doctor
 export async function PUT(
@@ -47,6 +49,8 @@ export async function PUT(
                     data: { status: 'ACTIVE' },
                 }),
             ]);
+            // Doctors registered before the index existed enter it here
+            await indexDoctor(prisma, doctor);
             message = 'تم الموافقة على الطبيب بنجاح';
         } else if (action === 'suspend') {
             await prisma.user.update({
@@ -64,8 +68,10 @@ export async function PUT(
             await prisma.user.delete({
                 where: { id: doctor.userId },
             });
+            await unindexDoctor(prisma, id);
             message = 'تم رفض الطبيب وحذف حسابه';
         }
+        responseCache.invalidate([...doctorTags(doctor), 'specialties']);
 
         return NextResponse.json({
             success: true,
@@ -113,6 +119,7 @@ export async function DELETE(
         await prisma.user.delete({
             where: { id: doctor.userId },
         });
+        responseCache.invalidate([...doctorTags(doctor), 'specialties']);
 
         return NextResponse.json({
             success: true,
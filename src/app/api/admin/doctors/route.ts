@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import prisma from '@/lib/prisma';
 import { authOptions } from '@/lib/auth';
+import { paginate, parsePageRequest } from '@/lib/pagination';
 
 export const dynamic = 'force-dynamic';
 
@@ -20,9 +21,14 @@ export async function GET(request: NextRequest) {
         const { searchParams } = new URL(request.url);
         const status = searchParams.get('status'); // pending, active, suspended
         const search = searchParams.get('search');
-        const page = parseInt(searchParams.get('page') || '1');
-        const limit = parseInt(searchParams.get('limit') || '20');
-        const skip = (page - 1) * limit;
+        const pageRequest = parsePageRequest(searchParams, [{ createdAt: 'desc' }, { id: 'desc' }], 20);
+
+        if (!pageRequest) {
+            return NextResponse.json(
+                { success: false, error: 'مؤشر الصفحة غير صالح' },
+                { status: 400 }
+            );
+        }
 
         const where: any = {};
 
@@ -43,9 +49,11 @@ export async function GET(request: NextRequest) {
             ];
         }
 
-        const [doctors, total] = await Promise.all([
-            prisma.doctor.findMany({
-                where,
+        const { items: doctors, pagination } = await paginate(
+            pageRequest,
+            where,
+            (args) => prisma.doctor.findMany({
+                ...args,
                 include: {
                     user: {
                         select: {
@@ -68,12 +76,9 @@ export async function GET(request: NextRequest) {
                         },
                     },
                 },
-                orderBy: { createdAt: 'desc' },
-                skip,
-                take: limit,
             }),
-            prisma.doctor.count({ where }),
-        ]);
+            (where) => prisma.doctor.count({ where })
+        );
 
         const doctorsWithDays = doctors.map(doctor => {
             let daysRemaining = null;
@@ -92,12 +97,7 @@ export async function GET(request: NextRequest) {
             success: true,
             data: {
                 doctors: doctorsWithDays,
-                pagination: {
-                    page,
-                    limit,
-                    total,
-                    totalPages: Math.ceil(total / limit),
-                },
+                pagination,
             },
         });
     } catch (error) {
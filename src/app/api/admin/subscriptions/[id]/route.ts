@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import prisma from '@/lib/prisma';
 import { authOptions } from '@/lib/auth';
+import { doctorTags, responseCache } from '@/lib/cache';
 
 // PUT /api/admin/subscriptions/[id] - Approve/Reject subscription
 export async function PUT(
@@ -24,6 +25,7 @@ export async function PUT(
 
         const subscription = await prisma.doctorSubscription.findUnique({
             where: { id },
+            include: { doctor: true },
         });
 
         if (!subscription) {
@@ -68,6 +70,9 @@ export async function PUT(
             message = 'تم رفض طلب الاشتراك';
         }
 
+        // Listings order by and show the active subscription
+        responseCache.invalidate(doctorTags(subscription.doctor));
+
         return NextResponse.json({
             success: true,
             message,
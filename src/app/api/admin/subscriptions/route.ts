@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import prisma from '@/lib/prisma';
 import { authOptions } from '@/lib/auth';
+import { paginate, parsePageRequest } from '@/lib/pagination';
 
 export const dynamic = 'force-dynamic';
 
@@ -19,13 +20,20 @@ export async function GET(request: NextRequest) {
 
         const { searchParams } = new URL(request.url);
         const status = searchParams.get('status') || 'PENDING';
-        const page = parseInt(searchParams.get('page') || '1');
-        const limit = parseInt(searchParams.get('limit') || '20');
-        const skip = (page - 1) * limit;
+        const pageRequest = parsePageRequest(searchParams, [{ createdAt: 'desc' }, { id: 'desc' }], 20);
 
-        const [subscriptions, total] = await Promise.all([
-            prisma.doctorSubscription.findMany({
-                where: { status: status as any },
+        if (!pageRequest) {
+            return NextResponse.json(
+                { success: false, error: 'مؤشر الصفحة غير صالح' },
+                { status: 400 }
+            );
+        }
+
+        const { items: subscriptions, pagination } = await paginate(
+            pageRequest,
+            { status: status as any },
+            (args) => prisma.doctorSubscription.findMany({
+                ...args,
                 include: {
                     doctor: {
                         include: {
@@ -36,23 +44,15 @@ export async function GET(request: NextRequest) {
                     },
                     plan: true,
                 },
-                orderBy: { createdAt: 'desc' },
-                skip,
-                take: limit,
             }),
-            prisma.doctorSubscription.count({ where: { status: status as any } }),
-        ]);
+            (where) => prisma.doctorSubscription.count({ where })
+        );
 
         return NextResponse.json({
             success: true,
             data: {
                 subscriptions,
-                pagination: {
-                    page,
-                    limit,
-                    total,
-                    totalPages: Math.ceil(total / limit),
-                },
+                pagination,
             },
         });
     } catch (error) {
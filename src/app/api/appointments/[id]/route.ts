@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import prisma from '@/lib/prisma';
 import { authOptions } from '@/lib/auth';
+import { isSlotTaken, parseDay, parseTime } from '@/lib/slots';
 
 // PUT /api/appointments/[id] - Update appointment status
 export async function PUT(
@@ -37,20 +38,40 @@ export async function PUT(
             );
         }
 
+        const day = date ? parseDay(date) : null;
+        const slot = time ? parseTime(time) : null;
+        if ((date && !day) || (time && !slot)) {
+            return NextResponse.json(
+                { success: false, error: 'التاريخ أو الوقت غير صالح' },
+                { status: 400 }
+            );
+        }
+
+        // Moving an appointment, or restoring a cancelled one, can land on a booked slot
         const appointment = await prisma.appointment.update({
             where: { id },
             data: {
                 ...(status && { status }),
                 ...(notes !== undefined && { notes }),
-                ...(date && { date: new Date(date) }),
-                ...(time && { time }),
+                ...(day && { date: day }),
+                ...(slot && { time: slot }),
                 ...(actualPrice !== undefined && { actualPrice }),
             },
             include: {
                 patient: true,
             },
+        }).catch((error) => {
+            if (isSlotTaken(error)) return null;
+            throw error;
         });
 
+        if (!appointment) {
+            return NextResponse.json(
+                { success: false, error: 'هذا الموعد محجوز، يرجى اختيار وقت آخر' },
+                { status: 409 }
+            );
+        }
+
         return NextResponse.json({
             success: true,
             message: 'تم تحديث الموعد بنجاح',
@@ -2,6 +2,8 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import prisma from '@/lib/prisma';
 import { authOptions } from '@/lib/auth';
+import { paginate, parsePageRequest } from '@/lib/pagination';
+import { isSlotTaken, parseDay, parseTime } from '@/lib/slots';
 
 // GET /api/appointments - List appointments
 export async function GET(request: NextRequest) {
@@ -14,9 +16,18 @@ export async function GET(request: NextRequest) {
         const status = searchParams.get('status');
         const startDate = searchParams.get('startDate');
         const endDate = searchParams.get('endDate');
-        const page = parseInt(searchParams.get('page') || '1');
-        const limit = parseInt(searchParams.get('limit') || '20');
-        const skip = (page - 1) * limit;
+        const pageRequest = parsePageRequest(
+            searchParams,
+            [{ date: 'asc' }, { time: 'asc' }, { id: 'asc' }],
+            20
+        );
+
+        if (!pageRequest) {
+            return NextResponse.json(
+                { success: false, error: 'مؤشر الصفحة غير صالح' },
+                { status: 400 }
+            );
+        }
 
         const where: any = {};
 
@@ -42,9 +53,11 @@ export async function GET(request: NextRequest) {
             where.status = status;
         }
 
-        const [appointments, total] = await Promise.all([
-            prisma.appointment.findMany({
-                where,
+        const { items: appointments, pagination } = await paginate(
+            pageRequest,
+            where,
+            (args) => prisma.appointment.findMany({
+                ...args,
                 include: {
                     patient: true,
                     doctor: {
@@ -56,23 +69,15 @@ export async function GET(request: NextRequest) {
                         },
                     },
                 },
-                orderBy: [{ date: 'asc' }, { time: 'asc' }],
-                skip,
-                take: limit,
             }),
-            prisma.appointment.count({ where }),
-        ]);
+            (where) => prisma.appointment.count({ where })
+        );
 
         return NextResponse.json({
             success: true,
             data: {
                 appointments,
-                pagination: {
-                    page,
-                    limit,
-                    total,
-                    totalPages: Math.ceil(total / limit),
-                },
+                pagination,
             },
         });
     } catch (error) {
@@ -97,6 +102,16 @@ export async function POST(request: NextRequest) {
             );
         }
 
+        // One spelling per slot, so the unique index sees two bookings of it as the same
+        const day = parseDay(date);
+        const slot = parseTime(time);
+        if (!day || !slot) {
+            return NextResponse.json(
+                { success: false, error: 'التاريخ أو الوقت غير صالح' },
+                { status: 400 }
+            );
+        }
+
         // Check doctor exists and is active
         const doctor = await prisma.doctor.findFirst({
             where: {
@@ -152,39 +167,52 @@ export async function POST(request: NextRequest) {
             }
         }
 
-        // Create or get patient
-        let patient = await prisma.patient.findFirst({
-            where: { phone: patientPhone },
-        });
+        // Create or get the patient and book in one transaction: of simultaneous
+        // bookings of a slot only the first is stored, and a losing request
+        // rolls back the patient it created
+        const appointment = await prisma.$transaction(async (tx) => {
+            let patient = await tx.patient.findFirst({
+                where: { phone: patientPhone },
+            });
+
+            if (!patient) {
+                patient = await tx.patient.create({
+                    data: {
+                        name: patientName,
+                        phone: patientPhone,
+                        email: patientEmail,
+                    },
+                });
+            }
 
-        if (!patient) {
-            patient = await prisma.patient.create({
+            return tx.appointment.create({
                 data: {
-                    name: patientName,
-                    phone: patientPhone,
-                    email: patientEmail,
+                    doctorId,
+                    patientId: patient.id,
+                    date: day,
+                    time: slot,
+                    notes,
+                    status: 'PENDING',
                 },
-            });
-        }
-
-        // Create appointment
-        const appointment = await prisma.appointment.create({
-            data: {
-                doctorId,
-                patientId: patient.id,
-                date: new Date(date),
-                time,
-                notes,
-                status: 'PENDING',
-            },
-            include: {
-                patient: true,
-                doctor: {
-                    select: { name: true },
+                include: {
+                    patient: true,
+                    doctor: {
+                        select: { name: true },
+                    },
                 },
-            },
+            });
+        }).catch((error) => {
+            if (isSlotTaken(error)) return null;
+            throw error;
         });
 
+        if (!appointment) {
+            return NextResponse.json(
+                { success: false, error: 'هذا الموعد محجوز، يرجى اختيار وقت آخر' },
+                { status: 409 }
+            );
+        }
+
         return NextResponse.json({
             success: true,
             message: 'تم حجز الموعد بنجاح. سيتم التأكيد قريباً',
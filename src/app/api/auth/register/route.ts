@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import bcrypt from 'bcryptjs';
 import prisma from '@/lib/prisma';
+import { indexDoctor } from '@/lib/search';
 
 export async function POST(request: NextRequest) {
     try {
@@ -49,6 +50,7 @@ export async function POST(request: NextRequest) {
                     city,
                     phone,
                     approved: false,
+                    subscriptionCount: 1, // the trial below
                 },
             });
 
@@ -71,6 +73,9 @@ export async function POST(request: NextRequest) {
             return { user, doctor };
         });
 
+        // After the commit: the index is not needed to register
+        await indexDoctor(prisma, result.doctor);
+
         return NextResponse.json(
             {
                 success: true,
@@ -2,6 +2,9 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import prisma from '@/lib/prisma';
 import { authOptions } from '@/lib/auth';
+import { doctorTags, responseCache } from '@/lib/cache';
+import { ratingHistogram, ratingSummary } from '@/lib/ratings';
+import { indexDoctor, unindexDoctor } from '@/lib/search';
 
 // GET /api/doctors/[id] - Get single doctor
 export async function GET(
@@ -40,12 +43,6 @@ export async function GET(
             );
         }
 
-        // Calculate rating
-        const ratings = doctor.reviews.map((r) => r.rating);
-        const avgRating = ratings.length > 0
-            ? ratings.reduce((a, b) => a + b, 0) / ratings.length
-            : 0;
-
         // Parse workingHours if it's a string (SQLite/Turso storage)
         let parsedWorkingHours = doctor.workingHours;
         if (typeof doctor.workingHours === 'string' && doctor.workingHours) {
@@ -69,8 +66,8 @@ export async function GET(
                 profileImage: doctor.profileImage,
                 phone: doctor.phone,
                 bio: doctor.bio,
-                rating: Math.round(avgRating * 10) / 10,
-                reviewCount: doctor.reviews.length,
+                ...ratingSummary(doctor),
+                ratingHistogram: ratingHistogram(doctor),
                 reviews: doctor.reviews,
                 isActive: doctor.user.status === 'ACTIVE' && doctor.approved,
             },
@@ -146,10 +143,21 @@ export async function PUT(
             updateData.approved = approved;
         }
 
-        const doctor = await prisma.doctor.update({
-            where: { id },
-            data: updateData,
+        const [previous, doctor] = await prisma.$transaction(async (tx) => {
+            const previous = await tx.doctor.findUnique({ where: { id } });
+            const updated = await tx.doctor.update({
+                where: { id },
+                data: updateData,
+            });
+            return [previous, updated] as const;
         });
+        await indexDoctor(prisma, doctor);
+        // Lists it left as well as lists it may have entered
+        responseCache.invalidate([
+            ...(previous ? doctorTags(previous) : []),
+            ...doctorTags(doctor),
+            'specialties',
+        ]);
 
         return NextResponse.json({
             success: true,
@@ -199,6 +207,8 @@ export async function DELETE(
         await prisma.user.delete({
             where: { id: doctor.userId },
         });
+        await unindexDoctor(prisma, id);
+        responseCache.invalidate([...doctorTags(doctor), 'specialties']);
 
         return NextResponse.json({
             success: true,
@@ -0,0 +1,71 @@
+import { NextRequest, NextResponse } from 'next/server';
+import prisma from '@/lib/prisma';
+import { MAX_RANGE_DAYS, SLOT_MINUTES, clinicToday, dayKey, freeSlots, parseDay } from '@/lib/slots';
+
+export const dynamic = 'force-dynamic';
+
+// GET /api/doctors/[id]/slots?from=YYYY-MM-DD&to=YYYY-MM-DD - Free booking slots per day
+export async function GET(
+    request: NextRequest,
+    { params }: { params: { id: string } }
+) {
+    try {
+        const id = parseInt(params.id);
+        const { searchParams } = new URL(request.url);
+        const fromParam = searchParams.get('from');
+        const toParam = searchParams.get('to');
+
+        // A week from today unless asked otherwise
+        const from = fromParam ? parseDay(fromParam) : clinicToday();
+        const to = toParam ? parseDay(toParam) : from && new Date(from.getTime() + 6 * 24 * 60 * 60 * 1000);
+
+        if (!from || !to || to < from) {
+            return NextResponse.json(
+                { success: false, error: 'نطاق التاريخ غير صالح' },
+                { status: 400 }
+            );
+        }
+
+        if ((to.getTime() - from.getTime()) / (24 * 60 * 60 * 1000) >= MAX_RANGE_DAYS) {
+            return NextResponse.json(
+                { success: false, error: `لا يمكن طلب أكثر من ${MAX_RANGE_DAYS} يوماً` },
+                { status: 400 }
+            );
+        }
+
+        const doctor = await prisma.doctor.findFirst({
+            where: {
+                id,
+                approved: true,
+                user: { status: 'ACTIVE' },
+            },
+            select: { id: true, workingHours: true },
+        });
+
+        if (!doctor) {
+            return NextResponse.json(
+                { success: false, error: 'الطبيب غير موجود' },
+                { status: 404 }
+            );
+        }
+
+        const days = await freeSlots(doctor, from, to);
+
+        return NextResponse.json({
+            success: true,
+            data: {
+                doctorId: doctor.id,
+                from: dayKey(from),
+                to: dayKey(to),
+                slotMinutes: SLOT_MINUTES,
+                days,
+            },
+        });
+    } catch (error) {
+        console.error('Error fetching slots:', error);
+        return NextResponse.json(
+            { success: false, error: 'حدث خطأ أثناء جلب المواعيد المتاحة' },
+            { status: 500 }
+        );
+    }
+}
@@ -1,5 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import prisma from '@/lib/prisma';
+import { cacheKey, cityName, responseCache } from '@/lib/cache';
+import { pageResult, paginate, parsePageRequest } from '@/lib/pagination';
+import { ratingSelect, ratingSummary } from '@/lib/ratings';
+import { isMissingIndex, matchQuery, searchDoctorIds } from '@/lib/search';
 
 export const dynamic = 'force-dynamic';
 
@@ -10,9 +14,25 @@ export async function GET(request: NextRequest) {
         const specialty = searchParams.get('specialty');
         const city = searchParams.get('city');
         const search = searchParams.get('search');
-        const page = parseInt(searchParams.get('page') || '1');
-        const limit = parseInt(searchParams.get('limit') || '12');
-        const skip = (page - 1) * limit;
+        const sort = searchParams.get('sort');
+        const match = search ? matchQuery(search) : null;
+
+        // Doctors with the most subscriptions first by default (the count is
+        // kept on the row, so cursors use keysets); sort=rating puts the best
+        // rated first, ties broken by the number of reviews. Search results
+        // come in the index's order, which cursors can only follow by offset.
+        const listOrder: any[] = sort === 'rating'
+            ? [{ ratingAvg: 'desc' }, { ratingCount: 'desc' }, { createdAt: 'desc' }, { id: 'desc' }]
+            : [{ subscriptionCount: 'desc' }, { createdAt: 'desc' }, { id: 'desc' }];
+        const orderBy: any[] = match ? [{ search: sort === 'rating' ? 'rating' : 'rank' }] : listOrder;
+
+        const pageRequest = parsePageRequest(searchParams, orderBy, 12);
+        if (!pageRequest) {
+            return NextResponse.json(
+                { success: false, error: 'مؤشر الصفحة غير صالح' },
+                { status: 400 }
+            );
+        }
 
         // Build where clause
         const now = new Date();
@@ -27,111 +47,145 @@ export async function GET(request: NextRequest) {
             where.specialty = specialty;
         }
 
-        if (city) {
-            // Extract wilaya name if it has a prefix like "16. الجزائر" 
-            const cityClean = city.includes('. ') ? city.split('. ')[1] : city;
+        // Extract wilaya name if it has a prefix like "16. الجزائر"
+        const cityClean = city && cityName(city);
+        if (cityClean) {
             console.log(`[Search] Original City: "${city}", Cleaned: "${cityClean}"`);
 
             where.city = { contains: cityClean };
         }
 
-        if (search) {
-            where.OR = [
-                { name: { contains: search } },
-                { specialty: { contains: search } },
-                { city: { contains: search } },
-            ];
-        }
-
-        // Get doctors with reviews for rating calculation
-        const [doctors, total] = await Promise.all([
-            prisma.doctor.findMany({
-                where,
-                select: {
-                    id: true,
-                    name: true,
-                    specialty: true,
-                    city: true,
-                    clinicAddress: true,
-                    workingHours: true,
-                    priceRange: true,
-                    profileImage: true,
-                    phone: true,
-                    bio: true,
-                    createdAt: true,
-                    reviews: {
-                        select: {
-                            rating: true,
-                        },
-                    },
-                    _count: {
-                        select: {
-                            reviews: true,
-                        },
-                    },
-                    subscriptions: {
-                        where: {
-                            status: 'ACTIVE',
-                        },
-                        include: {
-                            plan: true,
-                        },
-                        orderBy: {
-                            createdAt: 'desc',
-                        },
-                        take: 1,
-                    },
+        const select = {
+            id: true,
+            name: true,
+            specialty: true,
+            city: true,
+            clinicAddress: true,
+            workingHours: true,
+            priceRange: true,
+            profileImage: true,
+            phone: true,
+            bio: true,
+            createdAt: true,
+            subscriptionCount: true,
+            ...ratingSelect,
+            subscriptions: {
+                where: {
+                    status: 'ACTIVE',
                 },
-                orderBy: [
-                    {
-                        subscriptions: {
-                            _count: 'desc',
-                        },
-                    },
-                    { createdAt: 'desc' },
-                ],
-                skip,
-                take: limit,
-            }),
-            prisma.doctor.count({ where }),
-        ]);
+                include: {
+                    plan: true,
+                },
+                orderBy: {
+                    createdAt: 'desc' as const,
+                },
+                take: 1,
+            },
+        };
 
-        // Transform data with ratings
-        const doctorsWithRatings = doctors.map((doctor) => {
-            const ratings = doctor.reviews.map((r) => r.rating);
-            const avgRating = ratings.length > 0
-                ? ratings.reduce((a, b) => a + b, 0) / ratings.length
-                : 0;
-
-            return {
-                id: doctor.id,
-                name: doctor.name,
-                specialty: doctor.specialty,
-                city: doctor.city,
-                clinicAddress: doctor.clinicAddress,
-                workingHours: doctor.workingHours,
-                priceRange: doctor.priceRange,
-                profileImage: doctor.profileImage,
-                phone: doctor.phone,
-                bio: doctor.bio,
-                rating: Math.round(avgRating * 10) / 10,
-                reviewCount: doctor._count.reviews,
-                subscriptionEnd: doctor.subscriptions[0]?.endDate || null,
+        // Without the index (`npm run db:search-index` not run yet) search
+        // falls back to LIKE filters, in listing order
+        const likePage = async (search: string) => {
+            const likeWhere = {
+                ...where,
+                OR: [
+                    { name: { contains: search } },
+                    { specialty: { contains: search } },
+                    { city: { contains: search } },
+                ],
             };
-        });
+            const [rows, total] = await Promise.all([
+                prisma.doctor.findMany({
+                    where: likeWhere,
+                    select,
+                    orderBy: listOrder,
+                    skip: pageRequest.skip,
+                    take: pageRequest.limit + 1,
+                }),
+                pageRequest.withTotal ? prisma.doctor.count({ where: likeWhere }) : Promise.resolve(undefined),
+            ]);
+            return pageResult(pageRequest, rows, total);
+        };
 
-        return NextResponse.json({
-            success: true,
-            data: {
-                doctors: doctorsWithRatings,
-                pagination: {
-                    page,
-                    limit,
-                    total,
-                    totalPages: Math.ceil(total / limit),
-                },
-            },
+        // Full-text search: the index ranks, filters and paginates, then the
+        // page is loaded and put back in rank order
+        const searchPage = async (match: string, search: string) => {
+            const result = await searchDoctorIds(match, {
+                specialty,
+                city: cityClean,
+                sort,
+                skip: pageRequest.skip,
+                take: pageRequest.limit + 1,
+                withTotal: pageRequest.withTotal,
+            }).catch((error) => {
+                if (isMissingIndex(error)) return null;
+                throw error;
+            });
+            if (!result) {
+                return likePage(search);
+            }
+            const rows = await prisma.doctor.findMany({
+                where: { id: { in: result.ids } },
+                select,
+            });
+            const byId = new Map(rows.map((doctor) => [doctor.id, doctor]));
+            return pageResult(pageRequest, result.ids.flatMap((id) => byId.get(id) ?? []), result.total);
+        };
+
+        const load = async () => {
+            const { items: doctors, pagination } = match && search
+                ? await searchPage(match, search.trim())
+                : await paginate(
+                    pageRequest,
+                    where,
+                    (args) => prisma.doctor.findMany({ ...args, select }),
+                    (where) => prisma.doctor.count({ where })
+                );
+
+            const doctorsWithRatings = doctors.map((doctor) => {
+                return {
+                    id: doctor.id,
+                    name: doctor.name,
+                    specialty: doctor.specialty,
+                    city: doctor.city,
+                    clinicAddress: doctor.clinicAddress,
+                    workingHours: doctor.workingHours,
+                    priceRange: doctor.priceRange,
+                    profileImage: doctor.profileImage,
+                    phone: doctor.phone,
+                    bio: doctor.bio,
+                    ...ratingSummary(doctor),
+                    subscriptionEnd: doctor.subscriptions[0]?.endDate || null,
+                };
+            });
+
+            return { doctors: doctorsWithRatings, pagination };
+        };
+
+        // Same search text after normalization shares an entry
+        const key = cacheKey('doctors', {
+            specialty,
+            city: cityClean,
+            search: match,
+            sort,
+            page: searchParams.get('page'),
+            limit: searchParams.get('limit'),
+            cursor: searchParams.get('cursor'),
+            count: searchParams.get('count'),
         });
+        const filterTags = [
+            ...(specialty ? [`specialty:${specialty}`] : []),
+            ...(cityClean ? [`city:${cityClean}`] : []),
+        ];
+        const { value: data, hit } = await responseCache.get(key, load, (data) => [
+            ...(filterTags.length ? filterTags : ['doctors']),
+            ...data.doctors.map((doctor) => `doctor:${doctor.id}`),
+        ]);
+
+        return NextResponse.json(
+            { success: true, data },
+            { headers: { 'X-Cache': hit ? 'HIT' : 'MISS' } }
+        );
     } catch (error) {
         console.error('Error fetching doctors:', error);
         return NextResponse.json(
@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import prisma from '@/lib/prisma';
 import { authOptions } from '@/lib/auth';
+import { paginate, parsePageRequest } from '@/lib/pagination';
 
 // GET /api/patients - List patients for a doctor
 export async function GET(request: NextRequest) {
@@ -17,9 +18,14 @@ export async function GET(request: NextRequest) {
 
         const { searchParams } = new URL(request.url);
         const search = searchParams.get('search');
-        const page = parseInt(searchParams.get('page') || '1');
-        const limit = parseInt(searchParams.get('limit') || '20');
-        const skip = (page - 1) * limit;
+        const pageRequest = parsePageRequest(searchParams, [{ createdAt: 'desc' }, { id: 'desc' }], 20);
+
+        if (!pageRequest) {
+            return NextResponse.json(
+                { success: false, error: 'مؤشر الصفحة غير صالح' },
+                { status: 400 }
+            );
+        }
 
         // Get patients who have appointments with this doctor
         const doctorId = session.user.doctorId;
@@ -40,9 +46,11 @@ export async function GET(request: NextRequest) {
             ];
         }
 
-        const [patients, total] = await Promise.all([
-            prisma.patient.findMany({
-                where,
+        const { items: patients, pagination } = await paginate(
+            pageRequest,
+            where,
+            (args) => prisma.patient.findMany({
+                ...args,
                 include: {
                     appointments: {
                         where: { doctorId },
@@ -57,12 +65,9 @@ export async function GET(request: NextRequest) {
                         },
                     },
                 },
-                orderBy: { createdAt: 'desc' },
-                skip,
-                take: limit,
             }),
-            prisma.patient.count({ where }),
-        ]);
+            (where) => prisma.patient.count({ where })
+        );
 
         const patientsWithStats = patients.map((patient) => ({
             id: patient.id,
@@ -79,12 +84,7 @@ export async function GET(request: NextRequest) {
             success: true,
             data: {
                 patients: patientsWithStats,
-                pagination: {
-                    page,
-                    limit,
-                    total,
-                    totalPages: Math.ceil(total / limit),
-                },
+                pagination,
             },
         });
     } catch (error) {
@@ -1,14 +1,15 @@
 import { NextRequest, NextResponse } from 'next/server';
 import prisma from '@/lib/prisma';
+import { doctorTags, responseCache } from '@/lib/cache';
+import { paginate, parsePageRequest } from '@/lib/pagination';
+import { addRating } from '@/lib/ratings';
 
 // GET /api/reviews - Get reviews for a doctor
 export async function GET(request: NextRequest) {
     try {
         const { searchParams } = new URL(request.url);
         const doctorId = searchParams.get('doctorId');
-        const page = parseInt(searchParams.get('page') || '1');
-        const limit = parseInt(searchParams.get('limit') || '10');
-        const skip = (page - 1) * limit;
+        const pageRequest = parsePageRequest(searchParams, [{ createdAt: 'desc' }, { id: 'desc' }], 10);
 
         if (!doctorId) {
             return NextResponse.json(
@@ -17,26 +18,25 @@ export async function GET(request: NextRequest) {
             );
         }
 
-        const [reviews, total] = await Promise.all([
-            prisma.review.findMany({
-                where: { doctorId: parseInt(doctorId) },
-                orderBy: { createdAt: 'desc' },
-                skip,
-                take: limit,
-            }),
-            prisma.review.count({ where: { doctorId: parseInt(doctorId) } }),
-        ]);
+        if (!pageRequest) {
+            return NextResponse.json(
+                { success: false, error: 'مؤشر الصفحة غير صالح' },
+                { status: 400 }
+            );
+        }
+
+        const { items: reviews, pagination } = await paginate(
+            pageRequest,
+            { doctorId: parseInt(doctorId) },
+            (args) => prisma.review.findMany(args),
+            (where) => prisma.review.count({ where })
+        );
 
         return NextResponse.json({
             success: true,
             data: {
                 reviews,
-                pagination: {
-                    page,
-                    limit,
-                    total,
-                    totalPages: Math.ceil(total / limit),
-                },
+                pagination,
             },
         });
     } catch (error) {
@@ -61,7 +61,7 @@ export async function POST(request: NextRequest) {
             );
         }
 
-        if (rating < 1 || rating > 5) {
+        if (!Number.isInteger(rating) || rating < 1 || rating > 5) {
             return NextResponse.json(
                 { success: false, error: 'التقييم يجب أن يكون بين 1 و 5' },
                 { status: 400 }
@@ -80,14 +80,18 @@ export async function POST(request: NextRequest) {
             );
         }
 
-        const review = await prisma.review.create({
-            data: {
-                doctorId,
-                patientName,
-                rating,
-                comment,
-            },
-        });
+        const [review] = await prisma.$transaction([
+            prisma.review.create({
+                data: {
+                    doctorId,
+                    patientName,
+                    rating,
+                    comment,
+                },
+            }),
+            addRating(doctorId, rating),
+        ]);
+        responseCache.invalidate(doctorTags(doctor));
 
         return NextResponse.json({
             success: true,
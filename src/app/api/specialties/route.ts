@@ -1,34 +1,37 @@
 import { NextResponse } from 'next/server';
 import prisma from '@/lib/prisma';
+import { cacheKey, responseCache } from '@/lib/cache';
 
 export const dynamic = 'force-dynamic';
 import { medicalSpecialties as defaultSpecialties } from '@/lib/utils';
 
 export async function GET() {
     try {
-        // Fetch unique specialties from the Doctor table
-        const doctors = await prisma.doctor.findMany({
-            select: {
-                specialty: true,
-            },
-            distinct: ['specialty'],
-            where: {
-                approved: true, // Only show specialties of approved doctors in search if we want to be strict, 
-                // but for registration we might want all. Let's get all for now.
-            }
-        });
+        const { value: allSpecialties, hit } = await responseCache.get(cacheKey('specialties'), async () => {
+            // Fetch unique specialties from the Doctor table
+            const doctors = await prisma.doctor.findMany({
+                select: {
+                    specialty: true,
+                },
+                distinct: ['specialty'],
+                where: {
+                    approved: true, // Only show specialties of approved doctors in search if we want to be strict, 
+                    // but for registration we might want all. Let's get all for now.
+                }
+            });
 
-        const dbSpecialties = doctors.map(d => d.specialty);
+            const dbSpecialties = doctors.map(d => d.specialty);
 
-        // Merge with default list and remove duplicates
-        const allSpecialties = Array.from(new Set([...defaultSpecialties, ...dbSpecialties]))
-            .filter(Boolean)
-            .sort((a, b) => a.localeCompare(b, 'ar'));
+            // Merge with default list and remove duplicates
+            return Array.from(new Set([...defaultSpecialties, ...dbSpecialties]))
+                .filter(Boolean)
+                .sort((a, b) => a.localeCompare(b, 'ar'));
+        }, () => ['specialties']);
 
         return NextResponse.json({
             success: true,
             data: allSpecialties
-        });
+        }, { headers: { 'X-Cache': hit ? 'HIT' : 'MISS' } });
     } catch (error) {
         console.error('Error fetching specialties:', error);
         return NextResponse.json(
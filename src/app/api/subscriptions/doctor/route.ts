@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import prisma from '@/lib/prisma';
 import { authOptions } from '@/lib/auth';
+import { responseCache, doctorTags } from '@/lib/cache';
 
 // GET /api/subscriptions/doctor - Get current doctor subscription
 export async function GET(request: NextRequest) {
@@ -101,16 +102,31 @@ export async function POST(request: NextRequest) {
             );
         }
 
-        // Create subscription request
-        const subscription = await prisma.doctorSubscription.create({
-            data: {
-                doctorId: session.user.doctorId,
-                planId,
-                status: 'PENDING',
-            },
-            include: { plan: true },
+        // Create subscription request, counted on the doctor for the listing order
+        const doctorId = session.user.doctorId;
+        const subscription = await prisma.$transaction(async (tx) => {
+            await tx.doctor.update({
+                where: { id: doctorId },
+                data: { subscriptionCount: { increment: 1 } },
+            });
+            return tx.doctorSubscription.create({
+                data: {
+                    doctorId,
+                    planId,
+                    status: 'PENDING',
+                },
+                include: {
+                    plan: true,
+                    doctor: {
+                        select: { id: true, specialty: true, city: true },
+                    },
+                },
+            });
         });
 
+        // Listings order by the doctor's subscription count
+        responseCache.invalidate(doctorTags(subscription.doctor));
+
         return NextResponse.json({
             success: true,
             message: 'تم إرسال طلب الاشتراك. سيتم مراجعته من قبل الإدارة',
@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import prisma from '@/lib/prisma';
 import { authOptions } from '@/lib/auth';
+import { responseCache } from '@/lib/cache';
 
 // GET /api/subscriptions/plans/[id]
 export async function GET(
@@ -57,6 +58,7 @@ export async function PUT(
             where: { id },
             data: body,
         });
+        responseCache.invalidate(['plans']);
 
         return NextResponse.json({
             success: true,
@@ -93,6 +95,7 @@ export async function DELETE(
             where: { id },
             data: { active: false },
         });
+        responseCache.invalidate(['plans']);
 
         return NextResponse.json({
             success: true,
@@ -2,19 +2,24 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import prisma from '@/lib/prisma';
 import { authOptions } from '@/lib/auth';
+import { cacheKey, responseCache } from '@/lib/cache';
 
 // GET /api/subscriptions/plans - List subscription plans
 export async function GET() {
     try {
-        const plans = await prisma.subscriptionPlan.findMany({
-            where: { active: true },
-            orderBy: { priority: 'asc' },
-        });
+        const { value: plans, hit } = await responseCache.get(
+            cacheKey('plans'),
+            () => prisma.subscriptionPlan.findMany({
+                where: { active: true },
+                orderBy: { priority: 'asc' },
+            }),
+            () => ['plans']
+        );
 
-        return NextResponse.json({
-            success: true,
-            data: plans,
-        });
+        return NextResponse.json(
+            { success: true, data: plans },
+            { headers: { 'X-Cache': hit ? 'HIT' : 'MISS' } }
+        );
     } catch (error) {
         console.error('Error fetching plans:', error);
         return NextResponse.json(
@@ -58,6 +63,7 @@ export async function POST(request: NextRequest) {
                 priority: priority || 0,
             },
         });
+        responseCache.invalidate(['plans']);
 
         return NextResponse.json({
             success: true,
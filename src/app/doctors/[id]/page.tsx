@@ -1,9 +1,9 @@
 'use client';
 
 import Link from 'next/link';
-import { useEffect, useState, useCallback } from 'react';
+import { useEffect, useState, useCallback, useRef } from 'react';
 import { useParams, useRouter } from 'next/navigation';
-import { formatDateAr, formatTimeAr, arabicDays, generateTimeSlots } from '@/lib/utils';
+import { formatDateAr, formatTimeAr, arabicDays } from '@/lib/utils';
 import Image from 'next/image';
 
 interface Doctor {
@@ -217,6 +217,8 @@ export default function DoctorProfilePage() {
     const [selectedDate, setSelectedDate] = useState('');
     const [selectedTime, setSelectedTime] = useState('');
     const [availableSlots, setAvailableSlots] = useState<string[]>([]);
+    // The date whose slots are wanted; a response for any other date is stale
+    const slotsDate = useRef('');
     const [bookingForm, setBookingForm] = useState({
         patientName: '',
         patientPhone: '',
@@ -249,21 +251,29 @@ export default function DoctorProfilePage() {
         }
     }, [params.id, fetchDoctor]);
 
+    // Free slots come from the server, without the ones already booked.
+    // Responses can arrive out of order when the date changes quickly, so
+    // only the one for the current date is kept.
+    const fetchSlots = useCallback(async (date: string) => {
+        try {
+            const res = await fetch(`/api/doctors/${params.id}/slots?from=${date}&to=${date}`);
+            const data = await res.json();
+            if (date !== slotsDate.current) return;
+            setAvailableSlots(data.success ? data.data.days[0]?.slots || [] : []);
+        } catch (error) {
+            console.error(error);
+            if (date === slotsDate.current) setAvailableSlots([]);
+        }
+    }, [params.id]);
+
     useEffect(() => {
-        if (selectedDate && doctor?.workingHours) {
-            const date = new Date(selectedDate);
-            const dayName = date.toLocaleDateString('en-US', { weekday: 'long' }).toLowerCase();
-            const dayHours = doctor.workingHours[dayName];
-
-            if (dayHours) {
-                const slots = generateTimeSlots(dayHours.start, dayHours.end, 30);
-                setAvailableSlots(slots);
-            } else {
-                setAvailableSlots([]);
-            }
+        slotsDate.current = selectedDate;
+        if (selectedDate) {
+            setAvailableSlots([]);
             setSelectedTime('');
+            fetchSlots(selectedDate);
         }
-    }, [selectedDate, doctor?.workingHours]);
+    }, [selectedDate, fetchSlots]);
 
     const handleBooking = async (e: React.FormEvent) => {
         e.preventDefault();
@@ -295,6 +305,11 @@ export default function DoctorProfilePage() {
                 setSelectedTime('');
             } else {
                 setMessage({ type: 'error', text: data.error });
+                // Someone else took the slot meanwhile
+                if (res.status === 409) {
+                    setSelectedTime('');
+                    fetchSlots(selectedDate);
+                }
             }
         } catch (error) {
             setMessage({ type: 'error', text: 'حدث خطأ. يرجى المحاولة مرة أخرى' });
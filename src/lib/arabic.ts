@@ -0,0 +1,47 @@
+// Arabic text normalization for doctor search. The search index
+// (src/lib/search.ts) stores normalized text and queries are normalized the
+// same way, so spelling variants users type interchangeably match.
+
+// Tashkeel, Quranic annotation marks and tatweel
+const DIACRITICS = /[\u0610-\u061a\u064b-\u065f\u0670\u0640]/g;
+
+const LETTERS: Record<string, string> = {
+    'أ': 'ا',
+    'إ': 'ا',
+    'آ': 'ا',
+    'ٱ': 'ا',
+    'ة': 'ه',
+    'ى': 'ي',
+    'ؤ': 'و',
+    'ئ': 'ي',
+};
+
+const LETTER_VARIANTS = new RegExp(`[${Object.keys(LETTERS).join('')}]`, 'g');
+
+// Arabic-Indic and Persian digits, e.g. the wilaya number in "١٦. الجزائر"
+const DIGITS = /[\u0660-\u0669\u06f0-\u06f9]/g;
+
+export function normalizeArabic(text: string): string {
+    return text
+        .normalize('NFC')
+        .replace(DIACRITICS, '')
+        .replace(LETTER_VARIANTS, (c) => LETTERS[c])
+        .replace(DIGITS, (d) => String(d.charCodeAt(0) & 0xf))
+        .toLowerCase()
+        .replace(/\s+/g, ' ')
+        .trim();
+}
+
+// Words of normalized text: letters and digits, everything else separates
+export function searchTokens(text: string): string[] {
+    return normalizeArabic(text).match(/[\p{L}\p{N}]+/gu) || [];
+}
+
+// Text as stored in the index: normalized, and every word with the definite
+// article also without it, so "جزائر" finds "الجزائر"
+export function indexText(text: string | null | undefined): string {
+    if (!text) return '';
+    const words = searchTokens(text);
+    const bare = words.filter((w) => w.startsWith('ال') && w.length > 4).map((w) => w.slice(2));
+    return [...words, ...bare].join(' ');
+}
@@ -0,0 +1,174 @@
+// In-process cache for the public catalog responses (/api/doctors,
+// /api/specialties, /api/subscriptions/plans). They are read on every
+// homepage and listing view but only change when a doctor is edited,
+// approved, suspended or reviewed, or a plan changes.
+//
+// Entries are evicted least recently used first and carry tags naming the
+// data they were built from; the routes that change that data invalidate the
+// tags:
+//
+//   doctor:<id>        lists that contain the doctor
+//   doctors            lists filtered by neither specialty nor city
+//   specialty:<name>   lists filtered by that specialty
+//   city:<name>        lists filtered by that city (wilaya name, no number)
+//   specialties        the specialty list
+//   plans              the subscription plans
+//
+// Each server instance has its own cache and only sees its own
+// invalidations, so entries also expire after TTL_MS.
+
+const MAX_ENTRIES = 500;
+const TTL_MS = 5 * 60 * 1000;
+
+interface Entry {
+    value: unknown;
+    tags: string[];
+    expires: number;
+}
+
+export interface CacheStats {
+    entries: number;
+    hits: number;
+    misses: number;
+    hitRate: number;
+    evictions: number;
+    invalidations: number;
+}
+
+export class ResponseCache {
+    // Map iteration order is insertion order: the first key is the least recently used
+    private entries = new Map<string, Entry>();
+    private keysByTag = new Map<string, Set<string>>();
+    private loading = new Map<string, Promise<unknown>>();
+    // Bumped by every invalidation, so a load that started before it is not stored
+    private generation = 0;
+    private hits = 0;
+    private misses = 0;
+    private evictions = 0;
+    private invalidations = 0;
+
+    constructor(private maxEntries: number, private ttlMs: number) {}
+
+    // The cached value for `key`, or the result of `load` stored under `tags`.
+    // Concurrent misses on the same key share one load.
+    async get<T>(
+        key: string,
+        load: () => Promise<T>,
+        tags: (value: T) => string[]
+    ): Promise<{ value: T; hit: boolean }> {
+        const entry = this.entries.get(key);
+        if (entry && entry.expires > Date.now()) {
+            this.entries.delete(key);
+            this.entries.set(key, entry);
+            this.hits++;
+            return { value: entry.value as T, hit: true };
+        }
+        if (entry) this.remove(key);
+        this.misses++;
+
+        let pending = this.loading.get(key) as Promise<T> | undefined;
+        if (!pending) {
+            const generation = this.generation;
+            pending = load().then((value) => {
+                if (generation === this.generation) this.set(key, value, tags(value));
+                return value;
+            });
+            this.loading.set(key, pending);
+            pending.finally(() => this.loading.delete(key)).catch(() => {});
+        }
+        return { value: await pending, hit: false };
+    }
+
+    // Drops every entry carrying one of `tags`; returns how many were dropped
+    invalidate(tags: string[]): number {
+        this.generation++;
+        let removed = 0;
+        for (const tag of tags) {
+            for (const key of Array.from(this.keysByTag.get(tag) ?? [])) {
+                this.remove(key);
+                removed++;
+            }
+        }
+        this.invalidations += removed;
+        return removed;
+    }
+
+    // Drops every entry, e.g. after the database was restored underneath the
+    // server; returns how many were dropped
+    clear(): number {
+        this.generation++;
+        const removed = this.entries.size;
+        this.entries.clear();
+        this.keysByTag.clear();
+        this.invalidations += removed;
+        return removed;
+    }
+
+    stats(): CacheStats {
+        const lookups = this.hits + this.misses;
+        return {
+            entries: this.entries.size,
+            hits: this.hits,
+            misses: this.misses,
+            hitRate: lookups ? this.hits / lookups : 0,
+            evictions: this.evictions,
+            invalidations: this.invalidations,
+        };
+    }
+
+    private set(key: string, value: unknown, tags: string[]) {
+        this.remove(key);
+        this.entries.set(key, { value, tags, expires: Date.now() + this.ttlMs });
+        for (const tag of tags) {
+            if (!this.keysByTag.has(tag)) this.keysByTag.set(tag, new Set());
+            this.keysByTag.get(tag)!.add(key);
+        }
+        while (this.entries.size > this.maxEntries) {
+            this.remove(this.entries.keys().next().value as string);
+            this.evictions++;
+        }
+    }
+
+    private remove(key: string) {
+        const entry = this.entries.get(key);
+        if (!entry) return;
+        this.entries.delete(key);
+        for (const tag of entry.tags) {
+            const keys = this.keysByTag.get(tag);
+            keys?.delete(key);
+            if (keys && keys.size === 0) this.keysByTag.delete(tag);
+        }
+    }
+}
+
+// One cache per server process, kept across hot reloads like the Prisma client
+const globalForCache = globalThis as unknown as {
+    responseCache: ResponseCache | undefined
+};
+
+export const responseCache = globalForCache.responseCache ?? new ResponseCache(MAX_ENTRIES, TTL_MS);
+
+if (process.env.NODE_ENV !== 'production') globalForCache.responseCache = responseCache;
+
+// Key for a response: the endpoint and its parameters in a fixed order,
+// empty ones left out, so equivalent URLs share an entry
+export function cacheKey(endpoint: string, params: Record<string, string | null | undefined> = {}): string {
+    const query = Object.keys(params)
+        .sort()
+        .flatMap((name) => {
+            const value = params[name]?.trim();
+            return value ? [`${name}=${encodeURIComponent(value)}`] : [];
+        })
+        .join('&');
+    return query ? `${endpoint}?${query}` : endpoint;
+}
+
+// Wilaya name of a city as stored ("16. الجزائر" -> "الجزائر")
+export function cityName(city: string): string {
+    return city.includes('. ') ? city.split('. ')[1] : city;
+}
+
+// Tags of every cached list a doctor appears in or could enter
+export function doctorTags(doctor: { id: number; specialty: string; city: string }): string[] {
+    return ['doctors', `doctor:${doctor.id}`, `specialty:${doctor.specialty}`, `city:${cityName(doctor.city)}`];
+}
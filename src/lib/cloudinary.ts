@@ -1,6 +1,8 @@
 export const cloudinaryConfig = {
     cloudName: process.env.NEXT_PUBLIC_CLOUDINARY_CLOUD_NAME || 'docteur',
     uploadPreset: process.env.NEXT_PUBLIC_CLOUDINARY_UPLOAD_PRESET || 'docteur_uploads',
+    // Overridden to point at the local stand-in (testsprite_tests/harness/cloudinary.py)
+    apiBase: process.env.NEXT_PUBLIC_CLOUDINARY_API_BASE || 'https://api.cloudinary.com',
 };
 
 // Determine the correct resource type for Cloudinary
@@ -11,5 +13,5 @@ export const getResourceType = (fileType: string): string => {
 
 export const getCloudinaryUploadUrl = (fileType: string) => {
     const resourceType = getResourceType(fileType);
-    return `https://api.cloudinary.com/v1_1/${cloudinaryConfig.cloudName}/${resourceType}/upload`;
+    return `${cloudinaryConfig.apiBase}/v1_1/${cloudinaryConfig.cloudName}/${resourceType}/upload`;
 };
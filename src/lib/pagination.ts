@@ -0,0 +1,159 @@
+// Pagination for the list endpoints. Two ways to ask for a page:
+//
+//   ?page=3&limit=20      page numbers, with total and totalPages as before
+//   ?cursor=<nextCursor>  the page after the one that returned nextCursor
+//
+// Cursors are opaque. For sort orders on plain columns they hold the sort
+// values of the last row, and the next page is read with a keyset condition
+// (`WHERE (createdAt, id) < (...)`) instead of skipping rows, so deep pages
+// cost the same as the first. Orders a condition cannot express, such as a
+// relation count or a search rank, keep an offset in the cursor.
+//
+// Counting is optional: page-number requests count unless `count=false`,
+// cursor requests only with `count=true`.
+
+type Direction = 'asc' | 'desc';
+
+export type OrderBy = Record<string, any>[];
+
+export interface PageRequest {
+    limit: number;
+    page: number | null;
+    skip: number;
+    after: unknown[] | null;
+    withTotal: boolean;
+    orderBy: OrderBy;
+}
+
+export interface Pagination {
+    page?: number;
+    limit: number;
+    total?: number;
+    totalPages?: number;
+    nextCursor: string | null;
+    hasMore: boolean;
+}
+
+// Sort keys as [field, direction], or null when the order is not on plain columns
+function keysetKeys(orderBy: OrderBy): [string, Direction][] | null {
+    const keys = orderBy.map((entry) => Object.entries(entry)[0]);
+    return keys.every(([, direction]) => direction === 'asc' || direction === 'desc')
+        ? (keys as [string, Direction][])
+        : null;
+}
+
+// Ties a cursor to the order it was made for
+function signature(orderBy: OrderBy): string {
+    return orderBy.map((entry) => JSON.stringify(entry)).join(',');
+}
+
+function encodeCursor(orderBy: OrderBy, position: { after?: unknown[]; offset?: number }): string {
+    const values = position.after?.map((v) => (v instanceof Date ? { $date: v.toISOString() } : v));
+    return Buffer.from(JSON.stringify({ s: signature(orderBy), k: values, o: position.offset }))
+        .toString('base64url');
+}
+
+function decodeCursor(cursor: string, orderBy: OrderBy): { after: unknown[] | null; offset: number } | null {
+    try {
+        const data = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+        if (data.s !== signature(orderBy)) return null;
+        if (Array.isArray(data.k)) {
+            const after = data.k.map((v: any) => (v && typeof v === 'object' && '$date' in v ? new Date(v.$date) : v));
+            return { after, offset: 0 };
+        }
+        if (Number.isInteger(data.o) && data.o >= 0) {
+            return { after: null, offset: data.o };
+        }
+    } catch (e) {
+        // Not a cursor of ours
+    }
+    return null;
+}
+
+// The page asked for by the query string, or null for an invalid cursor.
+// `orderBy` must end with a unique column (usually id) for cursors to be exact.
+export function parsePageRequest(
+    searchParams: URLSearchParams,
+    orderBy: OrderBy,
+    defaultLimit: number
+): PageRequest | null {
+    const limit = Math.max(parseInt(searchParams.get('limit') || '') || defaultLimit, 1);
+    const cursor = searchParams.get('cursor');
+    const count = searchParams.get('count');
+
+    if (cursor) {
+        const position = decodeCursor(cursor, orderBy);
+        if (!position) return null;
+        return {
+            limit,
+            page: null,
+            skip: position.offset,
+            after: position.after,
+            withTotal: count === 'true',
+            orderBy,
+        };
+    }
+
+    const page = Math.max(parseInt(searchParams.get('page') || '1') || 1, 1);
+    return { limit, page, skip: (page - 1) * limit, after: null, withTotal: count !== 'false', orderBy };
+}
+
+// Rows after the cursor position in `orderBy`:
+// (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z) ...
+export function keysetWhere(orderBy: OrderBy, after: unknown[]) {
+    const keys = keysetKeys(orderBy)!;
+    return {
+        OR: keys.map(([field, direction], i) => ({
+            ...Object.fromEntries(keys.slice(0, i).map(([f], j) => [f, after[j]])),
+            [field]: { [direction === 'asc' ? 'gt' : 'lt']: after[i] },
+        })),
+    };
+}
+
+// Builds the response pagination from `limit + 1` rows read at the request's position
+export function pageResult<T extends Record<string, any>>(request: PageRequest, rows: T[], total?: number) {
+    const hasMore = rows.length > request.limit;
+    const items = rows.slice(0, request.limit);
+    const keys = keysetKeys(request.orderBy);
+    const last = items[items.length - 1];
+
+    let nextCursor: string | null = null;
+    if (hasMore && last) {
+        nextCursor = keys
+            ? encodeCursor(request.orderBy, { after: keys.map(([field]) => last[field]) })
+            : encodeCursor(request.orderBy, { offset: request.skip + request.limit });
+    }
+
+    const pagination: Pagination = { limit: request.limit, nextCursor, hasMore };
+    if (request.page !== null) {
+        pagination.page = request.page;
+    }
+    if (total !== undefined) {
+        pagination.total = total;
+        if (request.page !== null) {
+            pagination.totalPages = Math.ceil(total / request.limit);
+        }
+    }
+    return { items, pagination };
+}
+
+// Reads one page with `findMany` (given where, orderBy, skip and take) and,
+// when asked for, the total with `count`
+export async function paginate<T extends Record<string, any>>(
+    request: PageRequest,
+    where: any,
+    findMany: (args: { where: any; orderBy: OrderBy; skip: number; take: number }) => Promise<T[]>,
+    count: (where: any) => Promise<number>
+) {
+    const keyset = request.after !== null && keysetKeys(request.orderBy) !== null;
+    const [rows, total] = await Promise.all([
+        findMany({
+            where: keyset ? { AND: [where, keysetWhere(request.orderBy, request.after!)] } : where,
+            orderBy: request.orderBy,
+            skip: keyset ? 0 : request.skip,
+            take: request.limit + 1,
+        }),
+        request.withTotal ? count(where) : Promise.resolve(undefined),
+    ]);
+    return pageResult(request, rows, total);
+}
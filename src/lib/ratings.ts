@@ -0,0 +1,65 @@
+import prisma from '@/lib/prisma';
+
+// Rating aggregates stored on the doctor row, so listings and profiles never
+// read the reviews table to show a rating
+
+export const ratingSelect = {
+    ratingAvg: true,
+    ratingCount: true,
+} as const;
+
+export const ratingHistogramSelect = {
+    ...ratingSelect,
+    rating1: true,
+    rating2: true,
+    rating3: true,
+    rating4: true,
+    rating5: true,
+} as const;
+
+interface RatingFields {
+    ratingAvg: number;
+    ratingCount: number;
+}
+
+interface RatingHistogramFields extends RatingFields {
+    rating1: number;
+    rating2: number;
+    rating3: number;
+    rating4: number;
+    rating5: number;
+}
+
+// Add one rating to a doctor's aggregates. Run it in the same transaction
+// as the review insert; the increments happen inside a single UPDATE, so
+// concurrent reviews cannot overwrite each other.
+export function addRating(doctorId: number, rating: number) {
+    return prisma.$executeRaw`
+        UPDATE doctors SET
+            rating_sum = rating_sum + ${rating},
+            rating_count = rating_count + 1,
+            rating_avg = CAST(rating_sum + ${rating} AS REAL) / (rating_count + 1),
+            rating_1 = rating_1 + (${rating} = 1),
+            rating_2 = rating_2 + (${rating} = 2),
+            rating_3 = rating_3 + (${rating} = 3),
+            rating_4 = rating_4 + (${rating} = 4),
+            rating_5 = rating_5 + (${rating} = 5)
+        WHERE id = ${doctorId}`;
+}
+
+export function ratingSummary(doctor: RatingFields) {
+    return {
+        rating: Math.round(doctor.ratingAvg * 10) / 10,
+        reviewCount: doctor.ratingCount,
+    };
+}
+
+export function ratingHistogram(doctor: RatingHistogramFields): Record<1 | 2 | 3 | 4 | 5, number> {
+    return {
+        1: doctor.rating1,
+        2: doctor.rating2,
+        3: doctor.rating3,
+        4: doctor.rating4,
+        5: doctor.rating5,
+    };
+}
@@ -0,0 +1,111 @@
+import { Prisma } from '@prisma/client';
+import prisma from '@/lib/prisma';
+import { indexText, searchTokens } from '@/lib/arabic';
+
+// Full-text index of doctors: the FTS5 table doctors_fts (prisma/migration.sql)
+// holds the normalized text of each doctor under rowid = doctors.id.
+// `npm run db:search-index` creates and rebuilds it. `prisma db push` does
+// not, so until then index updates are skipped and /api/doctors searches
+// with the plain LIKE filters.
+
+type Db = Prisma.TransactionClient | typeof prisma;
+
+interface IndexedDoctor {
+    id: number;
+    name: string;
+    specialty: string;
+    city: string;
+    clinicAddress?: string | null;
+    bio?: string | null;
+}
+
+// bm25 column weights: name, specialty, city, clinic_address, bio
+const RANK = Prisma.sql`bm25(doctors_fts, 10.0, 5.0, 3.0, 1.0, 1.0)`;
+
+let missingIndexLogged = false;
+
+// Whether `error` is a query on doctors_fts in a database that lacks it
+export function isMissingIndex(error: unknown): boolean {
+    const message = String((error as any)?.meta?.message ?? (error as any)?.message ?? '');
+    if (!message.includes('no such table') || !message.includes('doctors_fts')) return false;
+    if (!missingIndexLogged) {
+        missingIndexLogged = true;
+        console.warn('[Search] doctors_fts is missing; run `npm run db:search-index`');
+    }
+    return true;
+}
+
+export async function indexDoctor(db: Db, doctor: IndexedDoctor) {
+    try {
+        await db.$executeRaw`DELETE FROM doctors_fts WHERE rowid = ${doctor.id}`;
+        await db.$executeRaw`
+            INSERT INTO doctors_fts (rowid, name, specialty, city, clinic_address, bio)
+            VALUES (${doctor.id}, ${indexText(doctor.name)}, ${indexText(doctor.specialty)},
+                    ${indexText(doctor.city)}, ${indexText(doctor.clinicAddress)}, ${indexText(doctor.bio)})`;
+    } catch (error) {
+        if (!isMissingIndex(error)) throw error;
+    }
+}
+
+export async function unindexDoctor(db: Db, doctorId: number) {
+    try {
+        await db.$executeRaw`DELETE FROM doctors_fts WHERE rowid = ${doctorId}`;
+    } catch (error) {
+        if (!isMissingIndex(error)) throw error;
+    }
+}
+
+// FTS5 query for what the user typed: every word must match, the last one
+// as a prefix since it may still be being typed. Null when nothing is left.
+export function matchQuery(search: string): string | null {
+    const tokens = searchTokens(search);
+    if (tokens.length === 0) return null;
+    return tokens
+        .map((token, i) => (i === tokens.length - 1 ? `"${token}"*` : `"${token}"`))
+        .join(' ');
+}
+
+interface SearchOptions {
+    specialty?: string | null;
+    city?: string | null;
+    sort?: string | null;
+    skip: number;
+    take: number;
+    withTotal?: boolean;
+}
+
+// Ids of the listed doctors matching `match`, best match first (or best
+// rated with sort=rating), with the total for pagination when asked for
+export async function searchDoctorIds(match: string, options: SearchOptions) {
+    const filters = [
+        Prisma.sql`doctors_fts MATCH ${match}`,
+        Prisma.sql`d.approved = 1`,
+        Prisma.sql`u.status = 'ACTIVE'`,
+    ];
+    if (options.specialty) {
+        filters.push(Prisma.sql`d.specialty = ${options.specialty}`);
+    }
+    if (options.city) {
+        filters.push(Prisma.sql`d.city LIKE ${`%${options.city}%`}`);
+    }
+    const from = Prisma.sql`
+        FROM doctors_fts
+        JOIN doctors d ON d.id = doctors_fts.rowid
+        JOIN users u ON u.id = d.user_id
+        WHERE ${Prisma.join(filters, ' AND ')}`;
+    const orderBy = options.sort === 'rating'
+        ? Prisma.sql`d.rating_avg DESC, d.rating_count DESC, d.created_at DESC, d.id DESC`
+        : Prisma.sql`${RANK}, d.created_at DESC, d.id DESC`;
+
+    const [rows, counts] = await Promise.all([
+        prisma.$queryRaw<{ id: number }[]>`
+            SELECT d.id ${from} ORDER BY ${orderBy} LIMIT ${options.take} OFFSET ${options.skip}`,
+        options.withTotal
+            ? prisma.$queryRaw<{ total: number }[]>`SELECT COUNT(*) AS total ${from}`
+            : Promise.resolve(null),
+    ]);
+    return {
+        ids: rows.map((row) => Number(row.id)),
+        total: counts ? Number(counts[0]?.total ?? 0) : undefined,
+    };
+}
@@ -0,0 +1,121 @@
+import { Prisma } from '@prisma/client';
+import prisma from '@/lib/prisma';
+import { generateTimeSlots } from '@/lib/utils';
+
+// Bookable slots of a doctor: the 30-minute steps of their working hours
+// minus the appointments that hold them. Every appointment but a cancelled
+// one holds its slot, and the unique index appointments_active_slot_key
+// (prisma/migration.sql, `npm run db:booking-index`) keeps two patients who
+// book the same slot at once from both getting it.
+
+export const SLOT_MINUTES = 30;
+export const MAX_RANGE_DAYS = 31;
+
+// Clinics are in Algeria: today and the hours already past are counted there
+const CLINIC_TIME_ZONE = 'Africa/Algiers';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const DAYS = ['sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday'];
+
+type WorkingHours = Record<string, { start: string; end: string } | null>;
+
+export interface DaySlots {
+    date: string;
+    slots: string[];
+}
+
+// Appointments are stored at UTC midnight of their day, which is also what
+// `new Date('2025-03-01')` gives for the date the booking form sends
+export function parseDay(value: string): Date | null {
+    const match = /^(\d{4})-(\d{2})-(\d{2})/.exec(value);
+    if (!match) return null;
+    const day = new Date(Date.UTC(Number(match[1]), Number(match[2]) - 1, Number(match[3])));
+    return dayKey(day) === match[0] ? day : null;
+}
+
+export function dayKey(day: Date): string {
+    return day.toISOString().slice(0, 10);
+}
+
+// "9:00" -> "09:00", so one slot has one spelling in the unique index
+export function parseTime(value: string): string | null {
+    const match = /^(\d{1,2}):(\d{2})$/.exec(String(value).trim());
+    if (!match || Number(match[1]) > 23 || Number(match[2]) > 59) return null;
+    return `${match[1].padStart(2, '0')}:${match[2]}`;
+}
+
+function parseWorkingHours(value: string | null): WorkingHours | null {
+    if (!value) return null;
+    try {
+        const hours = JSON.parse(value);
+        return hours && typeof hours === 'object' ? hours : null;
+    } catch (e) {
+        return null;
+    }
+}
+
+// The slots of a day from working hours, as the booking form lays them out
+function daySlots(hours: WorkingHours | null, day: Date): string[] {
+    const range = hours?.[DAYS[day.getUTCDay()]];
+    if (!range?.start || !range?.end) return [];
+    return generateTimeSlots(range.start, range.end, SLOT_MINUTES);
+}
+
+// Date and time now at the clinics, as "YYYY-MM-DD" and "HH:MM"
+function clinicNow() {
+    const parts = Object.fromEntries(
+        new Intl.DateTimeFormat('en-CA', {
+            timeZone: CLINIC_TIME_ZONE,
+            year: 'numeric',
+            month: '2-digit',
+            day: '2-digit',
+            hour: '2-digit',
+            minute: '2-digit',
+            hourCycle: 'h23',
+        }).formatToParts(new Date()).map((part) => [part.type, part.value])
+    );
+    return { date: `${parts.year}-${parts.month}-${parts.day}`, time: `${parts.hour}:${parts.minute}` };
+}
+
+// Today at the clinics, as stored (UTC midnight)
+export function clinicToday(): Date {
+    return parseDay(clinicNow().date)!;
+}
+
+// Free slots of every day from `from` to `to` inclusive. Past days and the
+// past hours of today have none.
+export async function freeSlots(
+    doctor: { id: number; workingHours: string | null },
+    from: Date,
+    to: Date
+): Promise<DaySlots[]> {
+    const end = new Date(to.getTime() + DAY_MS);
+    const booked = await prisma.appointment.findMany({
+        where: {
+            doctorId: doctor.id,
+            status: { not: 'CANCELLED' },
+            date: { gte: from, lt: end },
+        },
+        select: { date: true, time: true },
+    });
+    const taken = new Set(booked.map((appointment) => `${dayKey(appointment.date)} ${appointment.time}`));
+
+    const hours = parseWorkingHours(doctor.workingHours);
+    const now = clinicNow();
+    const days: DaySlots[] = [];
+    for (let day = from; day < end; day = new Date(day.getTime() + DAY_MS)) {
+        const date = dayKey(day);
+        const slots = date < now.date
+            ? []
+            : daySlots(hours, day).filter((time) =>
+                !taken.has(`${date} ${time}`) && (date > now.date || time > now.time));
+        days.push({ date, slots });
+    }
+    return days;
+}
+
+// Whether a write failed on appointments_active_slot_key, i.e. the slot was
+// booked by someone else first
+export function isSlotTaken(error: unknown): boolean {
+    return error instanceof Prisma.PrismaClientKnownRequestError && error.code === 'P2002';
+}
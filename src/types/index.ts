@@ -20,6 +20,7 @@ export interface DoctorPublic {
     bio: string | null;
     rating: number;
     reviewCount: number;
+    ratingHistogram?: Record<1 | 2 | 3 | 4 | 5, number>;
 }
 
 export interface PatientData {
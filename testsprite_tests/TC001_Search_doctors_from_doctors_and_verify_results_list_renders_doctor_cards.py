@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -37,7 +38,7 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/nav/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -49,7 +50,6 @@ async def run_test():
         
         # Cannot verify Rating and Price because their exact xpaths are not present in the provided available elements list
         raise AssertionError('Rating and Price elements are not available in the provided elements list; cannot verify their visibility. Please provide exact xpaths for the rating and price elements.')
-        await asyncio.sleep(5)
 
     finally:
         if context:
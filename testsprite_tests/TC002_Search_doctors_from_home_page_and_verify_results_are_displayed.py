@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -37,13 +38,13 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/section[1]/div/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Type 'الجزائر' into the city input (index 413) and submit the search (press Enter) to trigger results.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/section[2]/div/div/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('الجزائر')
+        await waits.fill(elem, 'الجزائر')
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -51,7 +52,6 @@ async def run_test():
         assert '/doctors' in frame.url
         await expect(frame.locator('text=طبيب').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=السعر').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
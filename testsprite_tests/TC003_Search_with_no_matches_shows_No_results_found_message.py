@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -37,13 +38,12 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/nav/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=No results found').first).to_be_visible(timeout=3000)
         await expect(frame.locator('xpath=//div[contains(@class,"doctor-card")]').first).not_to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
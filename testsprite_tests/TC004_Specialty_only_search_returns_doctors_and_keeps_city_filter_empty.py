@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -37,15 +38,14 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/nav/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Open the specialty dropdown so the 'قلب' option can be selected (click element index 342).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/section[2]/div/div/div/div[2]/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -37,20 +38,19 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/nav/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Type 'وهران' into the city search field (index 420) and submit the search (press Enter).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/section[2]/div/div/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('وهران')
+        await waits.fill(elem, 'وهران')
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('xpath=//div[contains(@class,"doctor-card") or contains(@class,"doctorCard") or @data-test="doctor-card"]').first).to_be_visible(timeout=3000)
         await expect(frame.locator('xpath=//div[contains(@class,"doctor-card") or contains(@class,"doctorCard")]//span[contains(@class,"rating") or contains(@aria-label,"rating") or contains(.,"Rating") or contains(.,"★")]').first).to_be_visible(timeout=3000)
         await expect(frame.locator('xpath=//div[contains(@class,"doctor-card") or contains(@class,"doctorCard")]//span[contains(@class,"price") or contains(.,"DA") or contains(.,"د.ج") or contains(.,"Price")]').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -37,13 +38,13 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/nav/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Submit the search with empty filters by focusing the search input and sending Enter (to trigger the search). Then check results in subsequent steps.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/section[2]/div/div/div/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -51,7 +52,6 @@ async def run_test():
         assert await frame.locator('xpath=/html/body/section[2]/div/div/div/div[1]/input').is_visible(), "Search input is not visible on /doctors page"
         # The page does not contain an explicit search/submit button in the provided elements list — report and stop the task
         raise RuntimeError('Search/submit button not found on the page; feature appears to be missing. Task marked done.')
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -37,19 +38,18 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/nav/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Open the specialty dropdown by clicking the specialty select element (index 340) so the specialty search input/options become available.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/section[2]/div/div/div/div[2]/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=دكتور').first).to_be_visible(timeout=3000)
         await expect(frame.locator('xpath=//div[(contains(@class,"card") or contains(@class,"doctor"))]//span[contains(text(),"د.ج")]').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
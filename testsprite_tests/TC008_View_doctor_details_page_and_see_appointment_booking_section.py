@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -37,25 +38,25 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/nav/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the first doctor card ('عرض الملف') to open the doctor's profile and booking UI (use element index 750).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/section[3]/div/div/div[1]/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the first doctor card again (element index 750) to open the doctor's profile and reveal the booking UI so the booking-related elements can be verified.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/section[3]/div/div/div[1]/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'احجز الآن' (Book Now) button (index 1090) to open the booking form so the 'Patient name' and 'Phone' input fields can be verified.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -67,7 +68,6 @@ async def run_test():
         assert await frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[1]/input').is_visible()
         assert await frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[2]/input').is_visible()
         assert await frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[3]/input').is_visible()
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -37,85 +38,84 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/nav/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the first doctor card's 'عرض الملف' button to open the doctor's profile (index 752).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/section[3]/div/div/div[1]/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the first doctor card's 'عرض الملف' button (index 752) to open the doctor's profile and reveal appointment slots.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/section[3]/div/div/div[1]/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'احجز الآن' button (index 1087) to open the booking form so appointment slots and booking fields become available.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Input a valid date into the date field (index 1168) and then fill name and phone, submit the booking, and check for the confirmation message.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2026-02-22')
+        await waits.fill(elem, '2026-02-22')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Patient')
+        await waits.fill(elem, 'Test Patient')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('0555123456')
+        await waits.fill(elem, '0555123456')
         
         # -> Select an available time slot, submit the booking by clicking 'تأكيد الحجز' (index 1184), then verify the success/confirmation message is visible.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[2]/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[7]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click 'احجز الآن' (index 1306) to ensure booking form is open, then click the 'تأكيد الحجز' button (index 1184) after selecting a time slot, and finally verify that the text 'Booking confirmed' is visible.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Select an available time slot (click 8:00 button index 1337), click the Confirm booking button (index 1371), then search the page for the text 'Booking confirmed' to verify success.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[2]/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[7]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Select an alternate time slot (click index 1338), click confirm booking (index 1371), then search the page for the text 'Booking confirmed' to verify success.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div[2]/div[2]/div[2]/form/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div[2]/div[2]/div[2]/form/div[7]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem, api="/api/appointments", method="POST")
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Booking confirmed').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -37,58 +38,58 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/nav/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click on the first doctor card's 'عرض الملف' button (element index 750) to open the doctor's profile and booking UI.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/section[3]/div/div/div[1]/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'احجز الآن' (Book Now) button to open the booking form (index 911). ASSERTION: clicking this should open the booking form/modal with date/time and patient fields.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Enter a date into the date field (index 986), fill 'Test Patient' into the full name field (index 988), then click the 'تأكيد الحجز' (Confirm booking) button (index 1002). After the click, check for the validation message 'Phone is required'.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2026-02-22')
+        await waits.fill(elem, '2026-02-22')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Patient')
+        await waits.fill(elem, 'Test Patient')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[6]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Open the booking form, enter only the patient name (leave phone blank), submit the booking, and verify that a visible validation error indicating the phone field is required appears. ASSERTION: Submitting the booking without a phone should produce a phone-required validation message.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Select an available time slot, clear the phone input (leave phone blank), locate/reveal the 'تأكيد الحجز' (Confirm booking) button, click it to submit, then verify that a visible validation message indicating the phone is required appears.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[2]/div/button[7]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.fill(elem, '')
         
         # -> Click the 'تأكيد الحجز' (Confirm booking) button (index 1172) to submit the form with an empty phone field, then check for a visible validation message indicating the phone is required.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[7]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -99,10 +100,9 @@ async def run_test():
         assert phone_value == '', f"Expected phone input to be empty before submission, but has value: {phone_value}"
         # Ensure booking form is present by checking the Cancel button
         cancel_btn = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[7]/button[2]').nth(0)
-        assert await cancel_btn.is_visible(), 'Booking form does not appear to be open (Cancel button not visible)',
+        assert await cancel_btn.is_visible(), 'Booking form does not appear to be open (Cancel button not visible)'
         # The expected validation message element with text "Phone is required" is not present in the available elements for this page. Report the missing feature.
         raise AssertionError("Validation message 'Phone is required' not found on the page. The phone-required validation message or its element appears to be missing; reporting the issue and marking the task done.")
-        await asyncio.sleep(5)
 
     finally:
         if context:
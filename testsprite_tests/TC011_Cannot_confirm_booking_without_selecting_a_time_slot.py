@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -37,76 +38,75 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/nav/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the first doctor's 'عرض الملف' (View profile) button to open the doctor's profile and booking form (use interactive element index 754).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/section[3]/div/div/div[1]/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the first doctor's 'عرض الملف' (index 754) again to attempt to open the doctor's profile/booking form so the Patient name and Phone fields become available.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/section[3]/div/div/div[1]/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'احجز الآن' button (interactive element index 1091) to open the booking form, then wait briefly for the SPA/modal to render.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Type 'Test Patient' into the 'Patient name' field (input index 1172).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Patient')
+        await waits.fill(elem, 'Test Patient')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('0555123456')
+        await waits.fill(elem, '0555123456')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[6]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'احجز الآن' (Book Now) button (interactive element index 1244) to open the booking form so the Confirm booking action can be attempted.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'تأكيد الحجز' (Confirm booking) button (interactive element index 1292) to attempt confirming the booking without selecting a date/time, then wait for the UI response to check for the 'Select a date and time' validation message.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[6]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'احجز الآن' (Book Now) button (interactive element index 1331) to open the booking form so the confirm booking without a date selection can be attempted and the validation message checked.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'تأكيد الحجز' (Confirm booking) button (interactive element index 1379) to attempt submitting without selecting a date/time, then wait and check the page for the validation message 'Select a date and time' (and common Arabic equivalents).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/form/div[6]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'احجز الآن' (Book Now) button (interactive element index 1418) to open the booking form so the confirm-without-date attempt can be executed.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/main/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Select a date and time').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import auth, waits
 
 async def run_test():
     pw = None
@@ -30,34 +31,14 @@ async def run_test():
         page = await context.new_page()
 
         # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Navigate to /login (http://localhost:3000/login) using the required navigate action.
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
-        
-        # -> Enter credentials into the form: type email into index 309, type password into index 310, then click the Login button at index 313.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=/html/body/div/div/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@docteur.dz')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=/html/body/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=/html/body/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Open /dashboard with the cached doctor session instead of driving the /login form.
+        await auth.goto(page, "doctor")
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         assert '/dashboard' in frame.url
         await expect(frame.locator('text=إحصائيات').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=المواعيد القادمة').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
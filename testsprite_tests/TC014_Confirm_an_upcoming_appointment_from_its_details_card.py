@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import auth, waits
 
 async def run_test():
     pw = None
@@ -30,59 +31,36 @@ async def run_test():
         page = await context.new_page()
 
         # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Click the 'تسجيل الدخول' link to open the login page (use interactive element index 58).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=/html/body/nav/div/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the email and password fields (indexes 319 and 323) with admin@docteur.dz / admin123 and click the 'دخول' button (index 326).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=/html/body/div[2]/div/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@docteur.dz')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=/html/body/div[2]/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=/html/body/div[2]/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Open /dashboard with the cached doctor session instead of driving the /login form.
+        await auth.goto(page, "doctor")
         
         # -> Click the 'إجمالي المواعيد' / upcoming appointments metric card to open the appointments list or the upcoming appointment card (click element index 459).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/main/div[2]/div[1]/div[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'إجمالي المواعيد' metric card again (index 459) to try to open the appointments list or reveal upcoming appointment cards.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/main/div[2]/div[1]/div[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'إجمالي المواعيد' metric element with index 478 to try to open the appointments list or reveal upcoming appointment cards.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[1]/main/div[2]/div[4]/div[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Try a different navigation path to find appointments — open the 'الأطباء' section to look for doctor view or links to appointments, by clicking element index 402.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/aside/nav/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=تم التأكيد').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
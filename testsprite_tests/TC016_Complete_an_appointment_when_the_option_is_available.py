@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import auth, waits
 
 async def run_test():
     pw = None
@@ -30,41 +31,18 @@ async def run_test():
         page = await context.new_page()
 
         # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Click the 'تسجيل الدخول' (Login) link to open the login page.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=/html/body/nav/div/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the email and password fields with the provided credentials and submit the login form (type email into index 319, type password into index 323, then click the login button at index 326).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=/html/body/div[2]/div/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@docteur.dz')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=/html/body/div[2]/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=/html/body/div[2]/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Open /dashboard with the cached doctor session instead of driving the /login form.
+        await auth.goto(page, "doctor")
         
         # -> Open the 'الأطباء' (Doctors) section from the admin sidebar to look for doctor/appointment controls or a way to access the doctor's appointment view.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/aside/nav/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=مكتمل').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
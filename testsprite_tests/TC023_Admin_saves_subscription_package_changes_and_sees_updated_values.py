@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import auth, waits
 
 async def run_test():
     pw = None
@@ -30,65 +31,42 @@ async def run_test():
         page = await context.new_page()
 
         # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Click the 'تسجيل الدخول' (Login) link to open the login page (interactive element index 59).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=/html/body/nav/div/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Enter the test email into the email field (index 320). Then enter the password (index 324) and click the 'دخول' button (index 327).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=/html/body/div[2]/div/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@docteur.dz')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=/html/body/div[2]/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=/html/body/div[2]/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Open /admin with the cached admin session instead of driving the /login form.
+        await auth.goto(page, "admin")
         
         # -> Open the Subscription Packages (الباقات) list so the first package can be edited (click the 'الباقات' / 'إدارة الباقات' link). ASSERTION: The 'الباقات' menu item (index 409) is visible and clickable.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/aside/nav/ul/li[4]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'تعديل' (Edit) button for the first subscription package to open the edit form (click interactive element index 624). ASSERTION: Clicking index 624 should open the edit form/modal where the Save button will be available.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/main/div[2]/div[1]/div/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the 'حفظ' (Save) button (interactive element index 775) to submit the edited subscription package.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[1]/main/div[3]/div/form/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Open the first package's edit modal again so its fields can be inspected and search the page for the success message 'تم التحديث بنجاح'. Click the Edit button for the first package (interactive element index 624).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/main/div[2]/div[1]/div/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # -> Click the modal Save button (index 871) to submit the edit, wait for completion, look for the success message 'تم التحديث بنجاح', then close the modal and verify the package details are visible in the list (e.g., price '‏2.000 د.ج.‏').
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[1]/main/div[3]/div/form/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=تم التحديث بنجاح').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
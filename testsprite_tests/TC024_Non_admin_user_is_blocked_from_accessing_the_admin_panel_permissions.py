@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import waits
 
 async def run_test():
     pw = None
@@ -40,17 +41,17 @@ async def run_test():
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('nonadmin@example.com')
+        await waits.fill(elem, 'nonadmin@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrong-nonadmin-password')
+        await waits.fill(elem, 'wrong-nonadmin-password')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(elem, api="/api/auth/callback/credentials")
         
         # -> Navigate to /admin and check for the insufficient-permissions messages ('غير مصرح' and '403').
         await page.goto("http://localhost:3000/admin", wait_until="commit", timeout=10000)
@@ -59,7 +60,6 @@ async def run_test():
         frame = context.pages[-1]
         await expect(frame.locator('text=غير مصرح').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=403').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
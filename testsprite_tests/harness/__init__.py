@@ -0,0 +1,15 @@
+"""Local runner for the TestSprite-generated Playwright flows."""
+from .loader import TestCase, discover
+from .pool import BrowserPool
+from .report import SuiteRun, TestResult
+from .runner import run_case, run_suite
+
+__all__ = [
+    "BrowserPool",
+    "SuiteRun",
+    "TestCase",
+    "TestResult",
+    "discover",
+    "run_case",
+    "run_suite",
+]
@@ -0,0 +1,659 @@
+"""Command line entry point: ``python -m harness <command>`` from testsprite_tests/."""
+import argparse
+import asyncio
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+from . import (cloudinary, config, dataset, fastmode, history, impact, load, network, plan, profiler, search,
+               server, snapshot, soak, throttle, uploads)
+from .loader import discover, select
+from .report import format_comparison, format_table, read_results, write_results
+from .parallel import plan_shards, run_parallel
+from .runner import run_suite
+
+
+def _apply_backend(args) -> None:
+    # Exported so worker processes started for --workers see the same mode
+    config.BACKEND = os.environ["HARNESS_BACKEND"] = args.backend
+    if args.record:
+        config.RECORD = True
+        os.environ["HARNESS_RECORD"] = "1"
+    if args.no_har:
+        config.HAR = False
+        os.environ["HARNESS_HAR"] = "0"
+    if args.fast:
+        config.FAST = True
+        os.environ["HARNESS_FAST"] = "1"
+    if args.fast_baseline:
+        config.FAST_BASELINE = True
+        os.environ["HARNESS_FAST_BASELINE"] = "1"
+    if args.profile:
+        config.PROFILE = True
+        os.environ["HARNESS_PROFILE"] = "1"
+    if args.db:
+        config.DB = os.environ["HARNESS_DB"] = str(args.db)
+    config.BUDGETS = os.environ["HARNESS_BUDGETS"] = args.budgets
+    throttle.activate(args.throttle)
+
+
+@contextmanager
+def _server(mode: str):
+    """Start the app for ``--server launch``; afterwards every mode but "off" attaches."""
+    process = None
+    if mode == "launch":
+        process = server.ServerProcess()
+        process.start()
+        mode = "attach"
+    config.SERVER = os.environ["HARNESS_SERVER"] = mode
+    try:
+        yield
+    finally:
+        if process is not None:
+            process.stop()
+
+
+def _print_reports(results) -> None:
+    data = [r.to_json() for r in results]
+    summary = profiler.format_hotspots(data)
+    if summary:
+        print("Client-side hotspots per user action:")
+        print(summary)
+        print()
+    summary = server.format_summary(data)
+    if summary:
+        print("Server resources per test:")
+        print(summary)
+        for entry in data:
+            for violation in entry.get("serverBudgetViolations", []):
+                print(f"  {entry['id']}: {violation}")
+        print()
+    summary = fastmode.format_summary(data)
+    if summary:
+        print("Fast mode savings (against the last full-resource run):")
+        print(summary)
+        print()
+
+
+def _select_changed(cases, base: str):
+    """``cases`` narrowed to those affected by the diff against ``base``; None on error."""
+    changed = impact.changed_files(base)
+    if changed is None:
+        print(f"git diff against {base} failed.", file=sys.stderr)
+        return None
+    selected, reasons, fallback = impact.select(cases, changed, impact.load_map())
+    if fallback:
+        print(f"Running all {len(cases)} tests: {fallback}")
+        return cases
+    for case in selected:
+        print(f"{case.id}: {', '.join(reasons[case.id][:3])}")
+    print(f"{len(selected)} of {len(cases)} tests affected by {len(changed)} changed files")
+    return selected
+
+
+def _cmd_run(args) -> int:
+    _apply_backend(args)
+    if config.DB and args.workers > 1:
+        print("--db restores one database between tests and needs --workers 1.", file=sys.stderr)
+        return 2
+    cases = select(discover(args.ids), args.category, args.priority)
+    if not cases:
+        print("No matching TC scripts found.", file=sys.stderr)
+        return 2
+    if args.changed_since:
+        cases = _select_changed(cases, args.changed_since)
+        if cases is None:
+            return 2
+        if not cases:
+            return 0
+
+    def progress(result):
+        shard = f"[{result.extra['shard']}] " if "shard" in result.extra else ""
+        print(f"{shard}{result.id} {result.testStatus:<6} setup {result.setupMs:7.0f} ms  "
+              f"test {result.durationMs:8.0f} ms", flush=True)
+
+    if args.show_shards:
+        for shard in plan_shards(cases, args.workers):
+            print(f"shard {shard.index}: ~{shard.load / 1000:.0f} s  {' '.join(shard.ids)}")
+        return 0
+
+    try:
+        with _server(args.server):
+            if args.workers > 1:
+                run = run_parallel(cases, args.workers, pool_size=args.pool_size, on_result=progress)
+            else:
+                run = asyncio.run(run_suite(cases, pool_size=args.pool_size,
+                                            use_pool=not args.no_pool, on_result=progress))
+    except server.ServerNotFound as exc:
+        print(f"Server profiling: {exc}", file=sys.stderr)
+        return 2
+    path = write_results(run.results, args.output)
+    impact.update_map([r.to_json() for r in run.results])
+    history.record([r.to_json() for r in run.results], "run", run.wallMs)
+    print()
+    print(format_table(run.results))
+    print()
+    summary = network.format_summary([r.to_json() for r in run.results])
+    if summary:
+        print("Network findings per page:")
+        print(summary)
+        print()
+    _print_reports(run.results)
+    if run.poolStartupMs:
+        print(f"Pool startup {run.poolStartupMs:.0f} ms")
+    print(f"Wall clock {run.wallMs / 1000:.1f} s")
+    print(f"Results written to {path}")
+    return 0 if all(r.passed for r in run.results) else 1
+
+
+def _cmd_plan(args) -> int:
+    _apply_backend(args)
+    cases = select(discover(args.ids), args.category, args.priority)
+    if not cases:
+        print("No matching plan entries.", file=sys.stderr)
+        return 2
+    if args.list:
+        failed = False
+        for case in cases:
+            print(f"{case.id} [{case.priority}] {case.title}")
+            try:
+                for compiled in plan.compile_case(case):
+                    print(f"    {'setup ' if compiled.setup else ''}{compiled.description} -> {compiled.func.__name__}")
+            except plan.StepNotUnderstood as exc:
+                print(f"    !! {exc}")
+                failed = True
+        return 1 if failed else 0
+
+    def progress(result):
+        print(f"{result.id} {result.testStatus:<6} setup {result.setupMs:7.0f} ms  "
+              f"test {result.durationMs:8.0f} ms", flush=True)
+
+    try:
+        with _server(args.server):
+            run = asyncio.run(run_suite(cases, pool_size=args.pool_size, on_result=progress,
+                                        executor=plan.execute))
+    except server.ServerNotFound as exc:
+        print(f"Server profiling: {exc}", file=sys.stderr)
+        return 2
+    path = write_results(run.results, args.output)
+    impact.update_map([r.to_json() for r in run.results])
+    history.record([r.to_json() for r in run.results], "plan", run.wallMs)
+    print()
+    print(format_table(run.results))
+    print()
+    _print_reports(run.results)
+    print(f"Wall clock {run.wallMs / 1000:.1f} s")
+    print(f"Results written to {path}")
+    return 0 if all(r.passed for r in run.results) else 1
+
+
+def _cmd_impact(args) -> int:
+    cases = discover()
+    changed = impact.changed_files(args.base)
+    if changed is None:
+        print(f"git diff against {args.base} failed.", file=sys.stderr)
+        return 2
+    impact_map = impact.load_map()
+    graph = impact.SourceGraph()
+    selected, reasons, fallback = impact.select(cases, changed, impact_map, graph)
+    print(f"{len(changed)} files changed since {args.base}")
+    if fallback:
+        print(f"All {len(cases)} tests: {fallback}")
+    for case in selected if not fallback else ():
+        print(f"{case.id}")
+        for reason in reasons[case.id]:
+            print(f"    {reason}")
+    if not fallback:
+        print(f"{len(selected)} of {len(cases)} tests affected")
+        missed = impact.uncovered(changed, impact_map, graph)
+        if missed:
+            print("Changed source files no test reaches:")
+            print("\n".join(f"    {f}" for f in missed))
+    return 0
+
+
+def _cmd_history(args) -> int:
+    if not history.HISTORY_PATH.exists():
+        print(f"No history at {history.HISTORY_PATH}; it is written by every run.", file=sys.stderr)
+        return 2
+    data = history.report(recent=args.recent, baseline=args.baseline, min_change=args.min_change,
+                          alpha=args.alpha, last=args.last)
+    print(history.format_report(data))
+    return 1 if args.fail_on_slowdown and (data["tests"] or data["steps"]) else 0
+
+
+def _cmd_compare(args) -> int:
+    before, after = read_results(args.before), read_results(args.after)
+    if not before or not after:
+        print("Both files must be harness results with durations.", file=sys.stderr)
+        return 2
+    print(format_comparison(before, after))
+    return 0
+
+
+def _cmd_load(args) -> int:
+    test = load.LoadTest(args.base_url, mix=args.mix, users=args.users, duration=args.duration,
+                         burst=args.burst, seed=args.seed, warmup=args.warmup)
+    try:
+        report = asyncio.run(test.run())
+    except (OSError, load.HttpError) as exc:
+        print(f"Load test could not start: {exc}", file=sys.stderr)
+        return 2
+    path = load.write_report(report, args.output)
+    print(load.format_report(report))
+    print(f"\nResults written to {path}")
+    return 0
+
+
+def _cmd_load_compare(args) -> int:
+    print(load.format_load_comparison(load.read_report(args.before), load.read_report(args.after)))
+    return 0
+
+
+def _parse_slopes(values) -> dict[str, float]:
+    limits = {}
+    for value in values or ():
+        metric, _, limit = value.partition("=")
+        if metric not in soak.SLOPE_LIMITS:
+            raise SystemExit(f"--max-slope: unknown metric {metric!r}; one of {', '.join(soak.SLOPE_LIMITS)}")
+        limits[metric] = float(limit)
+    return limits
+
+
+def _cmd_soak(args) -> int:
+    def progress(sample):
+        shown = "  ".join(f"{k} {v:g}" for k, v in sample.items() if k != "t")
+        print(f"{sample['t'] / 60:7.1f} min  {shown}", flush=True)
+
+    try:
+        with _server(args.server):
+            test = soak.SoakTest(server.find_listener(server.app_port()), args.base_url, hours=args.hours,
+                                 users=args.users, interval=args.interval, warmup=args.warmup,
+                                 limits=_parse_slopes(args.max_slope), seed=args.seed, output=args.output)
+            report = asyncio.run(test.run(on_sample=progress))
+    except server.ServerNotFound as exc:
+        print(f"Soak test: {exc}", file=sys.stderr)
+        return 2
+    except (OSError, load.HttpError) as exc:
+        print(f"Soak test could not start: {exc}", file=sys.stderr)
+        return 2
+    print()
+    print(soak.format_report(report))
+    print()
+    print(load.format_report(report["load"]))
+    print(f"\nResults written to {args.output}")
+    return 0 if report["passed"] else 1
+
+
+def _cmd_throttle(args) -> int:
+    cases = discover(args.ids or list(throttle.FLOWS.values()))
+    if not cases:
+        print("No matching TC scripts found.", file=sys.stderr)
+        return 2
+    profiles = args.profile or list(throttle.DEFAULT_MATRIX)
+    names = {test_id: flow for flow, test_id in throttle.FLOWS.items()}
+    # Budgets are set for desktop speed: collect the page metrics without failing on them
+    config.BUDGETS = os.environ["HARNESS_BUDGETS"] = "report"
+    # The matrix compares interaction time, which needs the client profile
+    config.PROFILE = True
+    os.environ["HARNESS_PROFILE"] = "1"
+    report = {"profiles": profiles, "repeat": args.repeat, "flows": {names.get(c.id, c.id): {} for c in cases}}
+    for profile in profiles:
+        throttle.activate(profile)
+
+        def progress(result):
+            print(f"{profile:<12} {result.id} {result.testStatus:<6} test {result.durationMs:8.0f} ms", flush=True)
+
+        runs: dict[str, list[dict]] = {}
+        for _ in range(args.repeat):
+            run = asyncio.run(run_suite(cases, pool_size=args.pool_size, on_result=progress))
+            for result in run.results:
+                runs.setdefault(result.id, []).append(throttle.summarize(result.to_json()))
+        for test_id, summaries in runs.items():
+            report["flows"][names.get(test_id, test_id)][profile] = throttle.combine(summaries)
+    path = throttle.write_report(report, args.output)
+    print()
+    print(throttle.format_report(report))
+    print(f"\nResults written to {path}")
+    return 0
+
+
+def _cmd_snapshot(args) -> int:
+    if not args.db:
+        print("Pass --db or set HARNESS_DB to the app's SQLite file.", file=sys.stderr)
+        return 2
+    golden = snapshot.golden_path(args.db)
+    if golden.exists() and not args.refresh:
+        print(f"{golden} exists; pass --refresh to retake it.", file=sys.stderr)
+        return 2
+    try:
+        snapshot.take(args.db)
+    except snapshot.SnapshotError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    print(f"Wrote {golden} ({golden.stat().st_size / 2 ** 20:.1f} MB)")
+    return 0
+
+
+def _cmd_cloudinary(args) -> int:
+    storage = cloudinary.Storage(args.storage, base_url=f"http://localhost:{args.port}", cloud=args.cloud,
+                                 presets=tuple(args.preset or (cloudinary.DEFAULT_PRESET,)))
+    stand_in = cloudinary.StandIn(storage, latency_ms=args.latency_ms, bandwidth_mbps=args.bandwidth_mbps)
+
+    async def serve():
+        listener = await stand_in.serve(port=args.port)
+        print(f"Cloudinary stand-in for cloud {args.cloud!r} on http://localhost:{args.port}, "
+              f"files in {args.storage}", flush=True)
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _cmd_upload_bench(args) -> int:
+    try:
+        sizes = [uploads.parse_size(s) for s in args.sizes.split(",")]
+    except ValueError as exc:
+        print(f"--sizes: {exc}", file=sys.stderr)
+        return 2
+    bench = uploads.UploadBench(args.base_url, args.cloudinary_url, sizes=sizes,
+                                concurrency=[int(c) for c in args.concurrency.split(",")],
+                                uploads=args.uploads, kind=args.kind, keep=args.keep, seed=args.seed)
+
+    def progress(cell):
+        print(f"{uploads._label(cell['sizeBytes']):>8} x{cell['concurrency']:<3} {cell['completed']}/{cell['uploads']} "
+              f"in {cell['wallS']:.1f} s, {cell['mbPerS']:.2f} MB/s", flush=True)
+
+    try:
+        if args.cloudinary == "launch":
+            with uploads.LaunchedStandIn(args.cloudinary_url, args.latency_ms, args.bandwidth_mbps):
+                report = asyncio.run(bench.run(on_cell=progress))
+        else:
+            report = asyncio.run(bench.run(on_cell=progress))
+    except (OSError, load.HttpError) as exc:
+        print(f"Upload benchmark could not start: {exc}", file=sys.stderr)
+        return 2
+    path = uploads.write_report(report, args.output)
+    print()
+    print(uploads.format_report(report))
+    print(f"\nResults written to {path}")
+    return 0
+
+
+def _cmd_search_bench(args) -> int:
+    if not args.db.exists():
+        print(f"{args.db} does not exist; build it with `harness dataset`.", file=sys.stderr)
+        return 2
+    queries = search.load_queries(args.queries)
+    if args.kind:
+        queries = [q for q in queries if q["kind"] in args.kind]
+    bench = search.SearchBench(args.db, args.base_url, queries, repeat=args.repeat, depth=args.depth)
+
+    def progress(result):
+        print(f"{result['id']} {result['kind']:<13} recall {result['recall']:.2f}  "
+              f"p50 {result['p50Ms']:.0f} ms", flush=True)
+
+    try:
+        report = asyncio.run(bench.run(on_query=progress))
+    except (OSError, load.HttpError) as exc:
+        print(f"Search benchmark could not run: {exc}", file=sys.stderr)
+        return 2
+    baseline = search.read_report(args.baseline) if args.baseline else None
+    path = search.write_report(report, args.output)
+    print()
+    print(search.format_report(report, baseline))
+    print(f"\nResults written to {path}")
+    return 0
+
+
+def _cmd_dataset(args) -> int:
+    if args.output.exists() and not args.force:
+        print(f"{args.output} exists; pass --force to replace it.", file=sys.stderr)
+        return 2
+
+    def progress(table, rows, seconds):
+        print(f"{table:<22} {rows:>10,} rows  {seconds:7.1f} s", flush=True)
+
+    path = dataset.build(args.output, seed=args.seed, anchor=args.anchor, doctors=args.doctors,
+                         patients=args.patients, appointments=args.appointments, reviews=args.reviews,
+                         files_ratio=args.files_ratio, on_progress=progress)
+    print(f"\nWrote {path} ({path.stat().st_size / 2 ** 20:.0f} MB)")
+    print(f"Run the app against it with TURSO_DATABASE_URL=file:{path.resolve()}")
+    return 0
+
+
+def _add_filters(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--category", action="append",
+                        help='Only this plan category, e.g. "Admin Panel" (repeatable)')
+    parser.add_argument("--priority", action="append", choices=("High", "Medium", "Low"),
+                        help="Only this priority (repeatable)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="harness", description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run TC flows against a shared browser pool")
+    run.add_argument("ids", nargs="*", help="Test ids to run (default: all), e.g. TC001 TC009")
+    run.add_argument("--pool-size", type=int, default=config.POOL_SIZE,
+                     help="Number of warm browsers (default: %(default)s)")
+    _add_filters(run)
+    run.add_argument("--no-pool", action="store_true",
+                     help="Start a fresh Playwright and browser per test, as the scripts do standalone")
+    run.add_argument("--workers", type=int, default=1,
+                     help="Worker processes, each with its own browser (default: %(default)s)")
+    run.add_argument("--show-shards", action="store_true",
+                     help="Print the shard plan for --workers and exit")
+    run.add_argument("--backend", choices=("live", "stub"), default=config.BACKEND,
+                     help="Real API routes or the offline stub backend (default: %(default)s)")
+    run.add_argument("--record", action="store_true",
+                     help="With the live backend, record /api responses for later stub runs")
+    run.add_argument("--no-har", action="store_true",
+                     help="Do not record and analyze a HAR of /api traffic per test")
+    run.add_argument("--changed-since", metavar="REF",
+                     help="Only tests affected by the diff between REF and the working tree")
+    resources = run.add_mutually_exclusive_group()
+    resources.add_argument("--fast", action="store_true",
+                           help="Block images, fonts, media and third-party requests (see harness/fastmode.py)")
+    resources.add_argument("--fast-baseline", action="store_true",
+                           help="Run with full resources and record what --fast would save")
+    run.add_argument("--budgets", choices=("enforce", "report", "off"), default=config.BUDGETS,
+                     help="Page budgets: fail tests over budget, only record, or skip (default: %(default)s)")
+    run.add_argument("--profile", action="store_true",
+                     help="Profile user actions on the heavy client pages (see harness/profiler.py)")
+    run.add_argument("--server", choices=("off", "attach", "launch"), default=config.SERVER,
+                     help="Profile the Next.js server per test (default: %(default)s)")
+    run.add_argument("--db", type=Path, default=Path(config.DB) if config.DB else None,
+                     help="App SQLite file restored from its golden snapshot before each test")
+    run.add_argument("--throttle", choices=tuple(throttle.PROFILES), default=config.THROTTLE,
+                     help="Network/CPU profile for every page (see harness/throttle.py)")
+    run.add_argument("--output", type=Path, default=config.RESULTS_PATH,
+                     help="Results file (default: tmp/test_results.json)")
+    run.set_defaults(func=_cmd_run)
+
+    plan_run = sub.add_parser("plan", help="Run the test plan's steps directly, without the TC scripts")
+    plan_run.add_argument("ids", nargs="*", help="Test ids to run (default: all)")
+    _add_filters(plan_run)
+    plan_run.add_argument("--list", action="store_true", help="Print the compiled steps and exit")
+    plan_run.add_argument("--pool-size", type=int, default=config.POOL_SIZE,
+                          help="Number of warm browsers (default: %(default)s)")
+    plan_run.add_argument("--backend", choices=("live", "stub"), default=config.BACKEND,
+                          help="Real API routes or the offline stub backend (default: %(default)s)")
+    resources = plan_run.add_mutually_exclusive_group()
+    resources.add_argument("--fast", action="store_true",
+                           help="Block images, fonts, media and third-party requests")
+    resources.add_argument("--fast-baseline", action="store_true",
+                           help="Run with full resources and record what --fast would save")
+    plan_run.add_argument("--budgets", choices=("enforce", "report", "off"), default=config.BUDGETS,
+                          help="Page budgets: fail tests over budget, only record, or skip (default: %(default)s)")
+    plan_run.add_argument("--profile", action="store_true",
+                          help="Profile user actions on the heavy client pages")
+    plan_run.add_argument("--server", choices=("off", "attach", "launch"), default=config.SERVER,
+                          help="Profile the Next.js server per test (default: %(default)s)")
+    plan_run.add_argument("--db", type=Path, default=Path(config.DB) if config.DB else None,
+                          help="App SQLite file restored from its golden snapshot before each test")
+    plan_run.add_argument("--throttle", choices=tuple(throttle.PROFILES), default=config.THROTTLE,
+                          help="Network/CPU profile for every page (see harness/throttle.py)")
+    plan_run.add_argument("--output", type=Path, default=plan.RESULTS_PATH,
+                          help="Results file (default: tmp/plan_results.json)")
+    plan_run.set_defaults(func=_cmd_plan, record=False, no_har=False)
+
+    affected = sub.add_parser("impact", help="List the tests affected by the diff against a git ref")
+    affected.add_argument("base", nargs="?", default="HEAD", help="Git ref to diff against (default: %(default)s)")
+    affected.set_defaults(func=_cmd_impact)
+
+    matrix = sub.add_parser("throttle", help="Compare key flows under network and CPU throttling profiles")
+    matrix.add_argument("ids", nargs="*",
+                        help="Test ids (default: " + ", ".join(f"{t} {f}" for f, t in throttle.FLOWS.items()) + ")")
+    matrix.add_argument("--profile", action="append", choices=tuple(throttle.PROFILES),
+                        help="Profile to run, repeatable (default: " + ", ".join(throttle.DEFAULT_MATRIX) + ")")
+    matrix.add_argument("--repeat", type=int, default=1,
+                        help="Runs per profile; the table shows medians (default: %(default)s)")
+    matrix.add_argument("--pool-size", type=int, default=config.POOL_SIZE,
+                        help="Number of warm browsers (default: %(default)s)")
+    matrix.add_argument("--output", type=Path, default=throttle.RESULTS_PATH,
+                        help="Results file (default: tmp/throttle_results.json)")
+    matrix.set_defaults(func=_cmd_throttle)
+
+    cdn = sub.add_parser("cloudinary", help="Serve the Cloudinary upload API locally for the dashboard uploads")
+    cdn.add_argument("--port", type=int, default=cloudinary.stand_in_port(),
+                     help="Port (default: from HARNESS_CLOUDINARY_URL, %(default)s)")
+    cdn.add_argument("--cloud", default=cloudinary.DEFAULT_CLOUD, help="Cloud name (default: %(default)s)")
+    cdn.add_argument("--preset", action="append",
+                     help=f"Accepted upload preset, repeatable (default: {cloudinary.DEFAULT_PRESET})")
+    cdn.add_argument("--storage", type=Path, default=cloudinary.STORAGE_DIR,
+                     help="Where uploads are kept (default: tmp/cloudinary)")
+    cdn.add_argument("--latency-ms", type=float, default=0.0, help="Added to every upload response")
+    cdn.add_argument("--bandwidth-mbps", type=float, default=0.0,
+                     help="Delay uploads as if sent at this rate (default: no limit)")
+    cdn.set_defaults(func=_cmd_cloudinary)
+
+    bench = sub.add_parser("upload-bench", help="Upload throughput and latency, Cloudinary plus /api/files")
+    bench.add_argument("--sizes", default=",".join(uploads.DEFAULT_SIZES),
+                       help="Comma-separated file sizes (default: %(default)s)")
+    bench.add_argument("--concurrency", default=",".join(map(str, uploads.DEFAULT_CONCURRENCY)),
+                       help="Comma-separated simultaneous uploads (default: %(default)s)")
+    bench.add_argument("--uploads", type=int, default=20, help="Uploads per size and concurrency (default: %(default)s)")
+    bench.add_argument("--kind", choices=("file", "avatar"), default="file",
+                       help="Patient file to /api/files or avatar to /api/upload (default: %(default)s)")
+    bench.add_argument("--cloudinary", choices=("launch", "external"), default="launch",
+                       help="Start the stand-in for the run or use a running one (default: %(default)s)")
+    bench.add_argument("--cloudinary-url", default=config.CLOUDINARY_URL, help="Stand-in URL (default: %(default)s)")
+    bench.add_argument("--latency-ms", type=float, default=0.0, help="Stand-in latency with --cloudinary launch")
+    bench.add_argument("--bandwidth-mbps", type=float, default=0.0,
+                       help="Stand-in upload rate with --cloudinary launch (default: no limit)")
+    bench.add_argument("--keep", action="store_true", help="Keep the patient file records")
+    bench.add_argument("--seed", type=int, default=1, help="Random seed (default: %(default)s)")
+    bench.add_argument("--base-url", default=config.BASE_URL, help="App under test (default: %(default)s)")
+    bench.add_argument("--output", type=Path, default=uploads.RESULTS_PATH,
+                       help="Results file (default: tmp/upload_results.json)")
+    bench.set_defaults(func=_cmd_upload_bench)
+
+    relevance = sub.add_parser("search-bench", help="Recall and latency of /api/doctors over Arabic queries")
+    relevance.add_argument("--db", type=Path, default=dataset.DEFAULT_PATH,
+                           help="SQLite file the app is running on, used to judge results (default: tmp/bench.db)")
+    relevance.add_argument("--queries", type=Path, default=search.QUERIES_PATH,
+                           help="Labeled query set (default: harness/search_queries.json)")
+    relevance.add_argument("--kind", action="append", help="Only queries of this kind, e.g. hamza (repeatable)")
+    relevance.add_argument("--repeat", type=int, default=5, help="Timed requests per query (default: %(default)s)")
+    relevance.add_argument("--depth", type=int, default=200,
+                           help="Results read per query before recall is estimated (default: %(default)s)")
+    relevance.add_argument("--baseline", type=Path, help="Earlier results file to compare against")
+    relevance.add_argument("--base-url", default=config.BASE_URL, help="App under test (default: %(default)s)")
+    relevance.add_argument("--output", type=Path, default=search.RESULTS_PATH,
+                           help="Results file (default: tmp/search_results.json)")
+    relevance.set_defaults(func=_cmd_search_bench)
+
+    snap = sub.add_parser("snapshot", help="Take the golden copy of the app's SQLite file restored by --db")
+    snap.add_argument("--db", type=Path, default=Path(config.DB) if config.DB else None,
+                      help="App SQLite file (default: HARNESS_DB)")
+    snap.add_argument("--refresh", action="store_true", help="Replace an existing golden copy")
+    snap.set_defaults(func=_cmd_snapshot)
+
+    hist = sub.add_parser("history", help="Slowdowns, flaky tests and category trends from the run history")
+    hist.add_argument("--recent", type=int, default=3, help="Latest runs compared (default: %(default)s)")
+    hist.add_argument("--baseline", type=int, default=10,
+                      help="Runs before those used as the baseline (default: %(default)s)")
+    hist.add_argument("--min-change", type=float, default=0.2,
+                      help="Smallest median growth reported, as a fraction (default: %(default)s)")
+    hist.add_argument("--alpha", type=float, default=0.05, help="Significance level (default: %(default)s)")
+    hist.add_argument("--last", type=int, default=10, help="Runs shown in the category table (default: %(default)s)")
+    hist.add_argument("--fail-on-slowdown", action="store_true",
+                      help="Exit non-zero when a test or step slowed down")
+    hist.set_defaults(func=_cmd_history)
+
+    compare = sub.add_parser("compare", help="Compare the wall clock of two results files")
+    compare.add_argument("before", type=Path)
+    compare.add_argument("after", type=Path)
+    compare.set_defaults(func=_cmd_compare)
+
+    load_run = sub.add_parser("load", help="Concurrent load test of the search and booking APIs")
+    load_run.add_argument("--mix", choices=sorted(load.MIXES), default="default",
+                          help="Scenario mix; 'browse' issues no writes (default: %(default)s)")
+    load_run.add_argument("--users", type=int, default=20,
+                          help="Concurrent virtual users (default: %(default)s)")
+    load_run.add_argument("--duration", type=float, default=60.0,
+                          help="Measured seconds (default: %(default)s)")
+    load_run.add_argument("--warmup", type=float, default=5.0,
+                          help="Seconds of traffic before measuring starts (default: %(default)s)")
+    load_run.add_argument("--burst", type=int, default=10,
+                          help="Simultaneous bookings per slot in the booking scenario (default: %(default)s)")
+    load_run.add_argument("--seed", type=int, default=1)
+    load_run.add_argument("--base-url", default=config.BASE_URL)
+    load_run.add_argument("--output", type=Path, default=load.RESULTS_PATH,
+                          help="Results file (default: tmp/load_results.json)")
+    load_run.set_defaults(func=_cmd_load)
+
+    load_compare = sub.add_parser("load-compare", help="Compare two load test results files")
+    load_compare.add_argument("before", type=Path)
+    load_compare.add_argument("after", type=Path)
+    load_compare.set_defaults(func=_cmd_load_compare)
+
+    soak_run = sub.add_parser("soak", help="Hours of mixed traffic, failing on server memory or connection growth")
+    soak_run.add_argument("--hours", type=float, default=4.0, help="(default: %(default)s)")
+    soak_run.add_argument("--users", type=int, default=10,
+                          help="Concurrent virtual users (default: %(default)s)")
+    soak_run.add_argument("--interval", type=float, default=30.0,
+                          help="Seconds between server samples (default: %(default)s)")
+    soak_run.add_argument("--warmup", type=float, default=10.0,
+                          help="Minutes excluded from the trends (default: %(default)s)")
+    soak_run.add_argument("--max-slope", action="append", metavar="METRIC=PER_HOUR",
+                          help="Override a growth limit, e.g. rssMb=50 (repeatable)")
+    soak_run.add_argument("--server", choices=("attach", "launch"), default="attach",
+                          help="Attach to the running app or start a production server (default: %(default)s)")
+    soak_run.add_argument("--seed", type=int, default=1)
+    soak_run.add_argument("--base-url", default=config.BASE_URL)
+    soak_run.add_argument("--output", type=Path, default=soak.RESULTS_PATH,
+                          help="Results file (default: tmp/soak_results.json)")
+    soak_run.set_defaults(func=_cmd_soak)
+
+    data = sub.add_parser("dataset", help="Generate a large synthetic SQLite database")
+    data.add_argument("--doctors", type=int, default=10_000, help="(default: %(default)s)")
+    data.add_argument("--appointments", type=int, default=1_000_000, help="Approximate total (default: %(default)s)")
+    data.add_argument("--patients", type=int, help="(default: 20 per doctor)")
+    data.add_argument("--reviews", type=int, help="(default: 15 per doctor)")
+    data.add_argument("--files-ratio", type=float, default=0.1,
+                      help="Share of completed appointments with an uploaded patient file (default: %(default)s)")
+    data.add_argument("--seed", type=int, default=1)
+    data.add_argument("--anchor", type=date.fromisoformat,
+                      help="Date treated as today, YYYY-MM-DD; pin it for byte-identical rebuilds")
+    data.add_argument("--output", type=Path, default=dataset.DEFAULT_PATH,
+                      help="SQLite file (default: tmp/bench.db)")
+    data.add_argument("--force", action="store_true", help="Replace an existing file")
+    data.set_defaults(func=_cmd_dataset)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Cached NextAuth sessions for the admin and doctor flows.
+
+Logging in through /login costs several page loads plus a bcrypt compare on
+the server for every test. Instead each role signs in once through the
+NextAuth credentials endpoint, and the resulting storage state (the
+``next-auth.session-token`` JWT cookie) is written to ``tmp/auth/<role>.json``.
+Flows call ``goto()``, which adds those cookies to their context and opens
+/admin or /dashboard directly.
+
+A cached state is re-validated against ``/api/auth/session`` once per
+process and is thrown away and refreshed when its cookie has expired or the
+server no longer accepts it (e.g. a new ``NEXTAUTH_SECRET``). With the stub
+backend no login happens at all; the stubbed session endpoint reports the role.
+"""
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+
+from . import config, stubs, waits
+
+STATE_DIR = config.TMP_DIR / "auth"
+
+
+@dataclass(frozen=True)
+class Role:
+    name: str
+    email: str
+    password: str
+    home: str
+
+
+ROLES = {
+    "admin": Role(
+        "admin",
+        os.environ.get("HARNESS_ADMIN_EMAIL", config.TESTSPRITE.get("loginUser", "admin@docteur.dz")),
+        os.environ.get("HARNESS_ADMIN_PASSWORD", config.TESTSPRITE.get("loginPassword", "admin123")),
+        "/admin",
+    ),
+    # Seeded by prisma/seed.ts
+    "doctor": Role(
+        "doctor",
+        os.environ.get("HARNESS_DOCTOR_EMAIL", "doctor@example.com"),
+        os.environ.get("HARNESS_DOCTOR_PASSWORD", "doctor123"),
+        "/dashboard",
+    ),
+}
+
+_validated: set[str] = set()
+_locks: dict[str, asyncio.Lock] = {}
+
+
+def state_path(role: str):
+    return STATE_DIR / f"{role}.json"
+
+
+def _read_state(role: str) -> dict | None:
+    try:
+        with open(state_path(role), encoding="utf-8") as fh:
+            state = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    now = time.time()
+    tokens = [c for c in state.get("cookies", []) if c["name"].endswith("next-auth.session-token")]
+    if not tokens or any(0 < c.get("expires", -1) < now for c in tokens):
+        return None
+    return state
+
+
+def _write_state(role: str, state: dict) -> None:
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = state_path(role).with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    # Atomic so parallel workers never read a half-written file
+    os.replace(tmp, state_path(role))
+
+
+def invalidate(role: str) -> None:
+    _validated.discard(role)
+    try:
+        state_path(role).unlink()
+    except FileNotFoundError:
+        pass
+
+
+async def _session_email(request) -> str | None:
+    response = await request.get(f"{config.BASE_URL}/api/auth/session")
+    if not response.ok:
+        return None
+    try:
+        data = await response.json()
+    except ValueError:
+        return None
+    return (data or {}).get("user", {}).get("email")
+
+
+async def _post_credentials(request, role: Role) -> None:
+    """Sign in through the credentials callback using ``request``'s cookie jar."""
+    csrf = await (await request.get(f"{config.BASE_URL}/api/auth/csrf")).json()
+    await request.post(
+        f"{config.BASE_URL}/api/auth/callback/credentials",
+        form={
+            "csrfToken": csrf["csrfToken"],
+            "email": role.email,
+            "password": role.password,
+            "callbackUrl": config.BASE_URL + role.home,
+            "json": "true",
+        },
+    )
+    if await _session_email(request) != role.email:
+        raise RuntimeError(f"Login as {role.email} was rejected by {config.BASE_URL}")
+
+
+async def _login(context, role: Role) -> dict:
+    await _post_credentials(context.request, role)
+    return await context.storage_state()
+
+
+async def authenticate(context, role: str, refresh: bool = False) -> None:
+    """Give ``context`` a valid session for ``role``, logging in only if needed."""
+    spec = ROLES[role]
+    if config.BACKEND == "stub":
+        stubs.sign_in(context, role)
+        return
+    async with _locks.setdefault(role, asyncio.Lock()):
+        state = None if refresh else _read_state(role)
+        if state is not None:
+            await context.add_cookies(state["cookies"])
+            if role in _validated or await _session_email(context.request) == spec.email:
+                _validated.add(role)
+                return
+            await context.clear_cookies()
+        invalidate(role)
+        _write_state(role, await _login(context, spec))
+        _validated.add(role)
+
+
+async def api_request(playwright, role: str):
+    """An ``APIRequestContext`` signed in as ``role``, for API calls outside any page.
+
+    Reuses the cached session like ``authenticate`` and caches a new one the
+    same way; the caller disposes of it.
+    """
+    spec = ROLES[role]
+    async with _locks.setdefault(role, asyncio.Lock()):
+        state = _read_state(role)
+        if state is not None:
+            request = await playwright.request.new_context(storage_state=state)
+            if role in _validated or await _session_email(request) == spec.email:
+                _validated.add(role)
+                return request
+            await request.dispose()
+        invalidate(role)
+        request = await playwright.request.new_context()
+        await _post_credentials(request, spec)
+        _write_state(role, await request.storage_state())
+        _validated.add(role)
+        return request
+
+
+async def goto(page, role: str, path: str | None = None) -> None:
+    """Navigate ``page`` to ``path`` (default: the role's home) already signed in.
+
+    If the app still bounces to /login the cached session is refreshed once.
+    """
+    url = config.BASE_URL + (path or ROLES[role].home)
+    await authenticate(page.context, role)
+    await page.goto(url, wait_until="domcontentloaded")
+    await waits.network_idle(page)
+    if "/login" in page.url:
+        await page.context.clear_cookies()
+        await authenticate(page.context, role, refresh=True)
+        await page.goto(url, wait_until="domcontentloaded")
+        await waits.network_idle(page)
@@ -0,0 +1,34 @@
+"""Reference lists shared with the app, read from src/lib/utils.ts.
+
+The wilaya and specialty lists are parsed from the TypeScript source instead
+of being copied, so generated data always matches what the UI offers.
+"""
+import re
+from functools import lru_cache
+
+from . import config
+
+UTILS_TS = config.REPO_ROOT / "src" / "lib" / "utils.ts"
+
+
+@lru_cache(maxsize=None)
+def _string_array(name: str) -> tuple[str, ...]:
+    source = UTILS_TS.read_text(encoding="utf-8")
+    match = re.search(rf"export const {name}\s*=\s*\[(.*?)\];", source, re.S)
+    if not match:
+        raise LookupError(f"{name} not found in {UTILS_TS}")
+    return tuple(re.findall(r"'([^']*)'", match.group(1)))
+
+
+def wilayas() -> tuple[str, ...]:
+    """The 58 wilayas as stored in Doctor.city, e.g. ``"16. الجزائر"``."""
+    return _string_array("algerianWilayas")
+
+
+def specialties() -> tuple[str, ...]:
+    return _string_array("medicalSpecialties")
+
+
+def wilaya_name(city: str) -> str:
+    """Strip the ``"16. "`` prefix the same way /api/doctors does."""
+    return city.split(". ", 1)[1] if ". " in city else city
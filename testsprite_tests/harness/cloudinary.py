@@ -0,0 +1,247 @@
+"""Local stand-in for the Cloudinary unsigned upload API.
+
+The dashboard uploads patient files (/dashboard/patients/[id]) and avatars
+(/dashboard/profile) from the browser straight to
+``getCloudinaryUploadUrl()`` in src/lib/cloudinary.ts. ``python -m harness
+cloudinary`` serves the same two endpoints on ``HARNESS_CLOUDINARY_URL``
+(``http://localhost:9465``):
+
+* ``POST /v1_1/<cloud>/<image|raw|video|auto>/upload`` with a multipart
+  ``file`` and ``upload_preset``, answered with Cloudinary's JSON
+  (``public_id``, ``version``, ``secure_url``, ``bytes``, ``format``,
+  ``width``/``height`` for PNG, JPEG and GIF, ...) or its
+  ``{"error": {"message": ...}}`` shape with status 400,
+* ``GET /<cloud>/<type>/upload/v<version>/<public id>``, the delivery URL
+  stored in the database, serving the uploaded bytes.
+
+Files are kept under ``tmp/cloudinary/``. Point the app at the stand-in
+before building it, since ``NEXT_PUBLIC_*`` values are inlined::
+
+    NEXT_PUBLIC_CLOUDINARY_API_BASE=http://localhost:9465 npm run build
+
+``--latency-ms`` and ``--bandwidth-mbps`` delay every upload response to
+approximate the real service from a given network.
+"""
+import asyncio
+import hashlib
+import json
+import mimetypes
+import re
+import secrets
+import struct
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from . import config
+
+STORAGE_DIR = config.TMP_DIR / "cloudinary"
+
+DEFAULT_CLOUD = "docteur"
+DEFAULT_PRESET = "docteur_uploads"
+
+# Cloudinary's limit for a single upload request
+MAX_BYTES = 100 * 2 ** 20
+
+RESOURCE_TYPES = ("image", "raw", "video", "auto")
+
+_UPLOAD = re.compile(r"^/v1_1/([^/]+)/([a-z]+)/upload/?$")
+_DELIVERY = re.compile(r"^/([^/]+)/(image|raw|video)/upload/(?:v\d+/)?(.+)$")
+
+
+class UploadRejected(Exception):
+    pass
+
+
+def stand_in_port() -> int:
+    return urlsplit(config.CLOUDINARY_URL).port or 80
+
+
+def image_size(data: bytes) -> tuple[int, int] | None:
+    """Width and height of a PNG, GIF or JPEG, read from its header."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        return struct.unpack(">II", data[16:24])
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        return struct.unpack("<HH", data[6:10])
+    if data[:2] == b"\xff\xd8":
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xFF:
+                return None
+            marker, length = data[i + 1], struct.unpack(">H", data[i + 2:i + 4])[0]
+            # Start-of-frame markers, except DHT (C4), JPG (C8) and DAC (CC)
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", data[i + 5:i + 9])
+                return width, height
+            i += 2 + length
+    return None
+
+
+def parse_multipart(body: bytes, content_type: str) -> dict[str, dict]:
+    """Fields of a multipart/form-data body: name -> {value, filename, type}."""
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not match:
+        raise UploadRejected("Invalid multipart body")
+    fields = {}
+    for part in body.split(b"--" + match.group(1).encode())[1:]:
+        if part.startswith(b"--"):
+            break
+        head, _, value = part.partition(b"\r\n\r\n")
+        headers = head.decode("utf-8", "replace")
+        name = re.search(r'name="([^"]*)"', headers)
+        if not name:
+            continue
+        filename = re.search(r'filename="([^"]*)"', headers)
+        ctype = re.search(r"content-type:\s*([^\r\n]+)", headers, re.I)
+        fields[name.group(1)] = {
+            "value": value[:-2] if value.endswith(b"\r\n") else value,
+            "filename": filename.group(1) if filename else None,
+            "type": ctype.group(1).strip() if ctype else None,
+        }
+    return fields
+
+
+class Storage:
+    """Uploaded assets on disk, laid out like their delivery URLs."""
+
+    def __init__(self, root: Path = STORAGE_DIR, base_url: str = config.CLOUDINARY_URL,
+                 cloud: str = DEFAULT_CLOUD, presets: tuple[str, ...] = (DEFAULT_PRESET,)):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+        self.cloud = cloud
+        self.presets = presets
+
+    def upload(self, cloud: str, resource_type: str, fields: dict[str, dict]) -> dict:
+        if cloud != self.cloud:
+            raise UploadRejected(f"Invalid cloud_name {cloud}")
+        if resource_type not in RESOURCE_TYPES:
+            raise UploadRejected(f"Invalid resource type {resource_type}")
+        preset = fields.get("upload_preset", {}).get("value", b"").decode()
+        if not preset:
+            raise UploadRejected("Upload preset must be specified when using unsigned upload")
+        if preset not in self.presets:
+            raise UploadRejected(f"Upload preset not found: {preset}")
+        upload = fields.get("file")
+        if not upload or upload["filename"] is None:
+            raise UploadRejected("Missing required parameter - file")
+        data = upload["value"]
+        if len(data) > MAX_BYTES:
+            raise UploadRejected(f"File size too large. Got {len(data)}. Maximum is {MAX_BYTES}.")
+
+        original = Path(upload["filename"] or "file")
+        extension = original.suffix.lstrip(".").lower()
+        size = image_size(data)
+        if resource_type == "auto":
+            mime = upload["type"] or mimetypes.guess_type(original.name)[0] or ""
+            resource_type = "image" if size or mime.startswith("image/") else \
+                "video" if mime.startswith(("video/", "audio/")) else "raw"
+        public_id = secrets.token_hex(10)
+        # Raw assets keep their extension in the public id and have no format
+        name = f"{public_id}.{extension}" if extension else public_id
+        if resource_type == "raw":
+            public_id = name
+        version = int(time.time())
+        path = self.root / self.cloud / resource_type / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+        url = f"{self.base_url}/{self.cloud}/{resource_type}/upload/v{version}/{name}"
+        result = {
+            "asset_id": secrets.token_hex(16),
+            "public_id": public_id,
+            "version": version,
+            "version_id": secrets.token_hex(16),
+            "signature": hashlib.sha1(data).hexdigest(),
+            "resource_type": resource_type,
+            "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "tags": [],
+            "bytes": len(data),
+            "type": "upload",
+            "etag": hashlib.md5(data).hexdigest(),
+            "placeholder": False,
+            "url": url,
+            "secure_url": url,
+            "folder": "",
+            "original_filename": original.stem,
+        }
+        if resource_type != "raw":
+            result["format"] = extension
+        if size:
+            result["width"], result["height"] = size
+        return result
+
+    def asset(self, path: str) -> Path | None:
+        match = _DELIVERY.match(path)
+        if not match or match.group(1) != self.cloud:
+            return None
+        found = (self.root / self.cloud / match.group(2) / unquote(match.group(3))).resolve()
+        if not found.is_relative_to(self.root.resolve()) or not found.is_file():
+            return None
+        return found
+
+
+class StandIn:
+    """The HTTP side: keep-alive HTTP/1.1 with CORS for browser uploads."""
+
+    def __init__(self, storage: Storage, latency_ms: float = 0.0, bandwidth_mbps: float = 0.0):
+        self.storage = storage
+        self.latency_ms = latency_ms
+        self.bandwidth_mbps = bandwidth_mbps
+        self.uploads = 0
+
+    async def serve(self, host: str = "127.0.0.1", port: int | None = None) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._connection, host, port or stand_in_port())
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request_line = await reader.readuntil(b"\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, ctype, payload = await self._handle(method, urlsplit(target).path, headers, body)
+                head = [f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}",
+                        f"Content-Type: {ctype}", f"Content-Length: {len(payload)}",
+                        "Access-Control-Allow-Origin: *",
+                        "Access-Control-Allow-Methods: GET, POST, OPTIONS",
+                        "Access-Control-Allow-Headers: *"]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, method: str, path: str, headers: dict, body: bytes) -> tuple[int, str, bytes]:
+        if method == "OPTIONS":
+            return 204, "text/plain", b""
+        match = _UPLOAD.match(path)
+        if method == "POST" and match:
+            delay = self.latency_ms / 1000
+            if self.bandwidth_mbps:
+                delay += len(body) * 8 / (self.bandwidth_mbps * 1e6)
+            try:
+                result = self.storage.upload(match.group(1), match.group(2),
+                                             parse_multipart(body, headers.get("content-type", "")))
+                status = 200
+                self.uploads += 1
+            except UploadRejected as exc:
+                result, status = {"error": {"message": str(exc)}}, 400
+            if delay:
+                await asyncio.sleep(delay)
+            return status, "application/json", json.dumps(result).encode()
+        if method == "GET":
+            asset = self.storage.asset(path)
+            if asset is not None:
+                ctype = mimetypes.guess_type(asset.name)[0] or "application/octet-stream"
+                return 200, ctype, asset.read_bytes()
+        return 404, "application/json", json.dumps({"error": {"message": "Resource not found"}}).encode()
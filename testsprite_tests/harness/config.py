@@ -0,0 +1,91 @@
+"""Shared settings for the local Playwright harness.
+
+Everything here can be overridden through ``HARNESS_*`` environment variables
+so the same suite runs on a laptop, in Docker or on a CI box.
+"""
+import json
+import os
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = TESTS_DIR.parent
+TMP_DIR = TESTS_DIR / "tmp"
+PLAN_PATH = TESTS_DIR / "testsprite_frontend_test_plan.json"
+RESULTS_PATH = TMP_DIR / "test_results.json"
+
+
+def _load_testsprite_config() -> dict:
+    try:
+        with open(TMP_DIR / "config.json", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+TESTSPRITE = _load_testsprite_config()
+
+# Base URL of the Next.js app under test
+BASE_URL = (
+    os.environ.get("HARNESS_BASE_URL")
+    or TESTSPRITE.get("localEndpoint")
+    or "http://localhost:3000"
+).rstrip("/")
+
+# Chromium flags shared by every pooled browser. The generated scripts also pass
+# "--single-process" and "--ipc=host"; neither is safe once several contexts
+# share one browser, so the pool leaves them out.
+LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+]
+
+HEADLESS = os.environ.get("HARNESS_HEADED", "") == ""
+
+# Number of warm browsers kept by the pool
+POOL_SIZE = int(os.environ.get("HARNESS_POOL_SIZE", "1"))
+
+# Hard ceiling for a single TC flow, in seconds
+TEST_TIMEOUT = float(os.environ.get("HARNESS_TEST_TIMEOUT", "180"))
+
+# "live" talks to the real API routes, "stub" answers /api/** from harness.stubs
+BACKEND = os.environ.get("HARNESS_BACKEND", "live")
+
+# Record live /api responses to tmp/api_recording.json for later stub runs
+RECORD = os.environ.get("HARNESS_RECORD", "") != ""
+
+# Per-page performance budgets: "report" only records the violations,
+# "enforce" fails tests over budget (timings depend on machine load, so only
+# perf jobs ask for it), "off" skips the Web Vitals collection entirely
+BUDGETS = os.environ.get("HARNESS_BUDGETS", "report")
+
+# Record a HAR of /api traffic per test and check it for redundant calls
+HAR = os.environ.get("HARNESS_HAR", "1") not in ("", "0")
+
+# Block images, fonts, media and third-party requests in UI tests (harness.fastmode)
+FAST = os.environ.get("HARNESS_FAST", "") not in ("", "0")
+
+# Full-resource run that records what fast mode would save, for later --fast runs
+FAST_BASELINE = os.environ.get("HARNESS_FAST_BASELINE", "") not in ("", "0")
+
+# Profile the Next.js server during each test (harness.server): "off",
+# "attach" to the process on the BASE_URL port, or "launch" one
+SERVER = os.environ.get("HARNESS_SERVER", "off")
+
+# Seconds between server samples
+SERVER_INTERVAL = float(os.environ.get("HARNESS_SERVER_INTERVAL", "0.25"))
+
+# Per-action long tasks, React commits and JS heap on the heavy client pages
+# (harness.profiler). Off by default: it injects a React DevTools hook into
+# every page, which plain functional runs should not get.
+PROFILE = os.environ.get("HARNESS_PROFILE", "") not in ("", "0")
+
+# Network/CPU throttling profile applied to every page (harness.throttle)
+THROTTLE = os.environ.get("HARNESS_THROTTLE", "")
+
+# SQLite file the app runs on (TURSO_DATABASE_URL=file:...); when set, it is
+# restored from its golden snapshot before every test (harness.snapshot)
+DB = os.environ.get("HARNESS_DB", "")
+
+# Local Cloudinary stand-in (harness.cloudinary); the app reaches it through
+# NEXT_PUBLIC_CLOUDINARY_API_BASE
+CLOUDINARY_URL = os.environ.get("HARNESS_CLOUDINARY_URL", "http://localhost:9465").rstrip("/")
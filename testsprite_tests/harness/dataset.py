@@ -0,0 +1,350 @@
+"""Production-sized synthetic data written straight into a SQLite file.
+
+``python -m harness dataset --doctors 50000 --appointments 3000000`` creates
+``tmp/bench.db`` with the tables of ``prisma/migration.sql`` and fills them
+with bulk ``executemany`` inserts: users, doctors spread over the 58
+``algerianWilayas`` and the ``medicalSpecialties`` (weighted towards the big
+wilayas and general practice), patients, appointments, patient files,
+reviews (with the rating aggregates on the doctors) and month-by-month
+subscription histories, plus the doctors' full-text search index.
+
+The same ``--seed`` and ``--anchor`` date always produce the same database.
+Appointments span the year before the anchor and the two months after it;
+past ones are mostly completed or cancelled, upcoming ones pending or
+confirmed. A doctor never has two non-cancelled appointments in the same
+slot.
+
+The admin (``admin@docteur.dz`` / ``admin123``) and the demo doctor
+(``doctor@example.com`` / ``doctor123``, doctor 1) from prisma/seed.ts exist
+with their usual passwords, so the harness can sign in. Every other doctor,
+``doctor<id>@example.com``, shares the ``doctor123`` hash. Point the app at
+the file with ``TURSO_DATABASE_URL=file:<path>``.
+"""
+import json
+import random
+import sqlite3
+import time
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from pathlib import Path
+
+from . import catalog, config, search
+
+MIGRATION_SQL = config.REPO_ROOT / "prisma" / "migration.sql"
+DEFAULT_PATH = config.TMP_DIR / "bench.db"
+
+# bcrypt hashes (cost 10) of "admin123" and "doctor123", computed once so the
+# generator needs no bcrypt module and does not spend minutes hashing
+ADMIN_HASH = "$2a$10$Io3y2iJRK25JjMsAiUFite6g0lOHhNAK2BhyWXhHFObILOF9ulOPC"
+DOCTOR_HASH = "$2a$10$olO1qOwPFrBf4QTQ/ffsDOSnhec8m.j1PqeL0PED.3d.wvfVbpqt2"
+
+# Wilayas (by number) that get four times the share of doctors
+BIG_WILAYAS = {"16", "31", "25", "19", "09", "06", "15", "35"}
+
+# Slots offered by the app: 08:00 to 16:30 every 30 minutes
+SLOTS = [f"{h:02d}:{m:02d}" for h in range(8, 17) for m in (0, 30)]
+PAST_DAYS, FUTURE_DAYS = 365, 60
+
+_FIRST = ["أحمد", "محمد", "فاطمة", "يوسف", "خديجة", "عبد القادر", "أمينة", "كريم", "سارة", "رضا", "نسيمة",
+          "إلياس", "مريم", "سفيان", "ليلى", "هشام", "وسيلة", "عمر", "زينب", "نور الدين", "إيمان", "بلال"]
+_LAST = ["بن علي", "بوزيد", "حداد", "مرابط", "بلقاسم", "زروقي", "شريف", "بن عمر", "قاسمي", "عيساوي",
+         "بوعلام", "مسعودي", "سعيدي", "خليفي", "براهيمي", "بن يوسف", "دحماني", "طالبي", "حمادي", "رحماني"]
+_COMMENTS = ["طبيب ممتاز ومعاملة راقية", "مواعيد دقيقة", "شرح واضح للحالة", "انتظار طويل في العيادة",
+             "أنصح به بشدة", "خدمة جيدة", "العيادة نظيفة", "لم يعجبني التعامل", None, None]
+_HOURS = [
+    {"sunday": ("08:00", "16:00"), "monday": ("08:00", "16:00"), "tuesday": ("08:00", "16:00"),
+     "wednesday": ("08:00", "16:00"), "thursday": ("08:00", "12:00")},
+    {"saturday": ("09:00", "13:00"), "sunday": ("09:00", "17:00"), "monday": ("09:00", "17:00"),
+     "tuesday": ("09:00", "17:00"), "wednesday": ("09:00", "17:00")},
+    {"sunday": ("13:00", "17:00"), "tuesday": ("13:00", "17:00"), "thursday": ("08:00", "12:00")},
+]
+_DAYS = ["sunday", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday"]
+_FILE_TYPES = [("application/pdf", "pdf", "تحليل"), ("image/jpeg", "jpg", "أشعة"), ("image/png", "png", "وصفة")]
+_PLANS = [
+    (1, "Basic", "أساسي", "Perfect for starting doctors", "مثالي للأطباء المبتدئين", 2000, 50, 100, 1),
+    (2, "Professional", "احترافي", "For growing medical practices", "للعيادات المتنامية", 5000, 200, 500, 2),
+    (3, "Enterprise", "مؤسسي", "Unlimited access for large clinics", "وصول غير محدود للعيادات الكبيرة",
+     10000, 1000, 2000, 3),
+]
+
+
+def _ts(value: datetime) -> str:
+    """DateTime as the Prisma libSQL adapter stores it."""
+    return value.astimezone(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _working_hours(template: dict) -> str:
+    return json.dumps({day: ({"start": template[day][0], "end": template[day][1]} if day in template else None)
+                       for day in _DAYS})
+
+
+def _schema() -> tuple[list[str], list[str]]:
+    """CREATE TABLE and CREATE INDEX statements of the Prisma migration, apart."""
+    sql = MIGRATION_SQL.read_text(encoding="utf-8-sig")
+    statements = [s.strip() for s in sql.split(";") if "CREATE" in s]
+    strip = lambda s: "\n".join(l for l in s.splitlines() if not l.startswith("--"))
+    tables = [strip(s) for s in statements if "CREATE TABLE" in s or "CREATE VIRTUAL TABLE" in s]
+    indexes = [strip(s) for s in statements if "INDEX" in s]
+    return tables, indexes
+
+
+class Generator:
+    def __init__(self, conn: sqlite3.Connection, seed: int, anchor: date, doctors: int,
+                 patients: int, appointments: int, reviews: int, files_ratio: float,
+                 on_progress=None):
+        self.conn = conn
+        self.seed = seed
+        self.now = datetime.combine(anchor, dtime(12, 0), timezone.utc)
+        self.today = datetime.combine(anchor, dtime(0, 0), timezone.utc)
+        self.doctors = doctors
+        self.patients = patients
+        self.appointments = appointments
+        self.reviews = reviews
+        self.files_ratio = files_ratio
+        self.on_progress = on_progress or (lambda table, rows, seconds: None)
+        self.approved: list[int] = []
+        self.popularity: list[float] = []
+        self.prices: dict[int, tuple[int, int]] = {}
+        self.pending: list[int] = []
+        self.hours: dict[int, int] = {}
+        self._slots: dict[int, list[tuple[int, str]]] = {}
+        self.completed_visits: list[tuple[int, int, datetime]] = []
+
+    def _rng(self, table: str) -> random.Random:
+        # One stream per table: changing --reviews does not reshuffle the doctors
+        return random.Random(f"{self.seed}:{table}")
+
+    def _insert(self, table: str, columns: tuple[str, ...], rows) -> None:
+        started = time.perf_counter()
+        placeholders = ", ".join("?" * len(columns))
+        names = ", ".join(f'"{c}"' for c in columns)
+        before = self.conn.total_changes
+        self.conn.executemany(f'INSERT INTO "{table}" ({names}) VALUES ({placeholders})', rows)
+        self.on_progress(table, self.conn.total_changes - before, time.perf_counter() - started)
+
+    def run(self) -> None:
+        self.plans()
+        self.users_and_doctors()
+        self.patient_rows()
+        self.appointment_rows()
+        self.file_rows()
+        self.review_rows()
+        self.subscription_rows()
+
+    def plans(self) -> None:
+        stamp = _ts(self.now - timedelta(days=PAST_DAYS))
+        self._insert("subscription_plans",
+                     ("id", "name", "name_ar", "description", "description_ar", "price", "max_appointments",
+                      "max_storage_mb", "priority", "active", "created_at", "updated_at"),
+                     [(*plan, 1, stamp, stamp) for plan in _PLANS])
+
+    def users_and_doctors(self) -> None:
+        rng = self._rng("doctors")
+        wilayas, specialties = catalog.wilayas(), catalog.specialties()
+        city_weights = [4 if w.split(".")[0].zfill(2) in BIG_WILAYAS else 1 for w in wilayas]
+        specialty_weights = [5 if s == "طب عام" else 1 for s in specialties]
+        stamp = _ts(self.now - timedelta(days=PAST_DAYS + 60))
+        users = [(1, "admin@docteur.dz", ADMIN_HASH, "ADMIN", "ACTIVE", stamp, stamp)]
+        doctors = []
+        for doctor_id in range(1, self.doctors + 1):
+            user_id = doctor_id + 1
+            roll = rng.random()
+            status = "PENDING" if roll < 0.08 else "SUSPENDED" if roll < 0.10 else "ACTIVE"
+            if doctor_id == 1:
+                email, name, specialty, city, status = ("doctor@example.com", "د. أحمد بن علي", "طب عام",
+                                                        "16. الجزائر", "ACTIVE")
+            else:
+                email = f"doctor{doctor_id}@example.com"
+                name = f"د. {rng.choice(_FIRST)} {rng.choice(_LAST)}"
+                specialty = rng.choices(specialties, specialty_weights)[0]
+                city = rng.choices(wilayas, city_weights)[0]
+            joined = self.now - timedelta(days=PAST_DAYS + 30 - doctor_id * PAST_DAYS // self.doctors,
+                                          minutes=rng.randrange(1440))
+            low = rng.choice([1000, 1500, 2000, 2500, 3000])
+            template = rng.randrange(len(_HOURS))
+            approved = status != "PENDING"
+            users.append((user_id, email, DOCTOR_HASH, "DOCTOR", status, _ts(joined), _ts(joined)))
+            doctors.append((
+                doctor_id, user_id, name, specialty, city,
+                f"شارع {rng.randint(1, 120)} نوفمبر، رقم {rng.randint(1, 99)}",
+                _working_hours(_HOURS[template]), f"{low}-{low * 2} دج", None,
+                f"0{rng.choice('567')}{rng.randrange(10 ** 8):08d}",
+                f"طبيب {specialty} ذو خبرة {rng.randint(2, 35)} سنة", int(approved), _ts(joined), _ts(joined),
+            ))
+            if status == "PENDING":
+                self.pending.append(doctor_id)
+            elif status == "ACTIVE":
+                self.approved.append(doctor_id)
+                # Heavy-tailed demand: a few doctors get most of the bookings
+                self.popularity.append(rng.paretovariate(1.5))
+                self.prices[doctor_id] = (low, low * 2)
+                self.hours[doctor_id] = template
+        self._insert("users", ("id", "email", "password_hash", "role", "status", "created_at", "updated_at"), users)
+        self._insert("doctors", ("id", "user_id", "name", "specialty", "city", "clinic_address", "working_hours",
+                                 "price_range", "profile_image", "phone", "bio", "approved", "created_at",
+                                 "updated_at"), doctors)
+        # The search index the app keeps in sync (src/lib/search.ts)
+        self._insert("doctors_fts", ("rowid", "name", "specialty", "city", "clinic_address", "bio"),
+                     [(d[0], *(search.index_text(d[i]) for i in (2, 3, 4, 5, 10))) for d in doctors])
+
+    def patient_rows(self) -> None:
+        rng = self._rng("patients")
+
+        def rows():
+            for patient_id in range(1, self.patients + 1):
+                created = _ts(self.now - timedelta(days=rng.randrange(PAST_DAYS), minutes=rng.randrange(1440)))
+                email = f"patient{patient_id}@example.com" if rng.random() < 0.3 else None
+                yield (patient_id, f"{rng.choice(_FIRST)} {rng.choice(_LAST)}",
+                       f"0{rng.choice('567')}{rng.randrange(10 ** 8):08d}", email, None, created, created)
+        self._insert("patients", ("id", "name", "phone", "email", "notes", "created_at", "updated_at"), rows())
+
+    def _open_slots(self, doctor_id: int) -> list[tuple[int, str]]:
+        """(day offset, time) pairs inside the doctor's working hours."""
+        index = self.hours[doctor_id]
+        if index in self._slots:
+            return self._slots[index]
+        template = _HOURS[index]
+        by_weekday = {}
+        for index, day in enumerate(_DAYS):
+            if day in template:
+                start, end = template[day]
+                by_weekday[index] = [s for s in SLOTS if start <= s < end]
+        slots = []
+        for offset in range(-PAST_DAYS, FUTURE_DAYS):
+            weekday = ((self.today + timedelta(days=offset)).weekday() + 1) % 7  # 0 = sunday
+            slots.extend((offset, s) for s in by_weekday.get(weekday, ()))
+        self._slots[index] = slots
+        return slots
+
+    def appointment_rows(self) -> None:
+        rng = self._rng("appointments")
+        total_weight = sum(self.popularity)
+
+        def rows():
+            appointment_id = 0
+            for doctor_id, weight in zip(self.approved, self.popularity):
+                slots = self._open_slots(doctor_id)
+                count = min(len(slots), round(self.appointments * weight / total_weight))
+                low, high = self.prices[doctor_id]
+                for offset, slot in sorted(rng.sample(slots, count)):
+                    appointment_id += 1
+                    day = self.today + timedelta(days=offset)
+                    if offset < 0:
+                        status = rng.choices(("COMPLETED", "CANCELLED", "CONFIRMED"), (80, 15, 5))[0]
+                    else:
+                        status = rng.choices(("PENDING", "CONFIRMED", "CANCELLED"), (50, 40, 10))[0]
+                    patient_id = rng.randrange(1, self.patients + 1)
+                    created = min(day - timedelta(days=rng.randrange(30)), self.now)
+                    price = float(rng.randrange(low, high + 1, 100)) if status == "COMPLETED" else None
+                    if status == "COMPLETED" and rng.random() < self.files_ratio:
+                        self.completed_visits.append((patient_id, doctor_id, day))
+                    yield (appointment_id, doctor_id, patient_id, _ts(day), slot, status, None, price,
+                           _ts(created), _ts(created))
+        self._insert("appointments", ("id", "doctor_id", "patient_id", "date", "time", "status", "notes",
+                                      "actual_price", "created_at", "updated_at"), rows())
+
+    def file_rows(self) -> None:
+        rng = self._rng("files")
+
+        def rows():
+            for file_id, (patient_id, doctor_id, day) in enumerate(self.completed_visits, 1):
+                mime, ext, label = rng.choice(_FILE_TYPES)
+                yield (file_id, patient_id, doctor_id,
+                       f"https://res.cloudinary.com/demo/{'raw' if ext == 'pdf' else 'image'}/upload/"
+                       f"v1/docteur/patients/{patient_id}/{file_id}.{ext}",
+                       f"{label}-{day:%Y%m%d}.{ext}", mime, rng.randrange(30_000, 5_000_000),
+                       _ts(day + timedelta(hours=rng.randrange(8, 18))))
+        self._insert("patient_files", ("id", "patient_id", "doctor_id", "file_path", "file_name", "file_type",
+                                       "file_size", "uploaded_at"), rows())
+        self.completed_visits.clear()
+
+    def review_rows(self) -> None:
+        rng = self._rng("reviews")
+
+        def rows():
+            doctors = rng.choices(self.approved, self.popularity, k=self.reviews)
+            for review_id, doctor_id in enumerate(sorted(doctors), 1):
+                created = self.now - timedelta(days=rng.randrange(PAST_DAYS), minutes=rng.randrange(1440))
+                yield (review_id, doctor_id, f"{rng.choice(_FIRST)} {rng.choice(_LAST)[:1]}.",
+                       rng.choices((1, 2, 3, 4, 5), (3, 5, 15, 35, 42))[0], rng.choice(_COMMENTS), _ts(created))
+        self._insert("reviews", ("id", "doctor_id", "patient_name", "rating", "comment", "created_at"), rows())
+        # The aggregates POST /api/reviews maintains, as scripts/repair-ratings.js computes them
+        self.conn.execute("""
+            UPDATE doctors SET rating_sum = agg.total, rating_count = agg.n, rating_avg = CAST(agg.total AS REAL) / agg.n,
+                rating_1 = agg.r1, rating_2 = agg.r2, rating_3 = agg.r3, rating_4 = agg.r4, rating_5 = agg.r5
+            FROM (SELECT doctor_id, SUM(rating) AS total, COUNT(*) AS n, SUM(rating = 1) AS r1, SUM(rating = 2) AS r2,
+                         SUM(rating = 3) AS r3, SUM(rating = 4) AS r4, SUM(rating = 5) AS r5
+                  FROM reviews GROUP BY doctor_id) AS agg
+            WHERE agg.doctor_id = doctors.id
+        """)
+
+    def subscription_rows(self) -> None:
+        rng = self._rng("subscriptions")
+        pending = set(self.pending)
+
+        def rows():
+            sub_id = 0
+            for doctor_id in range(1, self.doctors + 1):
+                if doctor_id in pending:
+                    sub_id += 1
+                    stamp = _ts(self.now - timedelta(days=rng.randrange(30)))
+                    yield (sub_id, doctor_id, rng.randint(1, 3), "PENDING", None, None, stamp, stamp)
+                    continue
+                plan = rng.randint(1, 3)
+                months = rng.randint(0, 12)
+                end = self.today + timedelta(days=rng.randrange(1, 30))
+                history = []
+                for month in range(months + 1):
+                    start = end - timedelta(days=30)
+                    if month == 0:
+                        status = rng.choices(("ACTIVE", "EXPIRED", "CANCELLED"), (85, 10, 5))[0]
+                        if status == "EXPIRED":
+                            start, end = start - timedelta(days=30), end - timedelta(days=30)
+                    else:
+                        status = "EXPIRED"
+                    history.append((plan, status, start, end))
+                    end = start
+                    if rng.random() < 0.15:
+                        plan = rng.randint(1, 3)  # upgrades and downgrades along the way
+                for plan_id, status, start, end in reversed(history):
+                    sub_id += 1
+                    yield (sub_id, doctor_id, plan_id, status, _ts(start), _ts(end), _ts(start), _ts(start))
+        self._insert("doctor_subscriptions", ("id", "doctor_id", "plan_id", "status", "start_date", "end_date",
+                                              "created_at", "updated_at"), rows())
+        # The count the subscription routes maintain, as scripts/repair-subscription-counts.js computes it
+        self.conn.execute("""
+            UPDATE doctors SET subscription_count = agg.n
+            FROM (SELECT doctor_id, COUNT(*) AS n FROM doctor_subscriptions GROUP BY doctor_id) AS agg
+            WHERE agg.doctor_id = doctors.id
+        """)
+
+
+def build(path: Path = DEFAULT_PATH, seed: int = 1, anchor: date | None = None, doctors: int = 10_000,
+          patients: int | None = None, appointments: int = 1_000_000, reviews: int | None = None,
+          files_ratio: float = 0.1, on_progress=None) -> Path:
+    """Create ``path`` from scratch and fill it; returns the path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    tables, indexes = _schema()
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        # A throwaway file: durability does not matter, load speed does
+        conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF; "
+                           "PRAGMA cache_size = -262144; PRAGMA temp_store = MEMORY;")
+        conn.execute("BEGIN")
+        for statement in tables:
+            conn.execute(statement)
+        Generator(conn, seed, anchor or date.today(), doctors, patients or doctors * 20, appointments,
+                  reviews if reviews is not None else doctors * 15, files_ratio, on_progress).run()
+        # Indexes are built once over the loaded rows instead of per insert
+        started = time.perf_counter()
+        for statement in indexes:
+            conn.execute(statement)
+        conn.execute("COMMIT")
+        if on_progress:
+            on_progress("indexes", len(indexes), time.perf_counter() - started)
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return path
@@ -0,0 +1,172 @@
+"""Fast mode: keep images, fonts, media and third-party requests out of UI tests.
+
+With ``HARNESS_FAST=1`` (or ``--fast``) every context gets a route that
+answers such requests before they reach the network:
+
+* images, including ``/_next/image`` and the doctors' remote profile
+  pictures, get a 1x1 transparent PNG so ``<img>`` elements still load and
+  keep their layout,
+* fonts and media are aborted; the page falls back to system fonts,
+* any other request to an origin other than ``HARNESS_BASE_URL`` (Cloudinary,
+  font CSS, analytics) is aborted.
+
+The app's own documents, scripts, styles and ``/api`` calls pass through
+untouched, so the stub backend and HAR recording work as before.
+
+No TC asserts on images or fonts today; a test that starts to can opt out
+with ``HARNESS_FAST_SKIP=TC008,TC017``.
+
+What fast mode saves is measured against a baseline run with full
+resources (``--fast-baseline`` or ``HARNESS_FAST_BASELINE=1``): it stores
+the size of every request fast mode would block and each passing test's
+duration in ``tmp/resource_sizes.json``, written once when the run ends.
+Plain runs neither read the sizes nor write the file. A fast run then reports,
+under ``fastMode``, the requests it blocked, the bytes those requests took
+last time (``bytesSaved``; ``unknownSizes`` counts URLs never seen in full
+mode) and the difference to the last full-mode duration (``timeSavedMs``).
+"""
+import base64
+import json
+import os
+from collections import Counter
+from urllib.parse import urlsplit
+
+from . import config
+
+SIZES_PATH = config.TMP_DIR / "resource_sizes.json"
+
+BLOCKED_TYPES = ("image", "font", "media")
+
+# What this process's baseline run learned, until save_baseline() writes it
+_baseline: dict = {"resources": {}, "tests": {}}
+
+_PIXEL = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+
+def enabled_for(test_id: str) -> bool:
+    """Whether ``test_id`` runs in fast mode under the current settings."""
+    skipped = {t.strip().upper() for t in os.environ.get("HARNESS_FAST_SKIP", "").split(",") if t.strip()}
+    return config.FAST and test_id not in skipped
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def blockable(request) -> bool:
+    """Images, fonts, media and anything from a third-party origin."""
+    if request.resource_type in BLOCKED_TYPES:
+        return True
+    if request.url.startswith(("data:", "blob:")):
+        return False
+    # The local Cloudinary stand-in is part of the system under test
+    return _origin(request.url) not in (_origin(config.BASE_URL), _origin(config.CLOUDINARY_URL))
+
+
+def _load_sizes() -> dict:
+    try:
+        with open(SIZES_PATH, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {"resources": {}, "tests": {}}
+
+
+def save_baseline() -> None:
+    """Write what the baseline run learned; called once at the end of a run."""
+    if not _baseline["resources"] and not _baseline["tests"]:
+        return
+    # Re-read before writing so parallel workers only lose a race, not data
+    sizes = _load_sizes()
+    sizes["resources"].update(_baseline["resources"])
+    sizes["tests"].update(_baseline["tests"])
+    _baseline["resources"], _baseline["tests"] = {}, {}
+    SIZES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = SIZES_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(sizes, fh, indent=1)
+    os.replace(tmp, SIZES_PATH)
+
+
+class ResourceGate:
+    """Blocks requests in fast mode, or learns their sizes in a baseline run."""
+
+    def __init__(self, fast: bool, learn: bool = False):
+        self.fast = fast
+        self.learn = learn and not fast
+        self.blocked: Counter = Counter()
+        self._blocked_urls: list[str] = []
+        self._sizes: dict[str, int] = {}
+
+    async def install(self, context) -> None:
+        if self.fast:
+            await context.route("**/*", self._route)
+        elif self.learn:
+            context.on("requestfinished", self._learn)
+
+    async def _route(self, route, request) -> None:
+        if not blockable(request):
+            await route.fallback()
+            return
+        kind = request.resource_type if request.resource_type in BLOCKED_TYPES else "third-party"
+        self.blocked[kind] += 1
+        self._blocked_urls.append(request.url)
+        if request.resource_type == "image":
+            await route.fulfill(status=200, content_type="image/png", body=_PIXEL)
+        else:
+            await route.abort("blockedbyclient")
+
+    async def _learn(self, request) -> None:
+        if not blockable(request):
+            return
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return  # context closed before the sizes could be read
+        self._sizes[request.url] = sizes["responseBodySize"] + sizes["responseHeadersSize"]
+
+    def finish(self, test_id: str, duration_ms: float, passed: bool) -> dict | None:
+        """Keep baseline sizes for save_baseline(), or return the ``fastMode`` entry of a fast run."""
+        if self.learn:
+            _baseline["resources"].update(self._sizes)
+            if passed:
+                _baseline["tests"][test_id] = round(duration_ms, 1)
+        if not self.fast:
+            return None
+        known = _load_sizes()
+        sizes = [known["resources"].get(url) for url in self._blocked_urls]
+        full_ms = known["tests"].get(test_id)
+        return {
+            "blocked": sum(self.blocked.values()),
+            "byType": dict(self.blocked),
+            "bytesSaved": sum(s for s in sizes if s is not None),
+            "unknownSizes": sum(s is None for s in sizes),
+            "timeSavedMs": round(full_ms - duration_ms, 1) if full_ms is not None and passed else None,
+        }
+
+
+def format_summary(results: list[dict]) -> str:
+    """Per-test savings of a fast run, for the console report."""
+    rows = [("Test", "Blocked", "KB saved", "Time saved ms")]
+    total_blocked = total_bytes = total_ms = 0
+    for result in results:
+        fast = result.get("fastMode")
+        if not fast:
+            continue
+        saved_ms = fast["timeSavedMs"]
+        rows.append((result["id"], str(fast["blocked"]),
+                     f"{fast['bytesSaved'] / 1024:.0f}" + ("+" if fast["unknownSizes"] else ""),
+                     "-" if saved_ms is None else f"{saved_ms:.0f}"))
+        total_blocked += fast["blocked"]
+        total_bytes += fast["bytesSaved"]
+        total_ms += saved_ms or 0
+    if len(rows) == 1:
+        return ""
+    rows.append(("total", str(total_blocked), f"{total_bytes / 1024:.0f}", f"{total_ms:.0f}"))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    lines.insert(len(lines) - 1, lines[1])
+    return "\n".join(lines)
@@ -0,0 +1,310 @@
+"""Run history in SQLite, and the slowdown and flakiness report built on it.
+
+Every ``run`` and ``plan`` appends to ``tmp/history.db`` (``HARNESS_HISTORY``):
+
+* ``runs``: when, git revision, command, backend, fast mode, wall clock,
+* ``results``: per test status, setup/flow/teardown time and error,
+* ``steps``: per plan step (``step``) and per profiled user action
+  (``action``, its ``settleMs``) with its duration,
+* ``api``: per test and ``/api`` route the number of calls and their mean
+  and slowest duration, from the page metrics.
+
+``python -m harness history`` compares the latest ``--recent`` runs of each
+test, step and API route with the ``--baseline`` runs before them. A
+slowdown is reported when the median grew by at least ``--min-change`` and
+a one-sided Mann-Whitney U test puts the chance of that being noise below
+``--alpha``; with few samples the test is exact. Only passing runs count
+towards test and step durations. A test is flaky when its last
+``--baseline`` runs contain both passes and failures with at least two
+status changes, or a failure and a pass on the same revision. The category
+table shows the median flow time per test in each of the last runs.
+"""
+import itertools
+import math
+import os
+import re
+import sqlite3
+import statistics
+import subprocess
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import config
+
+HISTORY_PATH = Path(os.environ.get("HARNESS_HISTORY", config.TMP_DIR / "history.db"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    revision TEXT,
+    dirty INTEGER NOT NULL DEFAULT 0,
+    command TEXT NOT NULL,
+    backend TEXT,
+    fast INTEGER NOT NULL DEFAULT 0,
+    wall_ms REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id TEXT NOT NULL,
+    category TEXT,
+    status TEXT NOT NULL,
+    setup_ms REAL,
+    duration_ms REAL,
+    teardown_ms REAL,
+    error TEXT,
+    PRIMARY KEY (run_id, test_id)
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT,
+    ms REAL
+);
+CREATE TABLE IF NOT EXISTS api (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id TEXT NOT NULL,
+    route TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    mean_ms REAL,
+    max_ms REAL
+);
+CREATE INDEX IF NOT EXISTS results_test ON results (test_id, run_id);
+CREATE INDEX IF NOT EXISTS steps_test ON steps (test_id, name, run_id);
+CREATE INDEX IF NOT EXISTS api_route ON api (route, run_id);
+"""
+
+# Above this many rank combinations the U test uses the normal approximation
+EXACT_LIMIT = 50_000
+
+
+def connect(path: Path = HISTORY_PATH) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=config.REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _route(path: str) -> str:
+    return re.sub(r"/\d+(?=/|$)", "/[id]", path)
+
+
+def _api_calls(result: dict) -> dict[str, list[float]]:
+    calls: dict[str, list[float]] = {}
+    for visit in result.get("pages", []):
+        for call in visit.get("api", []):
+            calls.setdefault(_route(call["path"]), []).append(call["ms"])
+    return calls
+
+
+def record(results: list[dict], command: str, wall_ms: float | None = None,
+           path: Path = HISTORY_PATH) -> int:
+    """Append one run (``to_json()`` results) to the history; returns its id."""
+    with closing(connect(path)) as conn, conn:
+        run_id = conn.execute(
+            "INSERT INTO runs (started, revision, dirty, command, backend, fast, wall_ms) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (datetime.now(timezone.utc).isoformat(), _git("rev-parse", "HEAD") or None,
+             int(bool(_git("status", "--porcelain", "--untracked-files=no"))), command,
+             config.BACKEND, int(config.FAST), wall_ms),
+        ).lastrowid
+        for r in results:
+            conn.execute(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, r["id"], r.get("category", ""), r["testStatus"], r.get("setupMs"),
+                 r.get("durationMs"), r.get("teardownMs"), r.get("testError") or None),
+            )
+            steps = [("step", s["step"], s["status"], s["ms"]) for s in r.get("steps", [])]
+            steps += [("action", f"{i['route']} {i['action']}", None, i["settleMs"])
+                      for i in r.get("interactions", [])]
+            conn.executemany("INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             [(run_id, r["id"], n, *s) for n, s in enumerate(steps)])
+            conn.executemany("INSERT INTO api VALUES (?, ?, ?, ?, ?, ?)", [
+                (run_id, r["id"], route, len(ms), round(statistics.fmean(ms), 1), max(ms))
+                for route, ms in _api_calls(r).items()
+            ])
+    return run_id
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+def mann_whitney_greater(recent: list[float], baseline: list[float]) -> float:
+    """One-sided p-value that ``recent`` tends to be larger than ``baseline``."""
+    n1, n2 = len(recent), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    values = recent + baseline
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1  # ties share their mean rank
+        i = j + 1
+    observed = sum(ranks[:n1])
+    if math.comb(n1 + n2, n1) <= EXACT_LIMIT:
+        sums = [sum(c) for c in itertools.combinations(ranks, n1)]
+        return sum(s >= observed - 1e-9 for s in sums) / len(sums)
+    u = observed - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    sd = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    return 0.5 * math.erfc((u - mean - 0.5) / sd / math.sqrt(2))
+
+
+def slowdown(recent: list[float], baseline: list[float], min_change: float, alpha: float) -> dict | None:
+    """The change from ``baseline`` to ``recent`` if it is a significant slowdown."""
+    if len(recent) < 1 or len(baseline) < 3:
+        return None
+    before, after = statistics.median(baseline), statistics.median(recent)
+    if before <= 0 or (after - before) / before < min_change:
+        return None
+    p = mann_whitney_greater(recent, baseline)
+    if p >= alpha:
+        return None
+    return {"beforeMs": round(before, 1), "afterMs": round(after, 1),
+            "change": round((after - before) / before, 3), "p": round(p, 4)}
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def _series(conn, sql: str, *params) -> dict[tuple, list[tuple[int, float]]]:
+    """``key columns..., run_id, value`` rows grouped by key, oldest run first."""
+    series: dict[tuple, list[tuple[int, float]]] = {}
+    for *key, run_id, value in conn.execute(sql, params):
+        if value is not None:
+            series.setdefault(tuple(key), []).append((run_id, value))
+    return series
+
+
+def _slowdowns(series: dict[tuple, list[tuple[int, float]]], recent_n: int, baseline_n: int,
+               min_change: float, alpha: float) -> list[dict]:
+    found = []
+    for key, points in series.items():
+        values = [v for _, v in points]
+        recent = values[-recent_n:]
+        baseline = values[-(recent_n + baseline_n):-recent_n]
+        change = slowdown(recent, baseline, min_change, alpha)
+        if change:
+            found.append({"key": key, **change})
+    return sorted(found, key=lambda f: f["change"], reverse=True)
+
+
+def _flaky(conn, window: int) -> list[dict]:
+    found = []
+    rows = conn.execute("""
+        SELECT r.test_id, r.status, runs.revision FROM results r JOIN runs ON runs.id = r.run_id
+        ORDER BY r.test_id, r.run_id
+    """).fetchall()
+    for test_id, group in itertools.groupby(rows, key=lambda row: row[0]):
+        history = [(status, rev) for _, status, rev in group][-window:]
+        statuses = [s for s, _ in history]
+        flips = sum(a != b for a, b in zip(statuses, statuses[1:]))
+        by_revision: dict[str, set[str]] = {}
+        for status, rev in history:
+            if rev:
+                by_revision.setdefault(rev, set()).add(status)
+        same_revision = any(len(s) > 1 for s in by_revision.values())
+        if "PASSED" in statuses and len(set(statuses)) > 1 and (flips >= 2 or same_revision):
+            found.append({
+                "test": test_id,
+                "runs": len(statuses),
+                "failures": sum(s != "PASSED" for s in statuses),
+                "flips": flips,
+                "sameRevision": same_revision,
+                "pattern": "".join("." if s == "PASSED" else "F" for s in statuses),
+            })
+    return found
+
+
+def _categories(conn, last: int) -> dict:
+    run_ids = [r for (r,) in conn.execute("SELECT id FROM runs ORDER BY id DESC LIMIT ?", (last,))][::-1]
+    trends: dict[str, list[float | None]] = {}
+    rows = conn.execute(f"""
+        SELECT COALESCE(NULLIF(category, ''), '(none)'), run_id, duration_ms FROM results
+        WHERE status = 'PASSED' AND run_id IN ({",".join("?" * len(run_ids))})
+    """, run_ids).fetchall() if run_ids else []
+    per_run: dict[tuple[str, int], list[float]] = {}
+    for category, run_id, ms in rows:
+        per_run.setdefault((category, run_id), []).append(ms)
+    for category in sorted({c for c, _ in per_run}):
+        trends[category] = [statistics.median(per_run[(category, r)]) if (category, r) in per_run else None
+                            for r in run_ids]
+    return {"runs": run_ids, "medianMs": trends}
+
+
+def report(path: Path = HISTORY_PATH, recent: int = 3, baseline: int = 10,
+           min_change: float = 0.2, alpha: float = 0.05, last: int = 10) -> dict:
+    with closing(connect(path)) as conn:
+        runs = conn.execute("SELECT COUNT(*), MIN(started), MAX(started) FROM runs").fetchone()
+        tests = _series(conn, """
+            SELECT test_id, run_id, duration_ms FROM results WHERE status = 'PASSED' ORDER BY run_id
+        """)
+        steps = _series(conn, """
+            SELECT test_id, kind, name, run_id, ms FROM steps
+            WHERE status IS NULL OR status = 'PASSED' ORDER BY run_id
+        """)
+        api = _series(conn, "SELECT route, run_id, AVG(mean_ms) FROM api GROUP BY route, run_id ORDER BY run_id")
+        return {
+            "runs": {"count": runs[0], "first": runs[1], "last": runs[2]},
+            "tests": _slowdowns(tests, recent, baseline, min_change, alpha),
+            "steps": _slowdowns(steps, recent, baseline, min_change, alpha),
+            "api": _slowdowns(api, recent, baseline, min_change, alpha),
+            "flaky": _flaky(conn, baseline + recent),
+            "categories": _categories(conn, last),
+        }
+
+
+def _table(rows: list[tuple]) -> str:
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+
+def format_report(data: dict) -> str:
+    runs = data["runs"]
+    if not runs["count"]:
+        return "No runs recorded yet."
+    out = [f"{runs['count']} runs from {runs['first'][:16]} to {runs['last'][:16]}"]
+    sections = (
+        ("Slower tests", "tests", "Test", lambda k: k[0]),
+        ("Slower steps and actions", "steps", "Step", lambda k: f"{k[0]} {k[2]}"),
+        ("Slower API routes", "api", "Route", lambda k: k[0]),
+    )
+    for title, key, label, name in sections:
+        if data[key]:
+            rows = [(label, "Before ms", "After ms", "Change", "p")]
+            rows += [(name(s["key"]), f"{s['beforeMs']:.0f}", f"{s['afterMs']:.0f}",
+                      f"{s['change']:+.0%}", f"{s['p']:.3f}") for s in data[key]]
+            out += ["", f"{title}:", _table(rows)]
+    if data["flaky"]:
+        rows = [("Test", "Runs", "Failures", "Flips", "Same revision", "History (oldest first)")]
+        rows += [(f["test"], str(f["runs"]), str(f["failures"]), str(f["flips"]),
+                  "yes" if f["sameRevision"] else "", f["pattern"]) for f in data["flaky"]]
+        out += ["", "Flaky tests:", _table(rows)]
+    if data["categories"]["medianMs"]:
+        rows = [("Category", *[f"run {r}" for r in data["categories"]["runs"]])]
+        rows += [(category, *["-" if v is None else f"{v / 1000:.1f}s" for v in values])
+                 for category, values in data["categories"]["medianMs"].items()]
+        out += ["", "Median flow time per test, by category:", _table(rows)]
+    if not any(data[k] for k in ("tests", "steps", "api", "flaky")):
+        out += ["", "No significant slowdowns or flaky tests."]
+    return "\n".join(out)
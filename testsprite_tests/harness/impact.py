@@ -0,0 +1,327 @@
+"""Change-impact selection: run only the tests a diff can affect.
+
+Every test records what it touched while it ran: the app pages its frames
+navigated to (client-side route changes included) and the ``/api`` routes
+its pages called. ``run`` and ``plan`` merge that coverage into
+``tmp/impact_map.json`` together with the git revision it was recorded at.
+
+To select tests for a diff, the coverage is mapped to source files on the
+current tree:
+
+* a page path matches ``src/app/**/page.tsx`` by its directory (``[id]``
+  and other dynamic segments match any value) and pulls in the ``layout``,
+  ``loading``, ``error`` and ``template`` files of every ancestor directory,
+* an ``/api`` path matches ``src/app/api/**/route.ts`` the same way,
+* those files pull in everything they import, transitively, following
+  relative and ``@/`` imports.
+
+A test is selected when a changed file is among its sources or is the TC
+script itself. Changes to ``GLOBAL_FILES`` (dependencies, Next.js and
+Prisma configuration, the harness) select every test.
+
+The map is stale, and the whole suite runs, when it is missing, lacks one
+of the tests, was recorded on a revision git no longer knows, or the TC
+scripts or the test plan changed since it was recorded. Tests whose
+recording run failed are always selected, since their coverage stops at
+the failure.
+"""
+import fnmatch
+import json
+import os
+import re
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from urllib.parse import urlsplit
+
+from . import config
+from .loader import TestCase
+
+MAP_PATH = config.TMP_DIR / "impact_map.json"
+
+SRC_DIR = "src"
+APP_DIR = "src/app"
+
+# Changes to these affect every test (paths relative to the repository root)
+GLOBAL_FILES = (
+    "package.json",
+    "package-lock.json",
+    "next.config.js",
+    "tsconfig.json",
+    "tailwind.config.*",
+    "postcss.config.*",
+    ".env*",
+    "prisma/*",
+    "src/middleware.ts",
+    "testsprite_tests/harness/*",
+)
+
+# Changes here make recorded coverage unreliable: the flows themselves changed
+FLOW_FILES = (
+    "testsprite_tests/TC*.py",
+    "testsprite_tests/testsprite_frontend_test_plan.json",
+)
+
+_SPECIAL_FILES = ("layout", "loading", "error", "template")
+_EXTENSIONS = ("", ".ts", ".tsx", ".js", ".jsx", ".css", "/index.ts", "/index.tsx", "/index.js")
+_IMPORT = re.compile(
+    r"""(?:\bimport|\bexport)\s[^'";]*?\bfrom\s*['"]([^'"]+)['"]"""
+    r"""|\bimport\s*\(\s*['"]([^'"]+)['"]\s*\)"""
+    r"""|\bimport\s+['"]([^'"]+)['"]"""
+    r"""|\brequire\s*\(\s*['"]([^'"]+)['"]\s*\)"""
+)
+
+
+def _route(path: str) -> str:
+    return re.sub(r"/\d+(?=/|$)", "/[id]", path.rstrip("/") or "/")
+
+
+class CoverageRecorder:
+    """Collects the pages and /api routes one test touched."""
+
+    def __init__(self):
+        self.pages: set[str] = set()
+        self.api: set[str] = set()
+
+    def install(self, context) -> None:
+        context.on("page", self._watch)
+        context.on("request", self._request)
+        for page in context.pages:
+            self._watch(page)
+
+    def _watch(self, page) -> None:
+        page.on("framenavigated", lambda frame: self._navigated(page, frame))
+
+    def _navigated(self, page, frame) -> None:
+        if frame == page.main_frame and frame.url.startswith(config.BASE_URL):
+            self.pages.add(_route(urlsplit(frame.url).path))
+
+    def _request(self, request) -> None:
+        if not request.url.startswith(config.BASE_URL):
+            return
+        path = urlsplit(request.url).path
+        if path.startswith("/api/"):
+            self.api.add(f"{request.method} {_route(path)}")
+
+    def to_json(self) -> dict:
+        return {"pages": sorted(self.pages), "api": sorted(self.api)}
+
+
+# ---------------------------------------------------------------------------
+# Source graph
+# ---------------------------------------------------------------------------
+
+def _segment_pattern(segment: str) -> str | None:
+    if segment.startswith("(") and segment.endswith(")"):
+        return None  # route group, not part of the URL
+    if segment.startswith("[[...") or segment.startswith("[..."):
+        return r"(?:/.+)?" if segment.startswith("[[") else r"/.+"
+    if segment.startswith("["):
+        return r"/[^/]+"
+    return "/" + re.escape(segment)
+
+
+class SourceGraph:
+    """App routes and the import graph of ``src/`` in one checkout."""
+
+    def __init__(self, root: Path = config.REPO_ROOT):
+        self.root = root
+        self.pages: list[tuple[re.Pattern, str]] = []
+        self.handlers: list[tuple[re.Pattern, str]] = []
+        self._imports: dict[str, set[str]] = {}
+        self._scan()
+
+    def _scan(self) -> None:
+        app = self.root / APP_DIR
+        for path in sorted((self.root / SRC_DIR).rglob("*")):
+            if not path.is_file():
+                continue
+            rel = path.relative_to(self.root).as_posix()
+            if path.suffix in (".ts", ".tsx", ".js", ".jsx"):
+                self._imports[rel] = self._parse_imports(path)
+            if path.parent.is_relative_to(app) and path.stem in ("page", "route"):
+                parts = [_segment_pattern(s) for s in path.parent.relative_to(app).parts]
+                pattern = re.compile("".join(p for p in parts if p) + "/?$")
+                (self.pages if path.stem == "page" else self.handlers).append((pattern, rel))
+
+    def _parse_imports(self, path: Path) -> set[str]:
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return set()
+        found = set()
+        for match in _IMPORT.finditer(text):
+            target = next(g for g in match.groups() if g)
+            resolved = self._resolve(path, target)
+            if resolved:
+                found.add(resolved)
+        return found
+
+    def _resolve(self, importer: Path, target: str) -> str | None:
+        if target.startswith("@/"):
+            base = self.root / SRC_DIR / target[2:]
+        elif target.startswith("."):
+            base = importer.parent / target
+        else:
+            return None  # package import
+        for ext in _EXTENSIONS:
+            candidate = Path(os.path.normpath(f"{base}{ext}"))
+            if candidate.is_file():
+                return candidate.relative_to(self.root).as_posix()
+        return None
+
+    def _match(self, routes: list[tuple[re.Pattern, str]], path: str) -> str | None:
+        # Static segments win over dynamic ones: fewer "[" in the file path first
+        hits = [rel for pattern, rel in routes if pattern.match(path)]
+        return min(hits, key=lambda rel: (rel.count("["), rel), default=None)
+
+    def _with_layouts(self, rel: str) -> set[str]:
+        files = {rel}
+        directory = PurePosixPath(rel).parent
+        while True:
+            for name in _SPECIAL_FILES:
+                for ext in (".tsx", ".ts", ".jsx", ".js"):
+                    candidate = directory / f"{name}{ext}"
+                    if (self.root / candidate).is_file():
+                        files.add(candidate.as_posix())
+            if directory.as_posix() == APP_DIR:
+                return files
+            directory = directory.parent
+
+    def closure(self, files: set[str]) -> set[str]:
+        seen, pending = set(), list(files)
+        while pending:
+            rel = pending.pop()
+            if rel in seen:
+                continue
+            seen.add(rel)
+            pending.extend(self._imports.get(rel, ()))
+        return seen
+
+    def sources(self, coverage: dict) -> set[str]:
+        """Every source file behind the pages and /api routes of ``coverage``."""
+        entry = set()
+        for page in coverage.get("pages", []):
+            rel = self._match(self.pages, page)
+            if rel:
+                entry |= self._with_layouts(rel)
+        for call in coverage.get("api", []):
+            rel = self._match(self.handlers, call.split(" ", 1)[-1])
+            if rel:
+                entry.add(rel)
+        return self.closure(entry)
+
+
+# ---------------------------------------------------------------------------
+# Map and selection
+# ---------------------------------------------------------------------------
+
+def _git(*args: str) -> str | None:
+    try:
+        out = subprocess.run(["git", *args], cwd=config.REPO_ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout
+
+
+def revision() -> str | None:
+    out = _git("rev-parse", "HEAD")
+    return out.strip() if out else None
+
+
+def changed_files(base: str) -> list[str] | None:
+    """Files that differ between ``base`` and the working tree, untracked ones included."""
+    diff = _git("diff", "--name-only", base, "--")
+    if diff is None:
+        return None
+    untracked = _git("ls-files", "--others", "--exclude-standard") or ""
+    return sorted(set(diff.splitlines()) | set(untracked.splitlines()))
+
+
+def load_map(path: Path = MAP_PATH) -> dict:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {"tests": {}}
+
+
+def update_map(results: list[dict], path: Path = MAP_PATH) -> Path | None:
+    """Merge the coverage of ``results`` (``to_json()`` dicts) into the map."""
+    recorded = [r for r in results if "coverage" in r]
+    if not recorded:
+        return None
+    impact = load_map(path)
+    rev = revision()
+    now = datetime.now(timezone.utc).isoformat()
+    graph = SourceGraph()
+    for result in recorded:
+        coverage = result["coverage"]
+        impact["tests"][result["id"]] = {
+            **coverage,
+            "sources": sorted(graph.sources(coverage)),
+            "complete": result.get("testStatus") == "PASSED",
+            "revision": rev,
+            "recorded": now,
+        }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(impact, fh, ensure_ascii=False, indent=1)
+    return path
+
+
+def _matches(path: str, patterns) -> bool:
+    return any(fnmatch.fnmatch(path, p) for p in patterns)
+
+
+def stale_reason(cases: list[TestCase], impact: dict) -> str | None:
+    """Why the map cannot be trusted for ``cases``, or ``None``."""
+    tests = impact.get("tests", {})
+    if not tests:
+        return "no impact map recorded yet"
+    missing = [c.id for c in cases if c.id not in tests]
+    if missing:
+        return f"no coverage recorded for {', '.join(missing)}"
+    for rev in sorted({tests[c.id]["revision"] for c in cases}, key=str):
+        if rev is None or _git("cat-file", "-e", f"{rev}^{{commit}}") is None:
+            return f"coverage recorded on unknown revision {rev}"
+        flows = _git("diff", "--name-only", rev, "--", *FLOW_FILES)
+        if flows and flows.strip():
+            return f"test flows changed since {rev[:10]}: {' '.join(flows.splitlines()[:3])}"
+    return None
+
+
+def select(cases: list[TestCase], changed: list[str], impact: dict,
+           graph: SourceGraph | None = None) -> tuple[list[TestCase], dict[str, list[str]], str | None]:
+    """Cases affected by ``changed``, why each was picked, and the fallback reason if any.
+
+    When the map is stale or a global file changed, every case is returned
+    and the third element says why.
+    """
+    stale = stale_reason(cases, impact)
+    if stale:
+        return cases, {}, f"map is stale ({stale})"
+    global_changes = [f for f in changed if _matches(f, GLOBAL_FILES)]
+    if global_changes:
+        return cases, {}, f"global file changed ({', '.join(global_changes[:3])})"
+    graph = graph or SourceGraph()
+    scripts = {c.id: c.path.relative_to(config.REPO_ROOT).as_posix() for c in cases}
+    reasons: dict[str, list[str]] = {}
+    for case in cases:
+        entry = impact["tests"][case.id]
+        sources = graph.sources(entry) | {scripts[case.id]}
+        hits = [f for f in changed if f in sources]
+        if not entry.get("complete", False):
+            hits.append("coverage incomplete (test failed when recorded)")
+        if hits:
+            reasons[case.id] = hits
+    return [c for c in cases if c.id in reasons], reasons, None
+
+
+def uncovered(changed: list[str], impact: dict, graph: SourceGraph | None = None) -> list[str]:
+    """Changed source files that no recorded test reaches."""
+    graph = graph or SourceGraph()
+    reached = set()
+    for entry in impact.get("tests", {}).values():
+        reached |= graph.sources(entry)
+    return [f for f in changed if f.startswith(f"{SRC_DIR}/") and f not in reached]
@@ -0,0 +1,435 @@
+"""Concurrent load generator for the public search and booking APIs.
+
+``python -m harness load`` starts ``--users`` virtual users, each holding one
+keep-alive connection, and lets them run a weighted *mix* of scenarios for
+``--duration`` seconds:
+
+* ``search``: ``GET /api/doctors`` by specialty and/or wilaya, sometimes with
+  a free-text term or a later page, as the /doctors filters send it
+* ``detail``: ``GET /api/doctors/<id>`` for a doctor found during discovery
+* ``reviews``: ``GET /api/reviews?doctorId=<id>``
+* ``booking``: a burst of simultaneous ``POST /api/appointments`` for the
+  same doctor, date and time, each from a different patient phone
+* ``dashboard``: a signed-in doctor reading dashboard stats, appointments or
+  patients
+* ``admin``: a signed-in admin reading stats, doctor applications or
+  subscriptions
+
+Latencies are grouped per endpoint (method plus route, ids collapsed to
+``[id]``) and summarized as throughput, p50/p95/p99, error counts per status
+and a latency histogram. Booking bursts also report how many requests for
+the same slot were accepted. Results are written as JSON so two runs can be
+put side by side with ``python -m harness load-compare``.
+
+The HTTP/1.1 client is a small asyncio one so the generator has no
+dependencies beyond the standard library and never waits on a browser.
+Each connection keeps the cookies the server sets, which is how the
+``dashboard`` and ``admin`` scenarios sign in through NextAuth once per role.
+Booking bursts write real appointments and patients; use ``--mix browse``
+against a database that must stay clean.
+"""
+import asyncio
+import json
+import random
+import re
+import ssl
+import subprocess
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from . import auth, catalog, config
+
+RESULTS_PATH = config.TMP_DIR / "load_results.json"
+
+# Upper bounds of the latency histogram buckets, in ms
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+MIXES = {
+    "default": {"search": 50, "detail": 25, "reviews": 15, "booking": 10},
+    "browse": {"search": 55, "detail": 30, "reviews": 15},
+    "booking": {"booking": 100},
+    # Long-running mix of public, doctor and admin traffic for ``harness.soak``
+    "soak": {"search": 35, "detail": 15, "reviews": 10, "booking": 5, "dashboard": 20, "admin": 15},
+}
+
+DASHBOARD_PATHS = ("/api/dashboard/stats", "/api/appointments", "/api/patients")
+ADMIN_PATHS = ("/api/admin/stats", "/api/admin/doctors", "/api/admin/subscriptions")
+
+SEARCH_TERMS = ("محمد", "أحمد", "طب", "عيون", "قلب", "الجزائر", "وهران")
+
+
+class HttpError(Exception):
+    pass
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection, reopened after errors or ``close``."""
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.tls = parts.scheme == "https"
+        self.port = parts.port or (443 if self.tls else 80)
+        self.host_header = parts.netloc
+        self.cookies: dict[str, str] = {}
+        self._reader = self._writer = None
+
+    async def _open(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host, self.port, ssl=ssl.create_default_context() if self.tls else None)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        self._reader = self._writer = None
+
+    async def request(self, method: str, path: str, body: dict | None = None,
+                      form: dict | None = None, raw: tuple[str, bytes] | None = None) -> tuple[int, bytes]:
+        """``body`` is sent as JSON, ``form`` URL-encoded, ``raw`` as (content type, bytes)."""
+        if self._writer is None:
+            await self._open()
+        if raw is not None:
+            payload = raw[1]
+        elif form is not None:
+            payload = urlencode(form).encode()
+        else:
+            payload = json.dumps(body).encode() if body is not None else b""
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host_header}", "Connection: keep-alive",
+                "Accept: application/json", f"Content-Length: {len(payload)}"]
+        if raw is not None:
+            head.append(f"Content-Type: {raw[0]}")
+        elif form is not None:
+            head.append("Content-Type: application/x-www-form-urlencoded")
+        elif body is not None:
+            head.append("Content-Type: application/json")
+        if self.cookies:
+            head.append("Cookie: " + "; ".join(f"{k}={v}" for k, v in self.cookies.items()))
+        try:
+            self._writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+            await self._writer.drain()
+            status, headers, data = await self._read_response()
+        except (OSError, asyncio.IncompleteReadError, HttpError):
+            await self.close()
+            raise
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, data
+
+    async def _read_response(self) -> tuple[int, dict, bytes]:
+        status_line = await self._reader.readuntil(b"\r\n")
+        match = re.match(rb"HTTP/1\.[01] (\d{3})", status_line)
+        if not match:
+            raise HttpError(f"Bad status line {status_line[:40]!r}")
+        headers = {}
+        while (line := await self._reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip()
+            if name == "set-cookie":
+                cookie, _, _ = value.partition(";")
+                key, _, val = cookie.partition("=")
+                self.cookies[key.strip()] = val.strip()
+            headers[name] = value
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int((await self._reader.readuntil(b"\r\n")).split(b";")[0], 16):
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readexactly(2)
+            while await self._reader.readuntil(b"\r\n") != b"\r\n":
+                pass  # trailers
+            data = b"".join(chunks)
+        elif "content-length" in headers:
+            data = await self._reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await self._reader.read()
+            headers["connection"] = "close"
+        return int(match.group(1)), headers, data
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+    def add(self, ms: float, status: str) -> None:
+        self.latencies.append(ms)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        # 409 is a booking that lost its slot to another one, the expected
+        # answer for all but one request of a burst
+        if not status.isdigit() or (int(status) >= 400 and status != "409"):
+            self.errors += 1
+
+    def summary(self, seconds: float) -> dict:
+        ordered = sorted(self.latencies)
+        histogram = {f"<={b}": 0 for b in BUCKETS_MS}
+        histogram[f">{BUCKETS_MS[-1]}"] = 0
+        for ms in ordered:
+            bucket = next((f"<={b}" for b in BUCKETS_MS if ms <= b), f">{BUCKETS_MS[-1]}")
+            histogram[bucket] += 1
+        return {
+            "count": len(ordered),
+            "rps": round(len(ordered) / seconds, 2) if seconds else 0.0,
+            "errors": self.errors,
+            "errorRate": round(self.errors / len(ordered), 4) if ordered else 0.0,
+            "statuses": dict(sorted(self.statuses.items())),
+            "meanMs": round(sum(ordered) / len(ordered), 1) if ordered else 0.0,
+            "p50Ms": percentile(ordered, 50),
+            "p95Ms": percentile(ordered, 95),
+            "p99Ms": percentile(ordered, 99),
+            "maxMs": round(ordered[-1], 1) if ordered else 0.0,
+            "histogram": histogram,
+        }
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return round(ordered[int(rank) - 1], 1)
+
+
+def _route(path: str) -> str:
+    return re.sub(r"/\d+(?=/|$)", "/[id]", path.split("?", 1)[0])
+
+
+class LoadTest:
+    def __init__(self, base_url: str = config.BASE_URL, mix: str = "default", users: int = 20,
+                 duration: float = 60.0, burst: int = 10, seed: int = 1, warmup: float = 5.0):
+        self.base_url = base_url
+        self.weights = MIXES[mix]
+        self.mix = mix
+        self.users = users
+        self.duration = duration
+        self.burst = burst
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.stats: dict[str, EndpointStats] = {}
+        self.bursts: list[int] = []
+        self.doctor_ids: list[int] = []
+        self._recording = False
+        self._slot = 0
+        self._cookies: dict[str, dict[str, str]] = {}
+        self._login_lock = asyncio.Lock()
+
+    async def _call(self, conn: Connection, method: str, path: str, body: dict | None = None):
+        started = time.perf_counter()
+        try:
+            status, data = await conn.request(method, path, body)
+            code = str(status)
+        except Exception as exc:
+            status, data, code = 0, b"", type(exc).__name__
+        if self._recording:
+            label = f"{method} {_route(path)}"
+            self.stats.setdefault(label, EndpointStats()).add((time.perf_counter() - started) * 1000, code)
+        return status, data
+
+    async def discover(self) -> None:
+        """Collect approved doctor ids the detail, review and booking scenarios use."""
+        conn = Connection(self.base_url)
+        try:
+            status, data = await conn.request("GET", "/api/doctors?" + urlencode({"limit": 100}))
+        finally:
+            await conn.close()
+        if status != 200:
+            raise HttpError(f"GET /api/doctors answered {status}; is the app running at {self.base_url}?")
+        self.doctor_ids = [d["id"] for d in json.loads(data)["data"]["doctors"]]
+        if not self.doctor_ids:
+            raise HttpError("No approved doctors to load-test against; seed the database first")
+
+    async def login(self, role: str) -> dict[str, str]:
+        """NextAuth cookies for ``role`` (see ``harness.auth``), signed in once per run."""
+        async with self._login_lock:
+            if role in self._cookies:
+                return self._cookies[role]
+            spec = auth.ROLES[role]
+            conn = Connection(self.base_url)
+            try:
+                _, data = await conn.request("GET", "/api/auth/csrf")
+                await conn.request("POST", "/api/auth/callback/credentials", form={
+                    "csrfToken": json.loads(data)["csrfToken"], "email": spec.email,
+                    "password": spec.password, "json": "true",
+                })
+                _, data = await conn.request("GET", "/api/auth/session")
+            finally:
+                await conn.close()
+            if (json.loads(data or b"{}") or {}).get("user", {}).get("email") != spec.email:
+                raise HttpError(f"Login as {spec.email} was rejected by {self.base_url}")
+            self._cookies[role] = dict(conn.cookies)
+            return self._cookies[role]
+
+    async def _signed_in(self, conn: Connection, role: str, paths: tuple[str, ...]) -> None:
+        # The role's cookies only for this call; the user's other calls stay anonymous
+        anonymous = conn.cookies
+        conn.cookies = dict(await self.login(role))
+        try:
+            await self._call(conn, "GET", self.rng.choice(paths))
+        finally:
+            conn.cookies = anonymous
+
+    async def search(self, conn: Connection) -> None:
+        params = {}
+        if self.rng.random() < 0.7:
+            params["specialty"] = self.rng.choice(catalog.specialties())
+        if self.rng.random() < 0.6:
+            params["city"] = self.rng.choice(catalog.wilayas())
+        if self.rng.random() < 0.2:
+            params["search"] = self.rng.choice(SEARCH_TERMS)
+        params["page"] = 1 if self.rng.random() < 0.8 else self.rng.randint(2, 4)
+        params["limit"] = 12
+        await self._call(conn, "GET", "/api/doctors?" + urlencode(params))
+
+    async def detail(self, conn: Connection) -> None:
+        await self._call(conn, "GET", f"/api/doctors/{self.rng.choice(self.doctor_ids)}")
+
+    async def reviews(self, conn: Connection) -> None:
+        await self._call(conn, "GET", "/api/reviews?" + urlencode({"doctorId": self.rng.choice(self.doctor_ids)}))
+
+    async def dashboard(self, conn: Connection) -> None:
+        await self._signed_in(conn, "doctor", DASHBOARD_PATHS)
+
+    async def admin(self, conn: Connection) -> None:
+        await self._signed_in(conn, "admin", ADMIN_PATHS)
+
+    async def booking(self, conn: Connection) -> None:
+        """``burst`` patients race for one slot, each on its own connection."""
+        self._slot += 1
+        doctor = self.rng.choice(self.doctor_ids)
+        day = date.today() + timedelta(days=30 + self._slot // 16)
+        slot = f"{8 + self._slot % 16 // 2:02d}:{30 * (self._slot % 2):02d}"
+
+        async def book(n: int) -> int:
+            own = Connection(self.base_url)
+            try:
+                status, _ = await self._call(own, "POST", "/api/appointments", {
+                    "doctorId": doctor,
+                    "patientName": f"Load {self.seed}-{self._slot}-{n}",
+                    "patientPhone": f"05{self.rng.randrange(10 ** 8):08d}",
+                    "date": day.isoformat(),
+                    "time": slot,
+                    "notes": "harness load test",
+                })
+                return status
+            finally:
+                await own.close()
+
+        statuses = await asyncio.gather(*(book(n) for n in range(self.burst)))
+        if self._recording:
+            self.bursts.append(sum(s == 200 for s in statuses))
+
+    async def _user(self, deadline: float) -> None:
+        conn = Connection(self.base_url)
+        names, weights = zip(*self.weights.items())
+        try:
+            while time.perf_counter() < deadline:
+                await getattr(self, self.rng.choices(names, weights)[0])(conn)
+        finally:
+            await conn.close()
+
+    async def run(self) -> dict:
+        await self.discover()
+        started = time.perf_counter()
+        deadline = started + self.warmup + self.duration
+
+        async def start_recording():
+            await asyncio.sleep(self.warmup)
+            self._recording = True
+            return time.perf_counter()
+
+        recorder = asyncio.ensure_future(start_recording())
+        await asyncio.gather(*(self._user(deadline) for _ in range(self.users)))
+        measured = time.perf_counter() - await recorder
+        return self.report(measured)
+
+    def report(self, seconds: float) -> dict:
+        combined = EndpointStats()
+        for stats in self.stats.values():
+            combined.latencies += stats.latencies
+            combined.errors += stats.errors
+            for status, n in stats.statuses.items():
+                combined.statuses[status] = combined.statuses.get(status, 0) + n
+        return {
+            "meta": {
+                "baseUrl": self.base_url,
+                "mix": self.mix,
+                "users": self.users,
+                "durationS": self.duration,
+                "measuredS": round(seconds, 2),
+                "burst": self.burst,
+                "seed": self.seed,
+                "revision": _git_revision(),
+                "created": datetime.now(timezone.utc).isoformat(),
+            },
+            "total": combined.summary(seconds),
+            "endpoints": {label: s.summary(seconds) for label, s in sorted(self.stats.items())},
+            "bookingBursts": {
+                "bursts": len(self.bursts),
+                "maxAcceptedPerSlot": max(self.bursts, default=0),
+                "slotsBookedMoreThanOnce": sum(n > 1 for n in self.bursts),
+            },
+        }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=config.REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def write_report(report: dict, path: Path = RESULTS_PATH) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+    return path
+
+
+def read_report(path: Path) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _table(rows: list[tuple]) -> str:
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+
+def format_report(report: dict) -> str:
+    rows = [("Endpoint", "Requests", "Req/s", "Errors", "p50 ms", "p95 ms", "p99 ms", "Max ms")]
+    for label, s in [*report["endpoints"].items(), ("all", report["total"])]:
+        rows.append((label, str(s["count"]), f"{s['rps']:.1f}", f"{s['errors']} ({s['errorRate']:.1%})",
+                     f"{s['p50Ms']:.0f}", f"{s['p95Ms']:.0f}", f"{s['p99Ms']:.0f}", f"{s['maxMs']:.0f}"))
+    lines = [_table(rows)]
+    bursts = report["bookingBursts"]
+    if bursts["bursts"]:
+        lines.append(f"\nBooking bursts: {bursts['bursts']}, max accepted for one slot "
+                     f"{bursts['maxAcceptedPerSlot']}, slots booked more than once "
+                     f"{bursts['slotsBookedMoreThanOnce']}")
+    return "\n".join(lines)
+
+
+def format_load_comparison(before: dict, after: dict) -> str:
+    """Throughput and tail latency of two load runs, per endpoint."""
+    rows = [("Endpoint", "Req/s before", "Req/s after", "p95 before", "p95 after", "p95 change", "Errors")]
+    old = {**before["endpoints"], "all": before["total"]}
+    new = {**after["endpoints"], "all": after["total"]}
+    for label in [*sorted((old.keys() | new.keys()) - {"all"}), "all"]:
+        a, b = old.get(label), new.get(label)
+        change = f"{(b['p95Ms'] - a['p95Ms']) / a['p95Ms'] * 100:+.0f}%" if a and b and a["p95Ms"] else ""
+        rows.append((label,
+                     f"{a['rps']:.1f}" if a else "-", f"{b['rps']:.1f}" if b else "-",
+                     f"{a['p95Ms']:.0f}" if a else "-", f"{b['p95Ms']:.0f}" if b else "-",
+                     change,
+                     f"{a['errorRate'] if a else 0:.1%} -> {b['errorRate'] if b else 0:.1%}"))
+    return _table(rows)
@@ -0,0 +1,99 @@
+"""Discovery and loading of the generated TC0xx_*.py flows.
+
+The scripts are kept exactly as TestSprite generates them. Each one ends with
+``asyncio.run(run_test())``; the loader compiles the file without that
+statement so the harness can await ``run_test()`` inside its own event loop.
+"""
+import ast
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+
+from . import config
+
+_TC_FILE = re.compile(r"^(TC\d{3})_.+\.py$")
+
+
+@dataclass
+class TestCase:
+    id: str
+    path: Path
+    title: str = ""
+    description: str = ""
+    category: str = ""
+    priority: str = ""
+    steps: list = field(default_factory=list)
+
+    @property
+    def report_title(self) -> str:
+        return f"{self.id}-{self.title}" if self.title else self.id
+
+
+def load_plan(path: Path = config.PLAN_PATH) -> dict[str, dict]:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return {entry["id"]: entry for entry in json.load(fh)}
+    except (OSError, ValueError):
+        return {}
+
+
+def discover(ids=None, tests_dir: Path = config.TESTS_DIR) -> list[TestCase]:
+    """Return the TC scripts in id order, optionally restricted to ``ids``."""
+    plan = load_plan()
+    wanted = {i.upper() for i in ids} if ids else None
+    cases = []
+    for path in sorted(tests_dir.glob("TC*.py")):
+        match = _TC_FILE.match(path.name)
+        if not match or (wanted and match.group(1) not in wanted):
+            continue
+        entry = plan.get(match.group(1), {})
+        cases.append(TestCase(
+            id=match.group(1),
+            path=path,
+            title=entry.get("title", ""),
+            description=entry.get("description", ""),
+            category=entry.get("category", ""),
+            priority=entry.get("priority", ""),
+            steps=entry.get("steps", []),
+        ))
+    return cases
+
+
+def select(cases: list[TestCase], categories=None, priorities=None) -> list[TestCase]:
+    """Keep cases whose plan category and priority are among those given (case-insensitive)."""
+    categories = {c.lower() for c in categories or ()}
+    priorities = {p.lower() for p in priorities or ()}
+    return [c for c in cases
+            if (not categories or c.category.lower() in categories)
+            and (not priorities or c.priority.lower() in priorities)]
+
+
+def _is_entrypoint(node: ast.stmt) -> bool:
+    # Matches the trailing `asyncio.run(run_test())` of every generated script
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def load_module(case: TestCase) -> ModuleType:
+    """Execute a TC script without its entrypoint and return it as a module."""
+    if str(config.TESTS_DIR) not in sys.path:
+        sys.path.insert(0, str(config.TESTS_DIR))
+    source = case.path.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(case.path))
+    tree.body = [node for node in tree.body if not _is_entrypoint(node)]
+    module = ModuleType(f"testsprite_{case.id}")
+    module.__file__ = str(case.path)
+    exec(compile(tree, str(case.path), "exec"), module.__dict__)
+    if not hasattr(module, "run_test"):
+        raise RuntimeError(f"{case.path.name} does not define run_test()")
+    return module
@@ -0,0 +1,177 @@
+"""HAR capture of /api traffic and the checks run over it after each test.
+
+Every context the flow opens records a HAR (``tmp/har/<test>.har``, response
+bodies omitted) limited to ``/api/`` URLs. Once the context is closed the
+entries are grouped by the page that issued them, taken from the ``Referer``
+header so client-side route changes are attributed correctly, and checked
+for
+
+* **duplicates**: the same method, URL and body sent more than once by a
+  page, or the same GET repeated on several pages of one test. Repeats that
+  follow a write to the same resource are labelled ``refetch-after-write``.
+* **waterfalls**: GETs on a page that started within ``WATERFALL_GAP_MS`` of
+  the previous one finishing, so the second waited on the first. If they do
+  not depend on each other they could be fetched in parallel; ``savedMs`` is
+  what that would save at best.
+* **oversized** JSON responses larger than ``HARNESS_JSON_LIMIT_KB``.
+
+The findings are stored in the test result under ``network``.
+"""
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from . import config
+
+HAR_DIR = config.TMP_DIR / "har"
+
+API_URL = re.compile(r"/api/")
+
+# A GET that starts this soon after another one on the same page finished
+# most likely waited for it
+WATERFALL_GAP_MS = 50.0
+
+JSON_LIMIT_BYTES = int(float(os.environ.get("HARNESS_JSON_LIMIT_KB", "100")) * 1024)
+
+
+def har_path(name: str, index: int) -> Path:
+    HAR_DIR.mkdir(parents=True, exist_ok=True)
+    return HAR_DIR / (f"{name}.har" if index == 0 else f"{name}-{index}.har")
+
+
+def context_options(name: str, index: int) -> dict:
+    """``new_context`` keyword arguments that turn on HAR recording."""
+    return {
+        "record_har_path": str(har_path(name, index)),
+        "record_har_content": "omit",
+        "record_har_url_filter": API_URL,
+    }
+
+
+def _route(path: str) -> str:
+    return re.sub(r"/\d+(?=/|$)", "/[id]", path)
+
+
+def _header(headers: list[dict], name: str) -> str:
+    return next((h["value"] for h in headers if h["name"].lower() == name), "")
+
+
+def _entries(path: Path) -> list[dict]:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            har = json.load(fh)
+    except (OSError, ValueError):
+        return []
+    calls = []
+    for entry in har["log"]["entries"]:
+        request, response = entry["request"], entry["response"]
+        url = urlsplit(request["url"])
+        if not url.path.startswith("/api/"):
+            continue
+        referer = urlsplit(_header(request["headers"], "referer")).path or "?"
+        start = datetime.fromisoformat(entry["startedDateTime"].replace("Z", "+00:00")).timestamp() * 1000
+        content = response.get("content", {})
+        calls.append({
+            "page": _route(referer),
+            "method": request["method"],
+            "url": url.path + (f"?{url.query}" if url.query else ""),
+            "body": (request.get("postData") or {}).get("text", ""),
+            "status": response["status"],
+            "start": start,
+            "end": start + max(entry.get("time", 0.0), 0.0),
+            "bytes": max(content.get("size", 0), response.get("bodySize", 0), 0),
+            "json": "json" in content.get("mimeType", "") or "json" in _header(response["headers"], "content-type"),
+        })
+    return sorted(calls, key=lambda c: c["start"])
+
+
+def _resource(url: str) -> str:
+    """``/api/appointments/12?x`` and ``/api/appointments`` share ``/api/appointments``."""
+    parts = url.split("?", 1)[0].split("/")
+    return "/".join(parts[:3])
+
+
+def _duplicates(calls: list[dict]) -> dict[str, list[dict]]:
+    found: dict[str, list[dict]] = {}
+    seen: dict[tuple, list[dict]] = {}
+    for call in calls:
+        seen.setdefault((call["method"], call["url"], call["body"]), []).append(call)
+    for (method, url, _), repeats in seen.items():
+        if len(repeats) < 2:
+            continue
+        pages = sorted({c["page"] for c in repeats})
+        writes = [c for c in calls if c["method"] != "GET" and _resource(c["url"]) == _resource(url)
+                  and repeats[0]["start"] < c["start"] < repeats[-1]["start"]]
+        kind = "refetch-after-write" if writes and method == "GET" else "same-page" if len(pages) == 1 else "cross-page"
+        for page in pages:
+            found.setdefault(page, []).append({
+                "request": f"{method} {url}",
+                "count": len(repeats),
+                "kind": kind,
+                "pages": pages,
+                "wastedBytes": sum(c["bytes"] for c in repeats[1:]),
+            })
+    return found
+
+
+def _waterfalls(calls: list[dict]) -> dict[str, list[dict]]:
+    found: dict[str, list[dict]] = {}
+    by_page: dict[str, list[dict]] = {}
+    for call in calls:
+        by_page.setdefault(call["page"], []).append(call)
+    for page, page_calls in by_page.items():
+        gets = [c for c in page_calls if c["method"] == "GET"]
+        for before, after in zip(gets, gets[1:]):
+            gap = after["start"] - before["end"]
+            if 0 <= gap <= WATERFALL_GAP_MS:
+                found.setdefault(page, []).append({
+                    "first": f"GET {before['url']}",
+                    "then": f"GET {after['url']}",
+                    "gapMs": round(gap, 1),
+                    "savedMs": round(min(before["end"] - before["start"], after["end"] - after["start"]), 1),
+                })
+    return found
+
+
+def analyze(paths: list[Path]) -> dict:
+    """Per-page findings for all HAR files of one test."""
+    calls = [c for path in paths for c in _entries(path)]
+    duplicates = _duplicates(calls)
+    waterfalls = _waterfalls(calls)
+    pages: dict[str, dict] = {}
+    for call in calls:
+        page = pages.setdefault(call["page"], {"requests": 0, "bytes": 0, "duplicates": [],
+                                               "waterfalls": [], "oversized": []})
+        page["requests"] += 1
+        page["bytes"] += call["bytes"]
+        if call["json"] and call["bytes"] > JSON_LIMIT_BYTES:
+            page["oversized"].append({"request": f"{call['method']} {call['url']}", "bytes": call["bytes"]})
+    for page, items in duplicates.items():
+        pages[page]["duplicates"] = items
+    for page, items in waterfalls.items():
+        pages[page]["waterfalls"] = items
+    return {"har": [str(p.relative_to(config.TESTS_DIR)) for p in paths], "pages": pages}
+
+
+def format_summary(results: list[dict]) -> str:
+    """Findings of a whole run merged per page, for the console report."""
+    merged: dict[str, dict[str, set]] = {}
+    for result in results:
+        for page, info in result.get("network", {}).get("pages", {}).items():
+            slot = merged.setdefault(page, {"duplicates": set(), "waterfalls": set(), "oversized": set()})
+            slot["duplicates"].update(f"{d['request']} x{d['count']} ({d['kind']})" for d in info["duplicates"])
+            slot["waterfalls"].update(f"{w['first']} -> {w['then']}" for w in info["waterfalls"])
+            slot["oversized"].update(f"{o['request']} {o['bytes'] // 1024} KB" for o in info["oversized"])
+    labels = {"duplicates": "duplicate", "waterfalls": "waterfall", "oversized": "oversized"}
+    lines = []
+    for page in sorted(merged):
+        items = merged[page]
+        if not any(items.values()):
+            continue
+        lines.append(page)
+        for kind, label in labels.items():
+            lines.extend(f"  {label}: {item}" for item in sorted(items[kind]))
+    return "\n".join(lines)
@@ -0,0 +1,150 @@
+"""Sharded execution of the suite across worker processes.
+
+Each worker process runs its own Playwright instance and browser pool, so
+flows in different shards share nothing but the app under test. Shards are
+balanced by the durations recorded in the previous results file and kept
+together by plan category where that does not unbalance them.
+
+Tests that mutate the same rows are put in a serialization group: a group is
+scheduled as one unit on one worker and its members run in id order, so they
+never race each other.
+"""
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from .loader import TestCase, discover
+from .report import SuiteRun, TestResult, read_results
+
+# Tests that change shared data and must not run concurrently with each other
+SERIAL_GROUPS = {
+    "appointment-status": ("TC014", "TC015", "TC016"),
+    "doctor-approval": ("TC019", "TC021"),
+}
+
+# Assumed duration for a test with no history, in milliseconds
+DEFAULT_DURATION_MS = 30_000.0
+
+# Shards whose load is within this fraction of the lightest one count as
+# equally good; among those the one already running the category wins.
+BALANCE_SLACK = 0.10
+
+
+@dataclass
+class Unit:
+    cases: list[TestCase]
+    cost: float
+
+    @property
+    def category(self) -> str:
+        return self.cases[0].category
+
+
+@dataclass
+class Shard:
+    index: int
+    units: list[Unit] = field(default_factory=list)
+    load: float = 0.0
+
+    @property
+    def categories(self) -> set[str]:
+        return {unit.category for unit in self.units}
+
+    @property
+    def ids(self) -> list[str]:
+        return [case.id for unit in self.units for case in unit.cases]
+
+
+def historical_durations(history: list[dict] | None = None) -> dict[str, float]:
+    """Per-test cost (setup + flow time) from the last results file."""
+    if history is None:
+        history = read_results()
+    durations = {}
+    for entry in history:
+        test_id = entry.get("id") or entry.get("title", "").split("-", 1)[0]
+        if "durationMs" in entry:
+            durations[test_id] = entry.get("setupMs", 0.0) + entry["durationMs"]
+    return durations
+
+
+def _estimate(case: TestCase, durations: dict[str, float], by_category: dict[str, float]) -> float:
+    if case.id in durations:
+        return durations[case.id]
+    return by_category.get(case.category, DEFAULT_DURATION_MS)
+
+
+def build_units(cases: list[TestCase], durations: dict[str, float]) -> list[Unit]:
+    known: dict[str, list[float]] = {}
+    for case in cases:
+        if case.id in durations:
+            known.setdefault(case.category, []).append(durations[case.id])
+    by_category = {cat: sum(v) / len(v) for cat, v in known.items()}
+
+    grouped = {test_id: name for name, ids in SERIAL_GROUPS.items() for test_id in ids}
+    units, groups = [], {}
+    for case in cases:
+        cost = _estimate(case, durations, by_category)
+        name = grouped.get(case.id)
+        if name is None:
+            units.append(Unit([case], cost))
+        elif name in groups:
+            groups[name].cases.append(case)
+            groups[name].cost += cost
+        else:
+            groups[name] = Unit([case], cost)
+            units.append(groups[name])
+    return units
+
+
+def plan_shards(cases: list[TestCase], workers: int, durations: dict[str, float] | None = None) -> list[Shard]:
+    """Longest-first greedy packing, preferring shards of the same category."""
+    if durations is None:
+        durations = historical_durations()
+    shards = [Shard(i) for i in range(max(1, workers))]
+    for unit in sorted(build_units(cases, durations), key=lambda u: u.cost, reverse=True):
+        lightest = min(shard.load for shard in shards)
+        candidates = [s for s in shards if s.load <= lightest + max(lightest, unit.cost) * BALANCE_SLACK]
+        target = next((s for s in candidates if unit.category in s.categories), candidates[0])
+        target.units.append(unit)
+        target.load += unit.cost
+    for shard in shards:
+        shard.units.sort(key=lambda u: u.cases[0].id)
+    return [shard for shard in shards if shard.units]
+
+
+def _run_shard(ids: list[str], pool_size: int) -> list[dict]:
+    # Executed in a worker process: one Playwright instance per process
+    from .runner import run_suite
+
+    run = asyncio.run(run_suite(discover(ids), pool_size=pool_size))
+    return [result.to_json() for result in run.results]
+
+
+def _from_json(data: dict) -> TestResult:
+    known = TestResult.__dataclass_fields__
+    result = TestResult(**{k: v for k, v in data.items() if k in known and k != "extra"})
+    result.extra = {k: v for k, v in data.items() if k not in known}
+    return result
+
+
+def run_parallel(cases: list[TestCase], workers: int, pool_size: int = 1, on_result=None) -> SuiteRun:
+    """Run ``cases`` across ``workers`` processes and merge the results."""
+    shards = plan_shards(cases, workers)
+    run = SuiteRun()
+    started = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as executor:
+        futures = {executor.submit(_run_shard, shard.ids, pool_size): shard for shard in shards}
+        for future in as_completed(futures):
+            shard = futures[future]
+            for data in future.result():
+                result = _from_json(data)
+                result.extra["shard"] = shard.index
+                run.results.append(result)
+                if on_result:
+                    on_result(result)
+    run.results.sort(key=lambda r: r.id)
+    run.wallMs = (time.perf_counter() - started) * 1000
+    return run
@@ -0,0 +1,372 @@
+"""Data-driven executor for ``testsprite_frontend_test_plan.json``.
+
+``python -m harness plan`` runs the plan's own steps instead of the generated
+TC scripts. Every step description is matched against the patterns
+registered with :func:`step`, and element, field and button names from the
+plan ("Doctor card", "Phone", "Confirm booking") are looked up in
+``ELEMENTS``, ``FIELDS`` and ``LABELS``. Those tables map them to stable
+selectors and to the Arabic wording of the UI, so the plan needs no XPaths.
+
+Cases are compiled before anything runs. A step no pattern understands
+fails its test with the step text. The leading "Navigate to /login, type
+{{LOGIN_USER}}/{{LOGIN_PASSWORD}}, click Login" block compiles to a single
+cached sign-in (``auth.goto``): admin for the "Admin Panel" category,
+doctor otherwise. That step and an opening navigation count as setup time.
+Per-step durations are written to the result under ``steps``.
+"""
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import expect
+
+from . import auth, config, waits
+from .loader import TestCase
+
+RESULTS_PATH = config.TMP_DIR / "plan_results.json"
+
+_steps = []
+
+
+def step(pattern: str):
+    regex = re.compile("^" + pattern + "$", re.I)
+
+    def register(func):
+        _steps.append((regex, func))
+        return func
+    return register
+
+
+class StepNotUnderstood(LookupError):
+    pass
+
+
+# Plan element names -> (selector, needs the booking form open)
+ELEMENTS = {
+    "doctor card": (".doctor-card", False),
+    "rating": (".doctor-card-rating", False),
+    "price": (".doctor-card-price", False),
+    "search": ("input[placeholder^='ابحث'], a.btn-lg[href='/doctors']", False),
+    "appointment booking": ("button:has-text('احجز الآن'), form:has(input[type=date])", False),
+    "date and time slots": ("form input[type=date]", True),
+    "patient name": ("form input[placeholder='مثال: محمد أحمد']", True),
+    "phone": ("form input[type=tel]", True),
+    "doctor applications list": ("table", False),
+    "admin content area": ("main", False),
+}
+
+# Plan field names -> (selector, needs the booking form open)
+FIELDS = {
+    "email/username": ("input[type=email]", False),
+    "password": ("input[type=password]", False),
+    "patient name": ELEMENTS["patient name"],
+    "phone": ELEMENTS["phone"],
+    "biography/description": ("textarea.form-textarea", False),
+    "package name": (".modal input[type=text]", False),
+}
+
+# Filters on /doctors are <select>s that apply as soon as they change
+FILTERS = {"specialty search": 0, "city search": 1}
+
+# Plan button/link names -> one or more UI labels clicked in turn, or a path
+LABELS = {
+    "login": ("تسجيل الدخول",),
+    "confirm booking": ("تأكيد الحجز",),
+    "إكمال": ("إتمام", "تأكيد الإتمام"),
+    "إعدادات الملف الشخصي": "/dashboard/profile",
+    "ساعات العمل": ("مواعيد العمل",),
+    "حفظ": ("حفظ",),
+    "save": ("حفظ",),
+    "admin": "/admin",
+    "subscription packages": ("الباقات",),
+}
+
+# Plan wording of a message -> what the UI actually shows
+TEXTS = {
+    "No results found": "لا توجد نتائج",
+    "Booking confirmed": "تم حجز الموعد بنجاح",
+    "تم التأكيد": "مؤكد",
+    "تم الإلغاء": "ملغي",
+    "تم الحفظ": "تم تحديث البيانات بنجاح",
+    "تمت الموافقة": "نشط",
+    "جار التحميل": "جاري",
+}
+
+SLOT_BUTTONS = "form .flex.flex-wrap.gap-sm > button.btn-sm"
+
+_LOGIN_PREFIX = (
+    re.compile(r"^Navigate to /login$"),
+    re.compile(r'^Type "\{\{LOGIN_USER\}\}" into'),
+    re.compile(r'^Type "\{\{LOGIN_PASSWORD\}\}" into'),
+    re.compile(r'^Click on (the )?"Login"'),
+)
+
+_LANDED_URL = re.compile(r'^Verify URL contains "(?P<fragment>.+)"$')
+
+
+@dataclass
+class Flow:
+    page: object
+    role: str
+
+
+@dataclass
+class Compiled:
+    description: str
+    func: object
+    params: dict = field(default_factory=dict)
+    setup: bool = False
+
+
+def _role(case: TestCase) -> str:
+    return "admin" if case.category == "Admin Panel" else "doctor"
+
+
+def compile_case(case: TestCase) -> list[Compiled]:
+    """Resolve every plan step to a handler; raises StepNotUnderstood."""
+    descriptions = [s["description"].strip() for s in case.steps]
+    compiled = []
+    if len(descriptions) >= 4 and all(p.match(d) for p, d in zip(_LOGIN_PREFIX, descriptions)):
+        role = _role(case)
+        compiled.append(Compiled(f"Sign in as {role}", _sign_in, {"role": role}, setup=True))
+        descriptions = descriptions[4:]
+        # The plan checks where its login landed; the cached session lands on the role's home
+        landed = _LANDED_URL.match(descriptions[0]) if descriptions else None
+        if landed:
+            home = auth.ROLES[role].home
+            compiled.append(Compiled(f"{descriptions[0]} (signed in as {role}: {home})", verify_url,
+                                     {"fragment": home}))
+            descriptions = descriptions[1:]
+    for description in descriptions:
+        for regex, func in _steps:
+            match = regex.match(description)
+            if match:
+                params = {k: v for k, v in match.groupdict().items() if v is not None}
+                _check_names(func, params)
+                compiled.append(Compiled(description, func, params))
+                break
+        else:
+            raise StepNotUnderstood(f'{case.id}: no step definition matches "{description}"')
+    if compiled and compiled[0].func is navigate:
+        compiled[0].setup = True
+    return compiled
+
+
+def _check_names(func, params: dict) -> None:
+    name = params.get("name", "").lower()
+    if func is verify_element and name not in ELEMENTS:
+        raise StepNotUnderstood(f'Unknown element "{params["name"]}"; add it to plan.ELEMENTS')
+    if func is type_into and name not in FIELDS and name not in FILTERS:
+        raise StepNotUnderstood(f'Unknown field "{params["name"]}"; add it to plan.FIELDS')
+
+
+def _substitute(value: str, role: str) -> str:
+    account = auth.ROLES[role]
+    return value.replace("{{LOGIN_USER}}", account.email).replace("{{LOGIN_PASSWORD}}", account.password)
+
+
+async def _visible(locator, timeout: float = 1000) -> bool:
+    try:
+        await locator.first.wait_for(state="visible", timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def _open_booking(page) -> None:
+    book = page.get_by_role("button", name="احجز الآن")
+    if await _visible(book, timeout=waits.ACTION_TIMEOUT / 4):
+        await waits.click(book.first)
+
+
+async def _ensure_on(page, path: str) -> None:
+    if path not in page.url:
+        await navigate(Flow(page, ""), path)
+
+
+async def _sign_in(flow: Flow, role: str) -> None:
+    await auth.goto(flow.page, role)
+
+
+# ---------------------------------------------------------------------------
+# Steps
+# ---------------------------------------------------------------------------
+
+@step(r"Navigate to (?P<path>/\S*)")
+async def navigate(flow: Flow, path: str) -> None:
+    await flow.page.goto(config.BASE_URL + path, wait_until="domcontentloaded")
+    await waits.network_idle(flow.page)
+
+
+@step(r'Verify text "(?P<text>.+)" is (?P<negated>not )?visible')
+async def verify_text(flow: Flow, text: str, negated: str = "") -> None:
+    target = flow.page.get_by_text(TEXTS.get(text, text)).first
+    if negated:
+        await expect(target).not_to_be_visible()
+    else:
+        await expect(target).to_be_visible(timeout=waits.ACTION_TIMEOUT)
+
+
+@step(r'Verify element "(?P<name>.+)" is (?P<negated>not )?visible(?P<in_card> within a doctor card)?')
+async def verify_element(flow: Flow, name: str, negated: str = "", in_card: str = "") -> None:
+    selector, in_booking = ELEMENTS[name.lower()]
+    if in_booking:
+        await _open_booking(flow.page)
+    scope = flow.page.locator(".doctor-card").first if in_card else flow.page
+    target = scope.locator(selector).first
+    if negated:
+        await expect(target).not_to_be_visible()
+    else:
+        await expect(target).to_be_visible(timeout=waits.ACTION_TIMEOUT)
+
+
+@step(r'Verify URL contains "(?P<fragment>.+)"')
+async def verify_url(flow: Flow, fragment: str) -> None:
+    await expect(flow.page).to_have_url(re.compile(re.escape(fragment)), timeout=waits.ACTION_TIMEOUT)
+
+
+@step(r'Verify page title contains "(?P<fragment>.+)"')
+async def verify_title(flow: Flow, fragment: str) -> None:
+    await expect(flow.page).to_have_title(re.compile(re.escape(fragment), re.I), timeout=waits.ACTION_TIMEOUT)
+
+
+@step(r'Type "(?P<value>.*)" into the "?(?P<name>[^"]+?)"? field')
+async def type_into(flow: Flow, value: str, name: str) -> None:
+    page, key = flow.page, name.lower()
+    value = _substitute(value, flow.role)
+    if key in FILTERS:
+        await _apply_filter(page, FILTERS[key], value)
+        return
+    selector, in_booking = FIELDS[key]
+    if in_booking:
+        await _open_booking(page)
+    await waits.fill(page.locator(selector).first, value)
+
+
+async def _apply_filter(page, index: int, value: str) -> None:
+    """Pick the matching specialty/wilaya option, or search by text if none matches."""
+    if "/doctors" not in page.url:
+        await waits.click(page.locator("a[href='/doctors']").first)
+    wanted = value.strip()
+    select = page.locator("select.form-select").nth(index)
+    options = await select.locator("option").all_text_contents()
+    label = next((o for o in options if wanted and wanted in o), None)
+    if label is not None:
+        acted_at = time.monotonic()
+        await select.select_option(label=label)
+        await waits.track(page.context).idle(since=acted_at)
+    else:
+        await waits.fill(page.locator("input[placeholder^='ابحث']").first, wanted)
+
+
+@step(r"Click search button")
+async def click_search(flow: Flow) -> None:
+    page = flow.page
+    if "/doctors" not in page.url:
+        await waits.click(page.locator("a[href='/doctors']").first)
+    # The /doctors filters apply on change; wait for the list to settle
+    await waits.network_idle(page)
+
+
+@step(r"Click on the first doctor card in the list")
+async def open_first_doctor(flow: Flow) -> None:
+    await _ensure_on(flow.page, "/doctors")
+    await waits.click(flow.page.locator(".doctor-card a[href^='/doctors/']").first, api="/api/doctors/*")
+
+
+@step(r"Select a date and time slot")
+async def select_slot(flow: Flow) -> None:
+    page = flow.page
+    await _open_booking(page)
+    slots = page.locator(SLOT_BUTTONS)
+    for offset in range(1, 15):
+        await page.locator("form input[type=date]").fill((date.today() + timedelta(days=offset)).isoformat())
+        if await _visible(slots):
+            await waits.click(slots.first)
+            return
+    raise AssertionError("No working day with free slots in the next two weeks")
+
+
+@step(r"Click on an upcoming appointment card")
+async def open_appointments(flow: Flow) -> None:
+    await _ensure_on(flow.page, "/dashboard/appointments")
+
+
+@step(r'Click on the "Approve" button for the first pending doctor application')
+async def approve_first(flow: Flow) -> None:
+    await _ensure_on(flow.page, "/admin/doctors")
+    await waits.click(flow.page.get_by_role("button", name="موافقة", exact=True).first,
+                      api="/api/admin/doctors/*", method="PUT")
+
+
+@step(r'Click on the "Edit" button for the first subscription package')
+async def edit_first_plan(flow: Flow) -> None:
+    await _ensure_on(flow.page, "/admin/plans")
+    await waits.click(flow.page.get_by_role("button", name="تعديل", exact=True).first)
+
+
+@step(r"Select an available start time option from the start time dropdown")
+async def pick_start_time(flow: Flow) -> None:
+    await _ensure_on(flow.page, "/dashboard/profile")
+    await waits.fill(flow.page.locator("input[type=time]").first, "08:30")
+
+
+@step(r'Click on (?:the )?"(?P<label>[^"]+)"(?: \([^)]*\))?(?: (?:button|link|tab)\S*(?: .*)?)?')
+async def click_label(flow: Flow, label: str) -> None:
+    target = LABELS.get(label.lower(), (label,))
+    if isinstance(target, str):
+        await navigate(flow, target)
+        return
+    for text in target:
+        await waits.click(await _clickable(flow.page, text))
+
+
+async def _clickable(page, text: str):
+    """The first visible button, then link, then any element named ``text``."""
+    candidates = (
+        page.get_by_role("button", name=text, exact=True),
+        page.get_by_role("button", name=text),
+        page.get_by_role("link", name=text, exact=True),
+        page.get_by_role("link", name=text),
+        page.get_by_text(text, exact=True),
+    )
+    for locator in candidates:
+        if await locator.count():
+            return locator.first
+    raise AssertionError(f'Nothing clickable labelled "{text}" on {page.url}')
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+async def execute(case: TestCase, session) -> None:
+    """Run one compiled plan case inside a harness ``TestSession``."""
+    steps = compile_case(case)
+    records = session.extra.setdefault("steps", [])
+    playwright = await session.async_api.async_playwright().start()
+    browser = await playwright.chromium.launch(headless=config.HEADLESS, args=config.LAUNCH_ARGS)
+    context = await browser.new_context()
+    try:
+        context.set_default_timeout(waits.ACTION_TIMEOUT)
+        page = await context.new_page()
+        flow = Flow(page, _role(case))
+        for number, compiled in enumerate(steps, 1):
+            started = time.perf_counter()
+            status = "FAILED"
+            try:
+                call = compiled.func(flow, **compiled.params)
+                await (session.clock.timed(call) if compiled.setup else call)
+                status = "PASSED"
+            except StepNotUnderstood:
+                raise
+            except Exception as exc:
+                message = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+                raise AssertionError(f'Step {number} "{compiled.description}": {message}') from exc
+            finally:
+                records.append({"step": compiled.description, "setup": compiled.setup, "status": status,
+                                "ms": round((time.perf_counter() - started) * 1000, 1)})
+    finally:
+        await context.close()
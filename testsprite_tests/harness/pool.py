@@ -0,0 +1,73 @@
+"""Warm browser pool shared by every test of a run.
+
+Playwright is started once per run and ``size`` Chromium instances are
+launched up front. A test leases one browser, opens its own
+``BrowserContext`` on it and hands the browser back when it is done, so the
+cost of a test is a context (a few milliseconds) instead of a full browser
+start.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+from playwright.async_api import Browser, async_playwright
+
+from . import config
+
+
+class BrowserPool:
+    def __init__(self, size: int = config.POOL_SIZE, headless: bool = config.HEADLESS,
+                 launch_args: list[str] | None = None):
+        self.size = max(1, size)
+        self.headless = headless
+        self.launch_args = list(launch_args or config.LAUNCH_ARGS)
+        self._pw = None
+        self._idle: asyncio.Queue[Browser] = asyncio.Queue()
+        self._browsers: list[Browser] = []
+
+    async def start(self) -> "BrowserPool":
+        self._pw = await async_playwright().start()
+        browsers = await asyncio.gather(*(self._launch() for _ in range(self.size)))
+        for browser in browsers:
+            self._idle.put_nowait(browser)
+        return self
+
+    async def close(self) -> None:
+        for browser in self._browsers:
+            if browser.is_connected():
+                await browser.close()
+        self._browsers.clear()
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    @property
+    def playwright(self):
+        return self._pw
+
+    async def _launch(self) -> Browser:
+        browser = await self._pw.chromium.launch(headless=self.headless, args=self.launch_args)
+        self._browsers.append(browser)
+        return browser
+
+    @asynccontextmanager
+    async def lease(self):
+        """Borrow a warm browser; a crashed browser is replaced on return."""
+        browser = await self._idle.get()
+        if not browser.is_connected():
+            self._browsers.remove(browser)
+            browser = await self._launch()
+        try:
+            yield browser
+        finally:
+            for context in list(browser.contexts):
+                await context.close()
+            if not browser.is_connected():
+                self._browsers.remove(browser)
+                browser = await self._launch()
+            self._idle.put_nowait(browser)
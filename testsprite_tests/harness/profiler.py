@@ -0,0 +1,249 @@
+"""Per-action long tasks, React commits and JS heap on the heavy client pages.
+
+``PROFILED_PAGES`` are the client pages that re-render the most per action:
+/doctors/[id] fetches and redraws its free slots on every date change,
+/dashboard/reports rasterizes itself with html2canvas for the PDF export
+and /dashboard/appointments re-renders the whole list after each status
+change. On those pages
+
+* an init script records every trusted user action (a click, a change of a
+  date/month/select input, typing into a field, collapsed per field) and
+  every long task (> 50 ms),
+* it also installs a minimal ``__REACT_DEVTOOLS_GLOBAL_HOOK__`` before
+  React loads; React reports each commit to it, production builds
+  included. If a real DevTools hook is already present commits are not
+  counted,
+* while a page is on one of them, a CDP session polls
+  ``Runtime.getHeapUsage`` every ``HEAP_INTERVAL`` seconds.
+
+Profiling is opt-in (``--profile`` or ``HARNESS_PROFILE=1``): the init
+script and the DevTools hook go into every document of the context.
+
+Each action owns the time until the next action on the same document (or
+the last snapshot). The result gets one ``interactions`` entry per action
+with its long tasks, commits, heap before/peak/after and ``settleMs``, the
+time from the input until the last long task or commit it caused. Raw
+actions are named through ``ACTIONS`` ("select date", "generate PDF");
+anything unnamed keeps a description such as ``click "تحميل PDF"``.
+"""
+import asyncio
+import json
+import re
+import time
+
+PROFILED_PAGES = ("/doctors/[id]", "/dashboard/reports", "/dashboard/appointments")
+
+HEAP_INTERVAL = 0.1
+
+# route -> (raw action pattern, name); raw actions look like
+# 'click "تأكيد الحجز"', 'change input[type=date]' or 'type input[name=phone]'
+ACTIONS = {
+    "/doctors/[id]": (
+        (r'^change input\[type=date\]', "select date"),
+        (r'^click "\d{1,2}:\d{2}', "select slot"),
+        (r'^click "احجز الآن"', "open booking form"),
+        (r'^(click "تأكيد الحجز"|submit)', "confirm booking"),
+        (r'^type ', "type booking details"),
+    ),
+    "/dashboard/reports": (
+        (r'^click ".*PDF', "generate PDF"),
+        (r'^change input\[type=month\]', "select month"),
+    ),
+    "/dashboard/appointments": (
+        (r'^click "تأكيد الإتمام"', "complete appointment"),
+        (r'^click "تأكيد"', "confirm appointment"),
+        (r'^click "إلغاء"', "cancel appointment"),
+        (r'^click "إتمام', "open completion form"),
+        (r'^click "(الكل|بانتظار التأكيد|مؤكد|مكتمل|ملغي)"', "filter list"),
+    ),
+}
+
+_INIT_SCRIPT = r"""
+(() => {
+  if (window.top !== window || window.__harnessProfileInstalled) return;
+  window.__harnessProfileInstalled = true;
+  const routes = %(routes)s;
+  const doc = Math.random().toString(36).slice(2);
+  const origin = performance.timeOrigin;
+  const now = () => origin + performance.now();
+  const routeOf = (path) => path.replace(/\/\d+(?=\/|$)/g, '/[id]');
+  const active = () => routes.includes(routeOf(location.pathname));
+  const state = {doc, actions: [], longTasks: [], commits: [], reactHook: false, last: 0};
+  let dirty = false;
+
+  if (!window.__REACT_DEVTOOLS_GLOBAL_HOOK__) {
+    let nextId = 0;
+    state.reactHook = true;
+    window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = {
+      renderers: new Map(), supportsFiber: true, isDisabled: false,
+      inject(renderer) { this.renderers.set(++nextId, renderer); return nextId; },
+      onScheduleFiberRoot() {}, onCommitFiberUnmount() {}, onPostCommitFiberRoot() {}, checkDCE() {},
+      onCommitFiberRoot() { if (active()) { state.commits.push(now()); dirty = true; } },
+    };
+  }
+  try {
+    new PerformanceObserver((list) => list.getEntries().forEach((e) => {
+      if (active()) { state.longTasks.push([origin + e.startTime, e.duration]); dirty = true; }
+    })).observe({type: 'longtask', buffered: true});
+  } catch (e) {}
+
+  const describe = (kind, target) => {
+    const el = target.closest('button, a, select, input, textarea, [role=button]') || target;
+    const tag = el.tagName.toLowerCase();
+    if (['input', 'select', 'textarea'].includes(tag)) {
+      const attr = el.getAttribute('type') ? `type=${el.getAttribute('type')}` : el.name ? `name=${el.name}` : '';
+      return `${kind} ${tag}${attr ? `[${attr}]` : ''}`;
+    }
+    const text = (el.innerText || el.getAttribute('aria-label') || '').trim().replace(/\s+/g, ' ').slice(0, 40);
+    return `${kind} "${text}"`;
+  };
+  const record = (kind, event) => {
+    if (!event.isTrusted || !active() || !(event.target instanceof Element)) return;
+    const raw = describe(kind, event.target);
+    const previous = state.actions[state.actions.length - 1];
+    const start = now();
+    if (kind === 'type' && previous && previous.raw === raw && start - previous.start < 2000) return;
+    state.actions.push({raw, route: routeOf(location.pathname), url: location.href, start});
+    dirty = true;
+  };
+  addEventListener('click', (e) => record('click', e), true);
+  addEventListener('change', (e) => {
+    if (e.target.matches && e.target.matches('select, input[type=date], input[type=month], input[type=time], input[type=checkbox], input[type=radio]')) record('change', e);
+  }, true);
+  addEventListener('keydown', (e) => {
+    if (e.key === 'Enter') record('submit', e);
+    else if (e.key.length === 1 || e.key === 'Backspace') record('type', e);
+  }, true);
+
+  const flush = () => {
+    state.last = now();
+    dirty = false;
+    if (window.__harnessProfile) return window.__harnessProfile(JSON.stringify(state));
+  };
+  window.__harnessProfileFlush = flush;
+  addEventListener('pagehide', flush);
+  setInterval(() => { if (dirty) flush(); }, 500);
+})();
+"""
+
+
+def _route(url: str) -> str:
+    path = re.sub(r"^[a-z]+://[^/]+", "", url).split("?", 1)[0].split("#", 1)[0]
+    return re.sub(r"/\d+(?=/|$)", "/[id]", path.rstrip("/") or "/")
+
+
+def action_name(route: str, raw: str) -> str:
+    for pattern, name in ACTIONS.get(route, ()):
+        if re.search(pattern, raw):
+            return name
+    return raw
+
+
+class PageProfiler:
+    """Collects actions, long tasks, commits and heap samples of one context."""
+
+    def __init__(self, pages=PROFILED_PAGES):
+        self.pages = tuple(pages)
+        self._docs: dict[str, dict] = {}
+        self._heap: list[tuple[float, float]] = []
+        self._pollers: list[asyncio.Task] = []
+        self._polling: set = set()
+
+    async def install(self, context) -> None:
+        await context.expose_binding("__harnessProfile", self._receive)
+        await context.add_init_script(_INIT_SCRIPT % {"routes": json.dumps(self.pages)})
+        context.on("page", lambda page: page.on("framenavigated", lambda frame: self._navigated(context, page, frame)))
+
+    def _navigated(self, context, page, frame) -> None:
+        # Client-side route changes fire framenavigated too
+        if frame is not page.main_frame or page in self._polling or _route(frame.url) not in self.pages:
+            return
+        self._polling.add(page)
+        self._pollers.append(asyncio.ensure_future(self._poll(context, page)))
+
+    def _receive(self, source, payload: str) -> None:
+        state = json.loads(payload)
+        self._docs[state["doc"]] = state
+
+    async def _poll(self, context, page) -> None:
+        # Runs while the page stays on a profiled route; _navigated starts it again
+        cdp = None
+        try:
+            cdp = await context.new_cdp_session(page)
+            while not page.is_closed() and _route(page.url) in self.pages:
+                usage = await cdp.send("Runtime.getHeapUsage")
+                self._heap.append((time.time() * 1000, usage["usedSize"] / 2 ** 20))
+                await asyncio.sleep(HEAP_INTERVAL)
+        except Exception:
+            pass  # page or context closed mid-call
+        finally:
+            self._polling.discard(page)
+            if cdp is not None:
+                try:
+                    await cdp.detach()
+                except Exception:
+                    pass  # session already gone with the page
+
+    async def flush(self, context) -> None:
+        for page in context.pages:
+            try:
+                await page.evaluate("window.__harnessProfileFlush && window.__harnessProfileFlush()")
+            except Exception:
+                pass  # page already gone or mid-navigation
+        for task in self._pollers:
+            task.cancel()
+        self._pollers.clear()
+        self._polling.clear()
+
+    def _heap_at(self, t: float) -> float | None:
+        before = [mb for ts, mb in self._heap if ts <= t]
+        return round(before[-1], 1) if before else None
+
+    @property
+    def interactions(self) -> list[dict]:
+        found = []
+        for state in self._docs.values():
+            actions = state["actions"]
+            for action, following in zip(actions, actions[1:] + [None]):
+                start = action["start"]
+                end = following["start"] if following else state["last"]
+                tasks = [(s, d) for s, d in state["longTasks"] if start <= s < end]
+                commits = [c for c in state["commits"] if start <= c < end]
+                busy_until = max([s + d for s, d in tasks] + commits, default=start)
+                peak = [mb for ts, mb in self._heap if start <= ts <= end]
+                found.append({
+                    "route": action["route"],
+                    "action": action_name(action["route"], action["raw"]),
+                    "raw": action["raw"],
+                    "windowMs": round(end - start, 1),
+                    "settleMs": round(busy_until - start, 1),
+                    "longTasks": len(tasks),
+                    "longTaskMs": round(sum(d for _, d in tasks), 1),
+                    "maxLongTaskMs": round(max((d for _, d in tasks), default=0.0), 1),
+                    "commits": len(commits) if state["reactHook"] else None,
+                    "heapBeforeMb": self._heap_at(start),
+                    "heapPeakMb": round(max(peak), 1) if peak else None,
+                    "heapAfterMb": self._heap_at(end),
+                    "_start": start,
+                })
+        found.sort(key=lambda i: i.pop("_start"))
+        return found
+
+
+def format_hotspots(results: list[dict], limit: int = 10) -> str:
+    """The actions with the most long-task time across a run."""
+    rows = [("Test", "Page", "Action", "Long tasks ms", "Settle ms", "Commits", "Heap MB")]
+    entries = [(r["id"], i) for r in results for i in r.get("interactions", [])]
+    entries.sort(key=lambda e: (e[1]["longTaskMs"], e[1]["settleMs"]), reverse=True)
+    for test_id, i in entries[:limit]:
+        heap = "-"
+        if i["heapBeforeMb"] is not None and i["heapPeakMb"] is not None:
+            heap = f"{i['heapBeforeMb']:g} -> {i['heapPeakMb']:g}"
+        rows.append((test_id, i["route"], i["action"], f"{i['longTaskMs']:.0f} ({i['longTasks']})",
+                     f"{i['settleMs']:.0f}", "-" if i["commits"] is None else str(i["commits"]), heap))
+    if len(rows) == 1:
+        return ""
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
@@ -0,0 +1,97 @@
+"""Run results: the record kept per test and how it is written out."""
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from . import config
+
+
+@dataclass
+class TestResult:
+    id: str
+    title: str
+    description: str = ""
+    category: str = ""
+    priority: str = ""
+    testStatus: str = "FAILED"
+    testError: str = ""
+    setupMs: float = 0.0
+    durationMs: float = 0.0
+    teardownMs: float = 0.0
+    created: str = ""
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def passed(self) -> bool:
+        return self.testStatus == "PASSED"
+
+    def to_json(self) -> dict:
+        data = asdict(self)
+        data.update(data.pop("extra"))
+        return data
+
+
+@dataclass
+class SuiteRun:
+    results: list[TestResult] = field(default_factory=list)
+    poolStartupMs: float = 0.0
+    wallMs: float = 0.0
+
+
+def write_results(results: list[TestResult], path: Path = config.RESULTS_PATH) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump([r.to_json() for r in results], fh, ensure_ascii=False, indent=2)
+    return path
+
+
+def read_results(path: Path = config.RESULTS_PATH) -> list[dict]:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return []
+
+
+def format_table(results: list[TestResult]) -> str:
+    """Plain-text summary with setup time shown next to flow time."""
+    rows = [("Test", "Status", "Setup ms", "Test ms", "Teardown ms")]
+    for r in results:
+        rows.append((r.id, r.testStatus, f"{r.setupMs:.0f}", f"{r.durationMs:.0f}", f"{r.teardownMs:.0f}"))
+    total_setup = sum(r.setupMs for r in results)
+    total_test = sum(r.durationMs for r in results)
+    total_teardown = sum(r.teardownMs for r in results)
+    passed = sum(r.passed for r in results)
+    rows.append((f"{passed}/{len(results)} passed", "", f"{total_setup:.0f}",
+                 f"{total_test:.0f}", f"{total_teardown:.0f}"))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    lines.insert(len(lines) - 1, lines[1])
+    return "\n".join(lines)
+
+
+def _total_ms(entry: dict) -> float:
+    return entry.get("setupMs", 0.0) + entry.get("durationMs", 0.0) + entry.get("teardownMs", 0.0)
+
+
+def format_comparison(before: list[dict], after: list[dict]) -> str:
+    """Per-test and whole-suite wall clock of two results files side by side."""
+    old = {e.get("id"): e for e in before if "durationMs" in e}
+    new = {e.get("id"): e for e in after if "durationMs" in e}
+    rows = [("Test", "Before s", "After s", "Change")]
+    for test_id in sorted(old.keys() | new.keys()):
+        a = _total_ms(old[test_id]) / 1000 if test_id in old else None
+        b = _total_ms(new[test_id]) / 1000 if test_id in new else None
+        change = f"{(b - a) / a * 100:+.0f}%" if a and b is not None else ""
+        rows.append((test_id, "-" if a is None else f"{a:.1f}", "-" if b is None else f"{b:.1f}", change))
+    shared = old.keys() & new.keys()
+    a = sum(_total_ms(old[i]) for i in shared) / 1000
+    b = sum(_total_ms(new[i]) for i in shared) / 1000
+    rows.append((f"suite ({len(shared)} tests)", f"{a:.1f}", f"{b:.1f}",
+                 f"{(b - a) / a * 100:+.0f}%" if a else ""))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    lines.insert(len(lines) - 1, lines[1])
+    return "\n".join(lines)
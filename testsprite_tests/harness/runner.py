@@ -0,0 +1,149 @@
+"""Sequential runner: one Playwright instance, one browser pool, many flows."""
+import asyncio
+import time
+import traceback
+from datetime import datetime, timezone
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from . import auth, config, fastmode, network, server, snapshot, throttle, vitals
+from .loader import TestCase, load_module
+from .pool import BrowserPool
+from .report import SuiteRun, TestResult
+from .session import TestSession
+
+
+def _describe_error(exc: BaseException) -> str:
+    if isinstance(exc, asyncio.TimeoutError):
+        return f"Test exceeded {config.TEST_TIMEOUT:.0f}s"
+    if isinstance(exc, AssertionError) and str(exc):
+        return str(exc)
+    return "".join(traceback.format_exception_only(type(exc), exc)).strip()
+
+
+async def run_case(case: TestCase, pool: BrowserPool | None, executor=None,
+                   monitor: "server.ServerMonitor | None" = None,
+                   database: "snapshot.Snapshot | None" = None) -> TestResult:
+    """Run one case: its TC script, or ``executor(case, session)`` when given.
+
+    With a ``monitor`` the server is sampled while the flow runs; with a
+    ``database`` its golden state is restored first.
+    """
+    result = TestResult(
+        id=case.id,
+        title=case.report_title,
+        description=case.description,
+        category=case.category,
+        priority=case.priority,
+        created=datetime.now(timezone.utc).isoformat(),
+    )
+    if database is not None:
+        result.extra["database"] = database.restore()
+        if result.extra["database"]["restored"] and config.BACKEND == "live":
+            result.extra["database"]["cacheCleared"] = await _clear_response_cache(pool)
+    session = TestSession(pool, name=case.id)
+    if monitor is not None:
+        await monitor.begin()
+    started = time.perf_counter()
+    try:
+        if executor is None:
+            module = load_module(case)
+            module.async_api = session.async_api
+            flow = module.run_test()
+        else:
+            flow = executor(case, session)
+        await asyncio.wait_for(flow, timeout=config.TEST_TIMEOUT)
+        result.testStatus = "PASSED"
+    except Exception as exc:
+        result.testError = _describe_error(exc)
+    finally:
+        elapsed = time.perf_counter() - started
+        if monitor is not None:
+            result.extra["server"] = await monitor.end()
+        closing = time.perf_counter()
+        await session.close()
+        result.teardownMs = (time.perf_counter() - closing) * 1000
+        result.setupMs = session.clock.setup * 1000
+        result.durationMs = (elapsed - session.clock.setup) * 1000
+        result.extra.update(session.extra)
+        result.extra["coverage"] = session.coverage.to_json()
+        if database is not None:
+            result.extra["database"]["wrote"] = database.dirty()
+    if session.har_paths:
+        result.extra["network"] = network.analyze(session.har_paths)
+    fast = session.resources.finish(case.id, result.durationMs, result.passed)
+    if fast is not None:
+        result.extra["fastMode"] = fast
+    _apply_budgets(result, session)
+    if config.PROFILE:
+        result.extra["interactions"] = session.interactions
+    if config.THROTTLE:
+        result.extra["throttle"] = config.THROTTLE
+    if monitor is not None:
+        violations = server.check_budgets(case.id, result.extra["server"]["summary"], monitor.budgets)
+        if violations:
+            result.extra["serverBudgetViolations"] = violations
+    return result
+
+
+async def _clear_response_cache(pool: BrowserPool | None) -> int:
+    """Empty the server's response cache (src/lib/cache.ts) after a restore.
+
+    Its entries were built from the previous test's writes and would
+    otherwise outlive the restored database by up to their TTL.
+    """
+    own = None if pool is not None else await async_playwright().start()
+    try:
+        request = await auth.api_request(pool.playwright if pool is not None else own, "admin")
+        try:
+            response = await request.delete(f"{config.BASE_URL}/api/admin/cache")
+            if not response.ok:
+                raise snapshot.SnapshotError(f"DELETE /api/admin/cache answered {response.status}")
+            return (await response.json())["data"]["cleared"]
+        finally:
+            await request.dispose()
+    finally:
+        if own is not None:
+            await own.stop()
+
+
+def _apply_budgets(result: TestResult, session: TestSession) -> None:
+    if config.BUDGETS == "off":
+        return
+    result.extra["pages"] = session.pages
+    violations = vitals.check_budgets(result.extra["pages"], session.budgets)
+    if not violations:
+        return
+    result.extra["budgetViolations"] = violations
+    if config.BUDGETS == "enforce" and result.passed:
+        result.testStatus = "FAILED"
+        result.testError = "Performance budget exceeded: " + "; ".join(violations)
+
+
+async def run_suite(cases: list[TestCase], pool_size: int = config.POOL_SIZE,
+                    use_pool: bool = True, on_result=None, executor=None) -> SuiteRun:
+    """Run ``cases`` one after another, sharing a warm pool unless disabled."""
+    run = SuiteRun()
+    throttle.activate(config.THROTTLE)
+    started = time.perf_counter()
+    pool = BrowserPool(size=pool_size) if use_pool else None
+    monitor = server.ServerMonitor.attach() if config.SERVER != "off" else None
+    database = snapshot.Snapshot(Path(config.DB)) if config.DB else None
+    if pool is not None:
+        await pool.start()
+        run.poolStartupMs = (time.perf_counter() - started) * 1000
+    try:
+        for case in cases:
+            result = await run_case(case, pool, executor, monitor, database)
+            run.results.append(result)
+            if on_result:
+                on_result(result)
+    finally:
+        if pool is not None:
+            await pool.close()
+        if database is not None:
+            database.close()
+        fastmode.save_baseline()
+        run.wallMs = (time.perf_counter() - started) * 1000
+    return run
@@ -0,0 +1,224 @@
+"""Recall, precision and latency of /api/doctors over a labeled Arabic query set.
+
+``python -m harness search-bench --db tmp/bench.db`` sends every query of
+``search_queries.json`` to the app running on that database (see
+``harness.dataset``) and judges the answers against the database itself.
+Each query names the parameter it is sent as (``search``, or ``city`` like
+the /doctors wilaya filter), the field it targets and the term the user
+meant. A doctor is relevant when he is listed publicly (approved, active
+account) and ``normalize(term)`` occurs in ``normalize(field)``, so
+``"احمد"`` is judged against every أحمد.
+
+The queries are grouped by ``kind``: ``exact`` spellings, ``hamza`` (أ/إ/آ
+typed as ا), ``taa-marbuta`` (ة typed as ه), ``alef-maqsura`` (ى/ي),
+``tashkeel``, ``whitespace``, ``wilaya`` (numbers, "16. الجزائر" and names
+through the city filter), ``typo`` and ``mixed``.
+
+For every query
+
+* latency: ``--repeat`` requests of the first page as the UI asks for it
+  (``limit=12``), after one warm-up request,
+* relevance: pages of 100 are read until ``pagination.total`` or
+  ``--depth`` results. Recall and precision are exact when all results were
+  read; past ``--depth`` recall is estimated from the precision of the
+  results read and the reported total.
+
+The report groups recall, precision, zero-result queries and p50/p95 by
+kind, lists the worst queries, and with ``--baseline`` shows the change
+against an earlier results file.
+"""
+import json
+import re
+import sqlite3
+import statistics
+import time
+import unicodedata
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlencode
+
+from . import config, load
+
+QUERIES_PATH = Path(__file__).resolve().parent / "search_queries.json"
+RESULTS_PATH = config.TMP_DIR / "search_results.json"
+
+PAGE_LIMIT = 12
+FETCH_LIMIT = 100
+
+# Mirrors src/lib/arabic.ts, which the app's search index is built with
+_TASHKEEL = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u0640]")
+_LETTERS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ة": "ه", "ى": "ي", "ؤ": "و", "ئ": "ي",
+                          **{chr(0x660 + d): str(d) for d in range(10)}, **{chr(0x6f0 + d): str(d) for d in range(10)}})
+
+
+def normalize(text: str) -> str:
+    """Arabic text without tashkeel and tatweel, with alef, taa marbuta and yaa variants and digits folded."""
+    text = _TASHKEEL.sub("", unicodedata.normalize("NFC", text)).translate(_LETTERS).lower()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def tokens(text: str) -> list[str]:
+    return re.findall(r"[^\W_]+", normalize(text))
+
+
+def index_text(text: str | None) -> str:
+    """A column of the doctors_fts index: the words, plus those with the article without it."""
+    if not text:
+        return ""
+    words = tokens(text)
+    return " ".join(words + [w[2:] for w in words if w.startswith("ال") and len(w) > 4])
+
+
+def load_queries(path: Path = QUERIES_PATH) -> list[dict]:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)["queries"]
+
+
+def listed_doctors(db: Path) -> list[dict]:
+    """Doctors /api/doctors can return: approved, with an active account."""
+    conn = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("""
+            SELECT d.id, d.name, d.specialty, d.city FROM doctors d JOIN users u ON u.id = d.user_id
+            WHERE d.approved = 1 AND u.status = 'ACTIVE'
+        """).fetchall()
+    finally:
+        conn.close()
+    return [{"id": i, "name": normalize(n), "specialty": normalize(s), "city": normalize(c)} for i, n, s, c in rows]
+
+
+def relevant(query: dict, doctors: list[dict]) -> set[int]:
+    term = normalize(query["term"])
+    return {d["id"] for d in doctors if term in d[query["field"]]}
+
+
+class SearchBench:
+    def __init__(self, db: Path, base_url: str = config.BASE_URL, queries: list[dict] | None = None,
+                 repeat: int = 5, depth: int = 200):
+        self.db = db
+        self.base_url = base_url
+        self.queries = queries if queries is not None else load_queries()
+        self.repeat = repeat
+        self.depth = depth
+
+    async def _get(self, conn: load.Connection, params: dict) -> tuple[float, dict]:
+        started = time.perf_counter()
+        status, data = await conn.request("GET", "/api/doctors?" + urlencode(params))
+        ms = (time.perf_counter() - started) * 1000
+        if status != 200:
+            raise load.HttpError(f"GET /api/doctors?{urlencode(params)} answered {status}")
+        return ms, json.loads(data)["data"]
+
+    async def _query(self, conn: load.Connection, query: dict, wanted: set[int]) -> dict:
+        first = {query["param"]: query["query"], "page": 1, "limit": PAGE_LIMIT}
+        await self._get(conn, first)
+        latencies = [(await self._get(conn, first))[0] for _ in range(self.repeat)]
+
+        found: list[int] = []
+        total, page = 0, 1
+        while len(found) < self.depth:
+            _, data = await self._get(conn, {query["param"]: query["query"], "page": page, "limit": FETCH_LIMIT})
+            total = data["pagination"]["total"]
+            found += [d["id"] for d in data["doctors"]]
+            if not data["doctors"] or len(found) >= total:
+                break
+            page += 1
+        hits = len(set(found) & wanted)
+        precision = hits / len(found) if found else (1.0 if not wanted else 0.0)
+        complete = len(found) >= total
+        if not wanted:
+            recall = 1.0
+        elif complete:
+            recall = hits / len(wanted)
+        else:
+            recall = min(precision * total / len(wanted), 1.0)
+        ordered = sorted(latencies)
+        return {
+            **query,
+            "relevant": len(wanted),
+            "total": total,
+            "read": len(found),
+            "recall": round(recall, 4),
+            "precision": round(precision, 4),
+            "estimated": not complete,
+            "p50Ms": load.percentile(ordered, 50),
+            "p95Ms": load.percentile(ordered, 95),
+            "latenciesMs": [round(ms, 1) for ms in latencies],
+        }
+
+    async def run(self, on_query=None) -> dict:
+        doctors = listed_doctors(self.db)
+        conn = load.Connection(self.base_url)
+        results = []
+        try:
+            for query in self.queries:
+                result = await self._query(conn, query, relevant(query, doctors))
+                results.append(result)
+                if on_query:
+                    on_query(result)
+        finally:
+            await conn.close()
+        return {
+            "meta": {"baseUrl": self.base_url, "db": str(self.db), "doctors": len(doctors),
+                     "repeat": self.repeat, "depth": self.depth, "created": datetime.now(timezone.utc).isoformat()},
+            "kinds": summarize(results),
+            "queries": results,
+        }
+
+
+def summarize(results: list[dict]) -> dict[str, dict]:
+    """Per kind (and ``all``): mean recall and precision, zero-result queries, latency percentiles."""
+    groups: dict[str, list[dict]] = {}
+    for r in results:
+        groups.setdefault(r["kind"], []).append(r)
+    groups["all"] = results
+    summary = {}
+    for kind, group in groups.items():
+        latencies = sorted(ms for r in group for ms in r["latenciesMs"])
+        summary[kind] = {
+            "queries": len(group),
+            "recall": round(statistics.fmean(r["recall"] for r in group), 4),
+            "precision": round(statistics.fmean(r["precision"] for r in group), 4),
+            "zeroResults": sum(r["total"] == 0 and r["relevant"] > 0 for r in group),
+            "p50Ms": load.percentile(latencies, 50),
+            "p95Ms": load.percentile(latencies, 95),
+        }
+    return summary
+
+
+def write_report(report: dict, path: Path = RESULTS_PATH) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=1, ensure_ascii=False)
+    return path
+
+
+def read_report(path: Path) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _table(rows: list[tuple]) -> str:
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+
+def format_report(report: dict, baseline: dict | None = None, worst: int = 15) -> str:
+    before = baseline["kinds"] if baseline else {}
+    rows = [("Kind", "Queries", "Recall", "Precision", "Zero results", "p50 ms", "p95 ms")]
+    for kind, s in report["kinds"].items():
+        b = before.get(kind)
+        recall = f"{s['recall']:.2f}" + (f" ({s['recall'] - b['recall']:+.2f})" if b else "")
+        p95 = f"{s['p95Ms']:.0f}" + (f" ({s['p95Ms'] - b['p95Ms']:+.0f})" if b else "")
+        rows.append((kind, str(s["queries"]), recall, f"{s['precision']:.2f}", str(s["zeroResults"]),
+                     f"{s['p50Ms']:.0f}", p95))
+    out = [f"{report['meta']['doctors']} listed doctors, {len(report['queries'])} queries", "", _table(rows)]
+    misses = sorted((r for r in report["queries"] if r["recall"] < 1.0), key=lambda r: r["recall"])[:worst]
+    if misses:
+        rows = [("Query", "Kind", "Sent as", "Relevant", "Returned", "Recall", "Precision")]
+        rows += [(r["query"].strip() or repr(r["query"]), r["kind"], r["param"], str(r["relevant"]), str(r["total"]),
+                  f"{r['recall']:.2f}{'~' if r['estimated'] else ''}", f"{r['precision']:.2f}") for r in misses]
+        out += ["", "Lowest recall (~ estimated):", _table(rows)]
+    return "\n".join(out)
@@ -0,0 +1,316 @@
+"""Resource profile of the Next.js server while each test runs.
+
+With ``--server attach`` the harness finds the process listening on the
+port of ``HARNESS_BASE_URL``; with ``--server launch`` it starts
+``next start`` itself (``HARNESS_SERVER_CMD``) and stops it after the run.
+During every test a ``ServerMonitor`` samples, every
+``HARNESS_SERVER_INTERVAL`` seconds,
+
+* CPU and RSS of the server and its child processes from ``/proc``,
+* open file descriptors of those processes,
+* event-loop delay (p99 and max since the previous sample), active handles,
+  sockets and V8 heap from ``server_probe.js``.
+
+The probe only exists in a server started with
+``node --require harness/server_probe.js``, which ``launch`` does. An
+attached server started without it still gets the ``/proc`` figures.
+
+The samples are stored per test under ``server`` as a columnar
+``timeline`` plus a ``summary``. The summary is checked against
+``server_budgets.json`` (a ``default`` block and per-test overrides);
+violations are listed under ``serverBudgetViolations`` and in the console
+report but do not fail the test.
+
+With ``--workers`` every worker samples the same server, so a test's
+timeline also contains the load of the tests running next to it.
+"""
+import asyncio
+import json
+import os
+import shlex
+import subprocess
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from . import config
+
+PROBE_PATH = Path(__file__).resolve().parent / "server_probe.js"
+BUDGETS_PATH = Path(__file__).resolve().parent / "server_budgets.json"
+
+PROBE_PORT = int(os.environ.get("HARNESS_PROBE_PORT", "9464"))
+
+DEFAULT_COMMAND = "node node_modules/next/dist/bin/next start -p {port}"
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+_COLUMNS = ("t", "cpuPct", "rssMb", "fds", "lagP99Ms", "lagMaxMs", "handles", "sockets", "heapUsedMb")
+
+
+class ServerNotFound(Exception):
+    pass
+
+
+def app_port() -> int:
+    parts = urlsplit(config.BASE_URL)
+    return parts.port or (443 if parts.scheme == "https" else 80)
+
+
+# ---------------------------------------------------------------------------
+# /proc
+# ---------------------------------------------------------------------------
+
+def _listening_inodes(port: int) -> set[str]:
+    inodes = set()
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table, encoding="ascii") as fh:
+                next(fh)
+                for line in fh:
+                    fields = line.split()
+                    if fields[3] == "0A" and int(fields[1].rsplit(":", 1)[1], 16) == port:
+                        inodes.add(fields[9])
+        except OSError:
+            continue
+    return inodes
+
+
+def find_listener(port: int) -> int:
+    """PID of the process listening on ``port``."""
+    targets = {f"socket:[{inode}]" for inode in _listening_inodes(port)}
+    if targets:
+        for pid in filter(str.isdigit, os.listdir("/proc")):
+            try:
+                links = {os.readlink(f"/proc/{pid}/fd/{fd}") for fd in os.listdir(f"/proc/{pid}/fd")}
+            except OSError:
+                continue
+            if links & targets:
+                return int(pid)
+    raise ServerNotFound(f"no process of this user is listening on port {port}")
+
+
+def _stat(pid: int) -> list[str]:
+    with open(f"/proc/{pid}/stat", encoding="ascii") as fh:
+        # The command name may contain spaces; fields resume after its ")"
+        return fh.read().rsplit(")", 1)[1].split()
+
+
+def process_tree(pid: int) -> list[int]:
+    """``pid`` and all of its descendants."""
+    children: dict[int, list[int]] = {}
+    for entry in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            children.setdefault(int(_stat(int(entry))[1]), []).append(int(entry))
+        except (OSError, IndexError):
+            continue
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(children.get(current, ()))
+    return tree
+
+
+def proc_sample(pids: list[int]) -> dict:
+    ticks = rss_kb = fds = 0
+    for pid in pids:
+        try:
+            fields = _stat(pid)
+            ticks += int(fields[11]) + int(fields[12])
+            with open(f"/proc/{pid}/status", encoding="ascii") as fh:
+                rss_kb += next((int(l.split()[1]) for l in fh if l.startswith("VmRSS:")), 0)
+            fds += len(os.listdir(f"/proc/{pid}/fd"))
+        except (OSError, ValueError):
+            continue  # exited between samples
+    return {"cpuSeconds": ticks / _CLK_TCK, "rssMb": round(rss_kb / 1024, 1), "fds": fds}
+
+
+async def probe(path: str = "/sample", port: int = PROBE_PORT, timeout: float = 0.5) -> dict | None:
+    """Snapshot from ``server_probe.js``, or ``None`` when it is not loaded."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    try:
+        writer.write(f"GET {path} HTTP/1.0\r\nHost: 127.0.0.1\r\n\r\n".encode())
+        raw = await asyncio.wait_for(reader.read(), timeout)
+        return json.loads(raw.split(b"\r\n\r\n", 1)[1])
+    except (OSError, ValueError, IndexError, asyncio.TimeoutError):
+        return None
+    finally:
+        writer.close()
+
+
+# ---------------------------------------------------------------------------
+# Launching
+# ---------------------------------------------------------------------------
+
+class ServerProcess:
+    """``next start`` started by the harness, with the probe preloaded.
+
+    ``--expose-gc`` lets ``harness.soak`` collect garbage before reading the
+    heap; nothing else triggers a collection.
+    """
+
+    def __init__(self, command: str | None = None):
+        self.command = command or os.environ.get("HARNESS_SERVER_CMD") or DEFAULT_COMMAND
+        self.process: subprocess.Popen | None = None
+
+    def start(self, timeout: float = 60.0) -> int:
+        port = app_port()
+        if _listening_inodes(port):
+            raise ServerNotFound(f"port {port} is already in use; use --server attach")
+        argv = shlex.split(self.command.format(port=port))
+        env = dict(os.environ, PORT=str(port), HARNESS_PROBE_PORT=str(PROBE_PORT))
+        if config.DB:
+            # The file harness.snapshot restores between tests
+            env["TURSO_DATABASE_URL"] = f"file:{Path(config.DB).resolve()}"
+            env.pop("TURSO_AUTH_TOKEN", None)
+        if Path(argv[0]).name == "node":
+            argv[1:1] = ["--expose-gc", "--require", str(PROBE_PATH)]
+        else:
+            env["NODE_OPTIONS"] = f"{env.get('NODE_OPTIONS', '')} --expose-gc --require {PROBE_PATH}".strip()
+        self.process = subprocess.Popen(argv, cwd=config.REPO_ROOT, env=env,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise ServerNotFound(f"{self.command!r} exited with status {self.process.returncode}")
+            if _listening_inodes(port):
+                return self.process.pid
+            time.sleep(0.25)
+        self.stop()
+        raise ServerNotFound(f"{self.command!r} did not listen on port {port} within {timeout:.0f}s")
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+def load_budgets(path: Path = BUDGETS_PATH) -> dict:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {"default": {}, "tests": {}}
+
+
+def check_budgets(test_id: str, summary: dict, budgets: dict) -> list[str]:
+    limits = {**budgets.get("default", {}), **budgets.get("tests", {}).get(test_id, {})}
+    return [f"server {metric} = {summary[metric]:g} > budget {limit:g}"
+            for metric, limit in limits.items()
+            if summary.get(metric) is not None and summary[metric] > limit]
+
+
+class ServerMonitor:
+    """Samples one server process tree between ``begin()`` and ``end()``."""
+
+    def __init__(self, pid: int, interval: float = config.SERVER_INTERVAL):
+        self.pid = pid
+        self.interval = interval
+        self.budgets = load_budgets()
+        self._task: asyncio.Task | None = None
+        self._samples: list[dict] = []
+
+    @classmethod
+    def attach(cls) -> "ServerMonitor":
+        return cls(find_listener(app_port()))
+
+    async def begin(self) -> None:
+        self._samples = []
+        self._pids = process_tree(self.pid)
+        await probe()  # reset the probe's delay histogram
+        self._started = time.perf_counter()
+        self._last = (self._started, proc_sample(self._pids)["cpuSeconds"])
+        self._first = self._last[1]
+        self._task = asyncio.create_task(self._loop())
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._sample()
+
+    async def _sample(self) -> None:
+        now = time.perf_counter()
+        proc = proc_sample(self._pids)
+        then, cpu = self._last
+        self._last = (now, proc["cpuSeconds"])
+        sample = {
+            "t": round((now - self._started) * 1000),
+            "cpuPct": round((proc["cpuSeconds"] - cpu) / max(now - then, 1e-6) * 100, 1),
+            "rssMb": proc["rssMb"],
+            "fds": proc["fds"],
+        }
+        inside = await probe()
+        if inside:
+            sample.update({k: inside[k] for k in _COLUMNS if k in inside})
+        self._samples.append(sample)
+
+    async def end(self) -> dict:
+        """Stop sampling; the ``server`` entry of the test result."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._sample()
+        samples = self._samples
+        summary = summarize(samples, self._last[1] - self._first)
+        return {
+            "pid": self.pid,
+            "summary": summary,
+            "timeline": {c: [s.get(c) for s in samples] for c in _COLUMNS if any(c in s for s in samples)},
+        }
+
+
+def summarize(samples: list[dict], cpu_seconds: float) -> dict:
+    def peak(key):
+        values = [s[key] for s in samples if s.get(key) is not None]
+        return max(values) if values else None
+
+    rss = [s["rssMb"] for s in samples if s.get("rssMb")]
+    return {
+        "cpuMs": round(cpu_seconds * 1000),
+        "cpuPeakPct": peak("cpuPct"),
+        "rssPeakMb": peak("rssMb"),
+        "rssGrowthMb": round(rss[-1] - rss[0], 1) if rss else None,
+        "fdsPeak": peak("fds"),
+        "loopLagP99Ms": peak("lagP99Ms"),
+        "loopLagMaxMs": peak("lagMaxMs"),
+        "handlesPeak": peak("handles"),
+        "heapPeakMb": peak("heapUsedMb"),
+    }
+
+
+def _cell(value) -> str:
+    return "-" if value is None else f"{value:g}"
+
+
+def format_summary(results: list[dict]) -> str:
+    """Per-test server figures, for the console report."""
+    rows = [("Test", "CPU ms", "Peak RSS MB", "RSS +MB", "Lag p99 ms", "Handles", "Over budget")]
+    for result in results:
+        server = result.get("server")
+        if not server:
+            continue
+        s = server["summary"]
+        over = [v.split(" = ")[0].removeprefix("server ") for v in result.get("serverBudgetViolations", [])]
+        rows.append((result["id"], _cell(s["cpuMs"]), _cell(s["rssPeakMb"]), _cell(s["rssGrowthMb"]),
+                     _cell(s["loopLagP99Ms"]), _cell(s["handlesPeak"]), ", ".join(over)))
+    if len(rows) == 1:
+        return ""
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
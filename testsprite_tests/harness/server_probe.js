@@ -0,0 +1,89 @@
+// Preloaded into the Next.js server (node --require) by harness/server.py.
+//
+// Serves a JSON snapshot of the process on 127.0.0.1:$HARNESS_PROBE_PORT:
+// event-loop delay since the previous /sample request, active handles and
+// sockets, V8 heap usage, and how many libSQL clients and PrismaClients were
+// created and are still alive. GET / reads without resetting the histogram;
+// ?gc=1 runs a full collection first when node was started with --expose-gc.
+'use strict';
+
+const http = require('http');
+const Module = require('module');
+const { monitorEventLoopDelay } = require('perf_hooks');
+
+if (!global.__harnessProbe) {
+  global.__harnessProbe = true;
+
+  // Clients are counted when the server requires the packages at runtime,
+  // which Next.js does for packages it keeps external to the bundle
+  const clients = { libsql: { created: 0, live: 0 }, prisma: { created: 0, live: 0 } };
+  const collected = new FinalizationRegistry((kind) => { clients[kind].live -= 1; });
+  const track = (kind, client) => {
+    clients[kind].created += 1;
+    clients[kind].live += 1;
+    collected.register(client, kind);
+    return client;
+  };
+  const wrappers = new WeakMap();
+  const wrap = (request, exported) => {
+    if (!exported || (request !== '@libsql/client' && request !== '@prisma/client')) return exported;
+    if (!wrappers.has(exported)) {
+      wrappers.set(exported, new Proxy(exported, {
+        get(target, name, receiver) {
+          const value = Reflect.get(target, name, receiver);
+          const own = Object.getOwnPropertyDescriptor(target, name);
+          if (own && !own.configurable && own.writable === false) return value;  // Proxy invariant
+          if (name === 'createClient' && typeof value === 'function') {
+            return (...args) => track('libsql', value(...args));
+          }
+          if (name === 'PrismaClient' && typeof value === 'function') {
+            return new Proxy(value, {
+              construct: (cls, args, newTarget) => track('prisma', Reflect.construct(cls, args, newTarget)),
+            });
+          }
+          return value;
+        },
+      }));
+    }
+    return wrappers.get(exported);
+  };
+  const load = Module._load;
+  Module._load = function (request, ...rest) {
+    return wrap(request, load.call(this, request, ...rest));
+  };
+
+  const port = Number(process.env.HARNESS_PROBE_PORT || 9464);
+  const delay = monitorEventLoopDelay({ resolution: 10 });
+  delay.enable();
+  const mb = (bytes) => Math.round((bytes / 1048576) * 10) / 10;
+  const ms = (ns) => (Number.isFinite(ns) ? Math.round(ns / 1e4) / 100 : 0);
+
+  const server = http.createServer((req, res) => {
+    const url = new URL(req.url, 'http://probe');
+    if (url.searchParams.get('gc') && typeof global.gc === 'function') global.gc();
+    const handles = process._getActiveHandles().filter((h) => h !== server && h !== req.socket);
+    const memory = process.memoryUsage();
+    const body = {
+      pid: process.pid,
+      lagMeanMs: ms(delay.mean),
+      lagP99Ms: ms(delay.percentile(99)),
+      lagMaxMs: ms(delay.max),
+      handles: handles.length,
+      sockets: handles.filter((h) => h.constructor && h.constructor.name === 'Socket').length,
+      requests: process._getActiveRequests().length,
+      heapUsedMb: mb(memory.heapUsed),
+      heapTotalMb: mb(memory.heapTotal),
+      externalMb: mb(memory.external),
+      libsqlClients: clients.libsql.live,
+      libsqlClientsCreated: clients.libsql.created,
+      prismaClients: clients.prisma.live,
+      prismaClientsCreated: clients.prisma.created,
+    };
+    if (url.pathname === '/sample') delay.reset();
+    res.setHeader('content-type', 'application/json');
+    res.end(JSON.stringify(body));
+  });
+  server.on('error', (err) => console.error(`[harness probe] ${err.message}`));
+  server.listen(port, '127.0.0.1');
+  server.unref();
+}
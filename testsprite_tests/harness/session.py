@@ -0,0 +1,248 @@
+"""Stand-ins for ``playwright.async_api`` handed to a loaded TC script.
+
+The generated flows call ``async_api.async_playwright().start()``, launch a
+browser, open a context and tear all of it down again. ``TestSession``
+swaps the ``async_api`` global of the loaded module for a shim whose
+``launch()`` returns a browser leased from the pool and whose ``close()`` /
+``stop()`` only close what the test itself opened. Time spent in those calls
+is booked as setup time so the report can show it next to the flow time.
+
+Contexts are handed to the script wrapped in ``_TrackedContext`` so the
+per-page metrics collected by ``harness.vitals`` and ``harness.profiler``
+can be flushed before the script closes them, and so pages it opens get the
+``harness.throttle`` profile before their first navigation. Every context
+also passes through the session's ``fastmode.ResourceGate``.
+"""
+import time
+
+from playwright import async_api as _real_async_api
+
+from . import config, fastmode, impact, network, profiler, stubs, throttle, vitals, waits
+from .pool import BrowserPool
+
+
+class _Clock:
+    def __init__(self):
+        self.setup = 0.0
+
+    def timed(self, coro):
+        async def run():
+            started = time.perf_counter()
+            try:
+                return await coro
+            finally:
+                self.setup += time.perf_counter() - started
+        return run()
+
+
+class _LeasedBrowser:
+    """Wraps a pooled browser so the script cannot close it."""
+
+    def __init__(self, session: "TestSession", browser):
+        self._session = session
+        self._browser = browser
+        self._contexts = []
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+    @property
+    def contexts(self):
+        return list(self._contexts)
+
+    async def new_context(self, **kwargs):
+        context = await self._session.clock.timed(self._session.new_context(self._browser, **kwargs))
+        self._contexts.append(context)
+        return context
+
+    async def new_page(self, **kwargs):
+        context = await self.new_context(**kwargs)
+        return await context.new_page()
+
+    async def close(self, **kwargs):
+        for context in self._contexts:
+            await context.close()
+        self._contexts.clear()
+
+
+class _TrackedContext:
+    """A context whose ``close()`` first collects the page metrics."""
+
+    def __init__(self, context, collectors: list, throttler: "throttle.Throttle | None" = None):
+        self._context = context
+        self._collectors = collectors
+        self._throttler = throttler
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+    async def new_page(self, **kwargs):
+        page = await self._context.new_page(**kwargs)
+        if self._throttler is not None:
+            await self._throttler.apply(self._context, page)
+        return page
+
+    def set_default_timeout(self, timeout: float) -> None:
+        self._context.set_default_timeout(timeout * waits.TIMEOUT_SCALE)
+
+    def set_default_navigation_timeout(self, timeout: float) -> None:
+        self._context.set_default_navigation_timeout(timeout * waits.TIMEOUT_SCALE)
+
+    async def close(self, **kwargs):
+        if self._closed:
+            return
+        self._closed = True
+        for collector in self._collectors:
+            await collector.flush(self._context)
+        await self._context.close(**kwargs)
+
+
+class _BrowserType:
+    def __init__(self, session: "TestSession", real):
+        self._session = session
+        self._real = real
+
+    def __getattr__(self, name):
+        return getattr(self._real, name)
+
+    async def launch(self, **kwargs):
+        return await self._session.clock.timed(self._session.launch(**kwargs))
+
+
+class _Playwright:
+    def __init__(self, session: "TestSession", real):
+        self._real = real
+        self.chromium = _BrowserType(session, real.chromium)
+
+    def __getattr__(self, name):
+        return getattr(self._real, name)
+
+    async def stop(self):
+        pass
+
+
+class _ContextManager:
+    def __init__(self, session: "TestSession"):
+        self._session = session
+
+    async def start(self):
+        return await self._session.clock.timed(self._session.start())
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+class _AsyncApiShim:
+    def __init__(self, session: "TestSession"):
+        self._session = session
+
+    def __getattr__(self, name):
+        return getattr(_real_async_api, name)
+
+    def async_playwright(self):
+        return _ContextManager(self._session)
+
+
+class TestSession:
+    """One TC run: either leases from a pool or starts its own browser."""
+
+    def __init__(self, pool: BrowserPool | None = None, name: str = "session"):
+        self.pool = pool
+        self.name = name
+        self.clock = _Clock()
+        self._lease = None
+        self._own_pw = None
+        self._own_browsers = []
+        self._wrapped = []
+        self._collectors = []
+        self._profilers = []
+        self.har_paths = []
+        # Merged into the test result; executors record their own details here
+        self.extra = {}
+        self.budgets = vitals.load_budgets() if config.BUDGETS != "off" else {}
+        self.resources = fastmode.ResourceGate(fastmode.enabled_for(name), learn=config.FAST_BASELINE)
+        self.coverage = impact.CoverageRecorder()
+
+    @property
+    def async_api(self):
+        return _AsyncApiShim(self)
+
+    async def start(self):
+        if self.pool is not None:
+            return _Playwright(self, self.pool.playwright)
+        if self._own_pw is None:
+            self._own_pw = await _real_async_api.async_playwright().start()
+        return _Playwright(self, self._own_pw)
+
+    async def launch(self, **kwargs):
+        if self.pool is not None:
+            if self._lease is None:
+                self._lease = self.pool.lease()
+                self._browser = await self._lease.__aenter__()
+            browser = self._browser
+        else:
+            browser = await self._own_pw.chromium.launch(**kwargs)
+            self._own_browsers.append(browser)
+        wrapped = _LeasedBrowser(self, browser)
+        self._wrapped.append(wrapped)
+        return wrapped
+
+    async def new_context(self, browser, **kwargs):
+        if config.HAR and "record_har_path" not in kwargs:
+            kwargs.update(network.context_options(self.name, len(self.har_paths)))
+            self.har_paths.append(network.har_path(self.name, len(self.har_paths)))
+        context = await browser.new_context(**kwargs)
+        waits.track(context)
+        self.coverage.install(context)
+        if config.BACKEND == "stub":
+            await stubs.install(context)
+        elif config.RECORD:
+            await stubs.record(context)
+        # Registered after the stubs so it sees requests first and falls back for /api
+        await self.resources.install(context)
+        collectors = []
+        if config.BUDGETS != "off":
+            collector = vitals.VitalsCollector(self.budgets)
+            await collector.install(context)
+            self._collectors.append(collector)
+            collectors.append(collector)
+        if config.PROFILE:
+            page_profiler = profiler.PageProfiler()
+            await page_profiler.install(context)
+            self._profilers.append(page_profiler)
+            collectors.append(page_profiler)
+        throttler = None
+        if config.THROTTLE:
+            throttler = throttle.Throttle(config.THROTTLE)
+            await throttler.install(context)
+        return _TrackedContext(context, collectors, throttler)
+
+    @property
+    def pages(self) -> list[dict]:
+        """Per-page metrics of every context the flow opened, in load order."""
+        return [visit for collector in self._collectors for visit in collector.visits]
+
+    @property
+    def interactions(self) -> list[dict]:
+        """Per-action profile of the heavy client pages (``harness.profiler``)."""
+        return [i for page_profiler in self._profilers for i in page_profiler.interactions]
+
+    async def close(self) -> None:
+        """Release everything the flow opened, even if it crashed midway."""
+        for wrapped in self._wrapped:
+            await wrapped.close()
+        self._wrapped.clear()
+        if self._lease is not None:
+            await self._lease.__aexit__(None, None, None)
+            self._lease = None
+        for browser in self._own_browsers:
+            if browser.is_connected():
+                await browser.close()
+        self._own_browsers.clear()
+        if self._own_pw is not None:
+            await self._own_pw.stop()
+            self._own_pw = None
@@ -0,0 +1,94 @@
+"""Golden snapshot of the app's SQLite database, restored before every test.
+
+Point the app at a local file (``TURSO_DATABASE_URL=file:<path>``, which
+``--server launch`` sets from ``HARNESS_DB``) and run with ``--db <path>``.
+The first run copies the file to ``<path>.golden`` through the SQLite
+backup API; ``python -m harness snapshot --refresh`` retakes it after a
+reseed or a migration.
+
+Before each test the golden copy is written back over the live file with
+the backup API as well. Unlike replacing the file, this goes through
+SQLite's locking, so the server's open libSQL connection sees the restored
+pages on its next query instead of keeping the old inode. A
+restore is skipped when ``PRAGMA data_version`` shows that no other
+connection wrote to the file since the previous one, so read-only tests
+cost nothing. Each result gets a ``database`` entry with the restore time
+and whether the test itself wrote to the database.
+
+The server's in-process response cache (src/lib/cache.ts) still holds
+lists built before a restore, so the runner empties it through
+``DELETE /api/admin/cache`` after every restore that wrote pages back.
+
+Restoring under a running test would break it, so ``--db`` only works with
+a single worker.
+"""
+import sqlite3
+import time
+from pathlib import Path
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def golden_path(path: Path) -> Path:
+    return path.with_name(path.name + ".golden")
+
+
+def take(path: Path, golden: Path | None = None) -> Path:
+    """Copy the live database at ``path`` to its golden file."""
+    path, golden = Path(path), Path(golden or golden_path(path))
+    if not path.exists():
+        raise SnapshotError(f"{path} does not exist; create it with prisma/seed.ts or `harness dataset`")
+    tmp = golden.with_name(golden.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    source = sqlite3.connect(path, timeout=30)
+    target = sqlite3.connect(tmp)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    tmp.replace(golden)
+    return golden
+
+
+class Snapshot:
+    """Restores ``path`` from its golden copy; one instance per run."""
+
+    def __init__(self, path: Path, golden: Path | None = None):
+        self.path = Path(path)
+        self.golden = Path(golden or golden_path(self.path))
+        self._live: sqlite3.Connection | None = None
+        self._image: sqlite3.Connection | None = None
+        self._version: int | None = None
+
+    def open(self) -> None:
+        if not self.golden.exists():
+            take(self.path, self.golden)
+        self._image = sqlite3.connect(f"file:{self.golden}?mode=ro", uri=True)
+        self._live = sqlite3.connect(self.path, timeout=30)
+
+    def close(self) -> None:
+        for conn in (self._live, self._image):
+            if conn is not None:
+                conn.close()
+        self._live = self._image = None
+
+    def _data_version(self) -> int:
+        return self._live.execute("PRAGMA data_version").fetchone()[0]
+
+    def dirty(self) -> bool:
+        """Whether another connection wrote to the database since the last restore."""
+        return self._version is None or self._data_version() != self._version
+
+    def restore(self) -> dict:
+        """Put the golden state back if needed; the ``database`` entry of a result."""
+        if self._live is None:
+            self.open()
+        if not self.dirty():
+            return {"restored": False, "restoreMs": 0.0}
+        started = time.perf_counter()
+        self._image.backup(self._live)
+        self._version = self._data_version()
+        return {"restored": True, "restoreMs": round((time.perf_counter() - started) * 1000, 1)}
@@ -0,0 +1,166 @@
+"""Soak test: hours of mixed traffic while watching the server for leaks.
+
+``python -m harness soak`` runs the ``soak`` mix of ``harness.load``
+(search, doctor detail, reviews, small booking bursts, a signed-in doctor's
+dashboard and an admin's panels) against the app for ``--hours``. Every
+``--interval`` seconds it samples the server process tree (see
+``harness.server``):
+
+* ``rssMb`` and ``fds`` from ``/proc``,
+* ``heapUsedMb``, ``sockets``, ``handles``, ``libsqlClients`` and
+  ``prismaClients`` (live instances) from ``server_probe.js``, after a full
+  GC when the server was started with ``--expose-gc``.
+
+Samples are appended to the results file as they are taken, so an
+interrupted run still leaves its data. At the end a least-squares slope per
+hour is fitted to every metric, ignoring the ``--warmup`` minutes in which
+caches fill up. A metric whose slope exceeds its limit (``SLOPE_LIMITS``,
+overridable with ``--max-slope metric=value``) fails the run.
+
+Use ``--server launch`` against a production build (``npm run build``): the
+probe then sees the clients and the heap after GC. Attaching to a server
+started without the probe only yields ``rssMb`` and ``fds``.
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import config, load, server
+
+RESULTS_PATH = config.TMP_DIR / "soak_results.json"
+
+# Largest acceptable growth per hour after warmup
+SLOPE_LIMITS = {
+    "rssMb": 30.0,
+    "heapUsedMb": 10.0,
+    "fds": 10.0,
+    "sockets": 5.0,
+    "handles": 10.0,
+    "libsqlClients": 0.5,
+    "prismaClients": 0.5,
+}
+
+# Fewer post-warmup samples than this give no verdict for a metric
+MIN_SAMPLES = 10
+
+_PROBED = ("heapUsedMb", "sockets", "handles", "libsqlClients", "prismaClients",
+           "libsqlClientsCreated", "prismaClientsCreated")
+
+
+def slope_per_hour(points: list[tuple[float, float]]) -> float:
+    """Least-squares slope of ``(seconds, value)`` points, per hour."""
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var = sum((t - mean_t) ** 2 for t, _ in points)
+    if not var:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / var * 3600
+
+
+def trends(samples: list[dict], warmup_s: float, limits: dict[str, float]) -> dict[str, dict]:
+    """Start, end, range and slope per metric, with the verdict against ``limits``."""
+    steady = [s for s in samples if s["t"] >= warmup_s]
+    found = {}
+    for metric, limit in limits.items():
+        points = [(s["t"], s[metric]) for s in steady if s.get(metric) is not None]
+        if not points:
+            continue
+        values = [v for _, v in points]
+        slope = slope_per_hour(points) if len(points) >= MIN_SAMPLES else None
+        found[metric] = {
+            "start": values[0],
+            "end": values[-1],
+            "min": min(values),
+            "max": max(values),
+            "samples": len(points),
+            "slopePerHour": None if slope is None else round(slope, 3),
+            "limit": limit,
+            "exceeded": slope is not None and slope > limit,
+        }
+    return found
+
+
+class SoakTest:
+    def __init__(self, pid: int, base_url: str = config.BASE_URL, hours: float = 4.0, users: int = 10,
+                 interval: float = 30.0, warmup: float = 10.0, limits: dict[str, float] | None = None,
+                 seed: int = 1, output: Path = RESULTS_PATH):
+        self.pid = pid
+        self.hours = hours
+        self.interval = interval
+        self.warmup_s = warmup * 60
+        self.limits = {**SLOPE_LIMITS, **(limits or {})}
+        self.output = output
+        self.load = load.LoadTest(base_url, mix="soak", users=users, burst=2, seed=seed,
+                                  duration=max(hours * 3600 - self.warmup_s, 0.0), warmup=self.warmup_s)
+        self.samples: list[dict] = []
+        self.meta = {
+            "baseUrl": base_url, "hours": hours, "users": users, "intervalS": interval,
+            "warmupMin": warmup, "seed": seed, "pid": pid,
+            "created": datetime.now(timezone.utc).isoformat(),
+        }
+
+    async def _sample(self, started: float) -> dict:
+        sample = {"t": round(time.perf_counter() - started, 1)}
+        proc = server.proc_sample(server.process_tree(self.pid))
+        sample.update(rssMb=proc["rssMb"], fds=proc["fds"])
+        inside = await server.probe("/?gc=1")
+        if inside:
+            sample.update({k: inside[k] for k in _PROBED if k in inside})
+        return sample
+
+    async def _sampler(self, started: float, on_sample) -> None:
+        while True:
+            sample = await self._sample(started)
+            self.samples.append(sample)
+            self._write()
+            if on_sample:
+                on_sample(sample)
+            await asyncio.sleep(self.interval)
+
+    def _write(self, extra: dict | None = None) -> None:
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.output.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"meta": self.meta, **(extra or {}), "samples": self.samples}, fh, ensure_ascii=False)
+        os.replace(tmp, self.output)
+
+    async def run(self, on_sample=None) -> dict:
+        # Fail fast on bad credentials instead of hours into the run
+        await self.load.discover()
+        for role in ("doctor", "admin"):
+            await self.load.login(role)
+        started = time.perf_counter()
+        sampler = asyncio.ensure_future(self._sampler(started, on_sample))
+        try:
+            traffic = await self.load.run()
+        finally:
+            sampler.cancel()
+            try:
+                await sampler
+            except asyncio.CancelledError:
+                pass
+        self.samples.append(await self._sample(started))
+        report = {"trends": trends(self.samples, self.warmup_s, self.limits), "load": traffic}
+        report["passed"] = not any(t["exceeded"] for t in report["trends"].values())
+        self._write(report)
+        return {"meta": self.meta, **report, "samples": self.samples}
+
+
+def format_report(report: dict) -> str:
+    rows = [("Metric", "Start", "End", "Min", "Max", "Slope/h", "Limit/h", "")]
+    for metric, t in report["trends"].items():
+        slope = "-" if t["slopePerHour"] is None else f"{t['slopePerHour']:+.2f}"
+        rows.append((metric, f"{t['start']:g}", f"{t['end']:g}", f"{t['min']:g}", f"{t['max']:g}",
+                     slope, f"{t['limit']:g}", "LEAK?" if t["exceeded"] else ""))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    last = report["samples"][-1] if report["samples"] else {}
+    if "libsqlClientsCreated" in last:
+        lines.append(f"\nClients created over the run: libSQL {last['libsqlClientsCreated']}, "
+                     f"Prisma {last.get('prismaClientsCreated', 0)}")
+    return "\n".join(lines)
@@ -0,0 +1,795 @@
+"""Offline stand-in for the app's /api routes.
+
+With ``--backend stub`` (or ``HARNESS_BACKEND=stub``) every browser context
+gets a Playwright route on ``/api/**`` that answers from an in-memory dataset
+instead of the Next.js handlers, so UI flows no longer depend on a reachable
+Turso/Supabase database. Only the pages themselves still come from the local
+``next start`` server.
+
+Answers come from, in order:
+
+1. a recording made against the real backend (``--record``), matched on
+   method, path and query string;
+2. handlers below that mimic the real routes (filters, pagination, status
+   changes) over a dataset generated from a fixed seed.
+
+Each context starts from a fresh copy of the dataset, so mutating flows do
+not leak into each other. NextAuth's endpoints are stubbed as well; a
+context is signed in with :func:`sign_in` or through the login form using
+the credentials in ``auth.ROLES``.
+"""
+import base64
+import binascii
+import copy
+import json
+import random
+import re
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlsplit
+
+from . import catalog, config, search
+
+RECORDING_PATH = config.TMP_DIR / "api_recording.json"
+SEED = 20260221
+
+_handlers = []
+
+
+def route(method: str, pattern: str):
+    regex = re.compile("^" + re.sub(r"\[(\w+)\]", r"(?P<\1>[^/]+)", pattern) + "$")
+
+    def register(func):
+        _handlers.append((method, regex, func))
+        return func
+    return register
+
+
+def _iso(value: datetime) -> str:
+    return value.astimezone(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _today() -> datetime:
+    return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# ---------------------------------------------------------------------------
+# Dataset
+# ---------------------------------------------------------------------------
+
+_FIRST = ["أحمد", "محمد", "فاطمة", "يوسف", "خديجة", "عبد القادر", "أمينة", "كريم", "سارة", "رضا", "نسيمة", "إلياس"]
+_LAST = ["بن علي", "بوزيد", "حداد", "مرابط", "بلقاسم", "زروقي", "شريف", "بن عمر", "قاسمي", "عيساوي"]
+_HOURS = {
+    "sunday": {"start": "08:00", "end": "16:00"},
+    "monday": {"start": "08:00", "end": "16:00"},
+    "tuesday": {"start": "08:00", "end": "16:00"},
+    "wednesday": {"start": "08:00", "end": "16:00"},
+    "thursday": {"start": "08:00", "end": "12:00"},
+    "friday": None,
+    "saturday": None,
+}
+
+
+def generate(seed: int = SEED, doctors: int = 40) -> dict:
+    """Build a small, consistent dataset shaped like the Prisma models."""
+    rng = random.Random(seed)
+    today = _today()
+    created = today - timedelta(days=90)
+    wilayas, specialties = catalog.wilayas(), catalog.specialties()
+
+    plans = [
+        {"id": 1, "name": "Basic", "nameAr": "أساسي", "description": "Perfect for starting doctors",
+         "descriptionAr": "مثالي للأطباء المبتدئين", "price": 2000, "maxAppointments": 50,
+         "maxStorageMb": 100, "priority": 1, "active": True},
+        {"id": 2, "name": "Professional", "nameAr": "احترافي", "description": "For growing medical practices",
+         "descriptionAr": "للعيادات المتنامية", "price": 5000, "maxAppointments": 200,
+         "maxStorageMb": 500, "priority": 2, "active": True},
+        {"id": 3, "name": "Enterprise", "nameAr": "مؤسسي", "description": "Unlimited access for large clinics",
+         "descriptionAr": "وصول غير محدود للعيادات الكبيرة", "price": 10000, "maxAppointments": 1000,
+         "maxStorageMb": 2000, "priority": 3, "active": True},
+    ]
+    for plan in plans:
+        plan["createdAt"] = plan["updatedAt"] = _iso(created)
+
+    users = [{"id": 1, "email": "admin@docteur.dz", "role": "ADMIN", "status": "ACTIVE", "createdAt": _iso(created)}]
+    data = {"users": users, "doctors": [], "patients": [], "appointments": [], "reviews": [],
+            "plans": plans, "subscriptions": []}
+
+    for i in range(doctors):
+        doctor_id, user_id = i + 1, i + 2
+        pending = i >= doctors - 4  # the last few are applications awaiting approval
+        if i == 0:
+            # Mirrors the demo doctor from prisma/seed.ts
+            email, name, specialty, city = "doctor@example.com", "د. أحمد بن علي", "طب عام", "16. الجزائر"
+        else:
+            email = f"doctor{doctor_id}@example.com"
+            name = f"د. {rng.choice(_FIRST)} {rng.choice(_LAST)}"
+            specialty, city = rng.choice(specialties), rng.choice(wilayas)
+            if i < 5:
+                # Keep the cities searched by TC002/TC005 populated
+                city = ("16. الجزائر", "31. وهران")[i % 2]
+        joined = created + timedelta(days=i)
+        users.append({"id": user_id, "email": email, "role": "DOCTOR",
+                      "status": "PENDING" if pending else "ACTIVE", "createdAt": _iso(joined)})
+        low = rng.choice([1000, 1500, 2000, 2500])
+        data["doctors"].append({
+            "id": doctor_id, "userId": user_id, "name": name, "specialty": specialty, "city": city,
+            "clinicAddress": f"شارع {rng.randint(1, 120)} نوفمبر، رقم {rng.randint(1, 99)}",
+            "workingHours": json.dumps(_HOURS), "priceRange": f"{low}-{low * 2} دج",
+            "profileImage": None, "phone": f"055{rng.randint(1000000, 9999999)}",
+            "bio": f"طبيب {specialty} ذو خبرة {rng.randint(3, 25)} سنة",
+            "approved": not pending, "createdAt": _iso(joined), "updatedAt": _iso(joined),
+        })
+        if not pending:
+            start = today - timedelta(days=rng.randint(1, 20))
+            data["subscriptions"].append({
+                "id": len(data["subscriptions"]) + 1, "doctorId": doctor_id, "planId": rng.choice(plans)["id"],
+                "status": "ACTIVE", "startDate": _iso(start), "endDate": _iso(start + timedelta(days=30)),
+                "createdAt": _iso(start), "updatedAt": _iso(start),
+            })
+            for _ in range(rng.randint(0, 6)):
+                data["reviews"].append({
+                    "id": len(data["reviews"]) + 1, "doctorId": doctor_id,
+                    "patientName": f"{rng.choice(_FIRST)} {rng.choice(_LAST)}",
+                    "rating": rng.randint(3, 5), "comment": "طبيب ممتاز", "createdAt": _iso(joined),
+                })
+    pending_doctor = data["doctors"][-1]["id"]
+    data["subscriptions"].append({
+        "id": len(data["subscriptions"]) + 1, "doctorId": pending_doctor, "planId": 1, "status": "PENDING",
+        "startDate": None, "endDate": None, "createdAt": _iso(today), "updatedAt": _iso(today),
+    })
+
+    # Appointments of the demo doctor: past completed ones and upcoming ones
+    statuses = ["PENDING", "CONFIRMED", "PENDING", "CONFIRMED", "COMPLETED", "CANCELLED"]
+    for i in range(12):
+        patient = {"id": i + 1, "name": f"{rng.choice(_FIRST)} {rng.choice(_LAST)}",
+                   "phone": f"066{rng.randint(1000000, 9999999)}", "email": None, "notes": None,
+                   "createdAt": _iso(created), "updatedAt": _iso(created)}
+        data["patients"].append(patient)
+        day = today + timedelta(days=i - 4)
+        status = "COMPLETED" if i < 4 else statuses[i % len(statuses)]
+        data["appointments"].append({
+            "id": i + 1, "doctorId": 1, "patientId": patient["id"], "date": _iso(day),
+            "time": f"{9 + i % 6:02d}:{'30' if i % 2 else '00'}", "status": status, "notes": None,
+            "actualPrice": 2000.0 if status == "COMPLETED" else None,
+            "createdAt": _iso(day - timedelta(days=3)), "updatedAt": _iso(day),
+        })
+    return data
+
+
+_base: dict | None = None
+
+
+def dataset() -> dict:
+    """A fresh copy of the process-wide dataset."""
+    global _base
+    if _base is None:
+        _base = generate()
+    return copy.deepcopy(_base)
+
+
+# ---------------------------------------------------------------------------
+# Request plumbing
+# ---------------------------------------------------------------------------
+
+class StubState:
+    def __init__(self):
+        self.data = dataset()
+        self.role: str | None = None
+
+    def user(self, user_id):
+        return next((u for u in self.data["users"] if u["id"] == user_id), None)
+
+    def doctor(self, doctor_id):
+        return next((d for d in self.data["doctors"] if d["id"] == doctor_id), None)
+
+    def session(self) -> dict:
+        from .auth import ROLES
+
+        if self.role is None:
+            return {}
+        email = ROLES[self.role].email
+        user = next((u for u in self.data["users"] if u["email"] == email), None)
+        if user is None:
+            return {}
+        doctor = next((d for d in self.data["doctors"] if d["userId"] == user["id"]), None)
+        return {
+            "user": {
+                "email": email, "id": str(user["id"]), "role": user["role"],
+                "doctorId": doctor["id"] if doctor else None,
+                "doctorName": doctor["name"] if doctor else None,
+                "approved": doctor["approved"] if doctor else False,
+            },
+            "expires": _iso(datetime.now(timezone.utc) + timedelta(days=60)),
+        }
+
+
+_states: dict[int, StubState] = {}
+
+
+def _state(context) -> StubState:
+    key = id(context)
+    if key not in _states:
+        _states[key] = StubState()
+        context.on("close", lambda _: _states.pop(key, None))
+    return _states[key]
+
+
+def sign_in(context, role: str | None) -> None:
+    """Make the stubbed /api/auth/session report ``role`` for ``context``."""
+    _state(context).role = role
+
+
+def _key(method: str, url: str) -> str:
+    parts = urlsplit(url)
+    query = "&".join(sorted(parts.query.split("&"))) if parts.query else ""
+    return f"{method} {parts.path}" + (f"?{query}" if query else "")
+
+
+def _load_recording() -> dict:
+    try:
+        with open(RECORDING_PATH, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+_recording: dict | None = None
+
+
+def _ok(data=None, status=200, **extra):
+    body = {"success": True}
+    if data is not None:
+        body["data"] = data
+    body.update(extra)
+    return status, body
+
+
+def _error(message: str, status: int):
+    return status, {"success": False, "error": message}
+
+
+class _BadCursor(Exception):
+    """A cursor the real route refuses with 400."""
+
+
+def _encode_cursor(query: dict, offset: int) -> str:
+    # The format of src/lib/pagination.ts with an offset position; the stub
+    # ties cursors to the sort parameter instead of the Prisma orderBy
+    data = json.dumps({"s": f"stub:{query.get('sort') or ''}", "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).rstrip(b"=").decode()
+
+
+def _decode_cursor(query: dict, cursor: str) -> int:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error):
+        raise _BadCursor(cursor) from None
+    if not isinstance(data, dict) or data.get("s") != f"stub:{query.get('sort') or ''}":
+        raise _BadCursor(cursor)
+    offset = data.get("o")
+    if type(offset) is not int or offset < 0:
+        raise _BadCursor(cursor)
+    return offset
+
+
+def _paginate(items: list, query: dict, default_limit: int):
+    # Same response shape and cursor format as src/lib/pagination.ts; the
+    # stub's cursors always hold offsets
+    limit = int(query.get("limit") or default_limit)
+    if query.get("cursor"):
+        start = _decode_cursor(query, query["cursor"])
+        pagination = {"limit": limit}
+        if query.get("count") == "true":
+            pagination["total"] = len(items)
+    else:
+        page = int(query.get("page") or 1)
+        start = (page - 1) * limit
+        pagination = {"page": page, "limit": limit}
+        if query.get("count") != "false":
+            pagination |= {"total": len(items), "totalPages": -(-len(items) // limit)}
+    has_more = len(items) > start + limit
+    pagination |= {"nextCursor": _encode_cursor(query, start + limit) if has_more else None, "hasMore": has_more}
+    return items[start:start + limit], pagination
+
+
+async def _handle(route_, request, state: StubState) -> None:
+    global _recording
+    if _recording is None:
+        _recording = _load_recording()
+
+    recorded = _recording.get(_key(request.method, request.url))
+    if recorded is not None and not urlsplit(request.url).path.startswith("/api/auth/"):
+        await route_.fulfill(status=recorded["status"], json=recorded["body"])
+        return
+
+    path = urlsplit(request.url).path.rstrip("/")
+    query = dict(parse_qsl(urlsplit(request.url).query))
+    body = {}
+    if request.post_data:
+        try:
+            body = request.post_data_json or {}
+        except ValueError:
+            body = dict(parse_qsl(request.post_data))
+    for method, regex, handler in _handlers:
+        match = regex.match(path)
+        if match and method == request.method:
+            try:
+                status, payload = handler(state, query=query, body=body, **match.groupdict())
+            except _BadCursor:
+                status, payload = _error("مؤشر الصفحة غير صالح", 400)
+            await route_.fulfill(status=status, json=payload)
+            return
+    await route_.fulfill(status=501, json={"success": False, "error": f"No stub for {request.method} {path}"})
+
+
+async def install(context) -> None:
+    """Serve ``/api/**`` for ``context`` from the stub backend."""
+    state = _state(context)
+    await context.route(f"{config.BASE_URL}/api/**", lambda route_, request: _handle(route_, request, state))
+
+
+async def record(context) -> None:
+    """Append live /api responses of ``context`` to the recording file."""
+    async def save(response):
+        request = response.request
+        if "/api/" not in request.url or "/api/auth/" in request.url or request.resource_type not in ("fetch", "xhr"):
+            return
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+        recording = _load_recording()
+        recording[_key(request.method, request.url)] = {"status": response.status, "body": payload}
+        RECORDING_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(RECORDING_PATH, "w", encoding="utf-8") as fh:
+            json.dump(recording, fh, ensure_ascii=False, indent=1)
+
+    context.on("response", save)
+
+
+# ---------------------------------------------------------------------------
+# NextAuth
+# ---------------------------------------------------------------------------
+
+@route("GET", "/api/auth/session")
+def _auth_session(state, **_):
+    return 200, state.session()
+
+
+@route("GET", "/api/auth/csrf")
+def _auth_csrf(state, **_):
+    return 200, {"csrfToken": "stub-csrf-token"}
+
+
+@route("GET", "/api/auth/providers")
+def _auth_providers(state, **_):
+    return 200, {"credentials": {
+        "id": "credentials", "name": "Credentials", "type": "credentials",
+        "signinUrl": f"{config.BASE_URL}/api/auth/signin/credentials",
+        "callbackUrl": f"{config.BASE_URL}/api/auth/callback/credentials",
+    }}
+
+
+@route("POST", "/api/auth/callback/credentials")
+def _auth_callback(state, body, **_):
+    from .auth import ROLES
+
+    for name, role in ROLES.items():
+        if body.get("email") == role.email and body.get("password") == role.password:
+            state.role = name
+            return 200, {"url": config.BASE_URL + role.home}
+    return 401, {"url": f"{config.BASE_URL}/api/auth/error?error=CredentialsSignin"}
+
+
+@route("POST", "/api/auth/signout")
+def _auth_signout(state, **_):
+    state.role = None
+    return 200, {"url": config.BASE_URL}
+
+
+@route("POST", "/api/auth/_log")
+def _auth_log(state, **_):
+    return 200, {}
+
+
+# ---------------------------------------------------------------------------
+# Public catalog
+# ---------------------------------------------------------------------------
+
+def _rating(state, doctor_id):
+    ratings = [r["rating"] for r in state.data["reviews"] if r["doctorId"] == doctor_id]
+    return (round(sum(ratings) / len(ratings), 1) if ratings else 0), len(ratings)
+
+
+def _rating_histogram(state, doctor_id):
+    ratings = [r["rating"] for r in state.data["reviews"] if r["doctorId"] == doctor_id]
+    return {str(star): ratings.count(star) for star in range(1, 6)}
+
+
+def _active_subscription(state, doctor_id):
+    subs = [s for s in state.data["subscriptions"] if s["doctorId"] == doctor_id and s["status"] == "ACTIVE"]
+    return max(subs, key=lambda s: s["createdAt"]) if subs else None
+
+
+@route("GET", "/api/doctors")
+def _doctors(state, query, **_):
+    doctors = [d for d in state.data["doctors"]
+               if d["approved"] and state.user(d["userId"])["status"] == "ACTIVE"]
+    if query.get("specialty"):
+        doctors = [d for d in doctors if d["specialty"] == query["specialty"]]
+    if query.get("city"):
+        city = catalog.wilaya_name(query["city"])
+        doctors = [d for d in doctors if city in d["city"]]
+    words = search.tokens(query.get("search") or "")
+    if words:
+        # Like the doctors_fts MATCH: every word, the last one as a prefix
+        def matches(d):
+            indexed = " ".join(search.index_text(d[k]) for k in ("name", "specialty", "city", "clinicAddress",
+                                                               "bio")).split()
+            return (all(w in indexed for w in words[:-1])
+                    and any(token.startswith(words[-1]) for token in indexed))
+        doctors = [d for d in doctors if matches(d)]
+    doctors.sort(key=lambda d: d["createdAt"], reverse=True)
+    if query.get("sort") == "rating":
+        doctors.sort(key=lambda d: _rating(state, d["id"]), reverse=True)
+    else:
+        doctors.sort(key=lambda d: _active_subscription(state, d["id"]) is not None, reverse=True)
+    page, pagination = _paginate(doctors, query, 12)
+    rows = []
+    for d in page:
+        rating, count = _rating(state, d["id"])
+        sub = _active_subscription(state, d["id"])
+        rows.append({k: d[k] for k in ("id", "name", "specialty", "city", "clinicAddress", "workingHours",
+                                       "priceRange", "profileImage", "phone", "bio")}
+                    | {"rating": rating, "reviewCount": count, "subscriptionEnd": sub and sub["endDate"]})
+    return _ok({"doctors": rows, "pagination": pagination})
+
+
+@route("GET", "/api/doctors/[id]")
+def _doctor(state, id, **_):
+    doctor = state.doctor(int(id)) if id.isdigit() else None
+    if doctor is None:
+        return _error("الطبيب غير موجود", 404)
+    reviews = sorted((r for r in state.data["reviews"] if r["doctorId"] == doctor["id"]),
+                     key=lambda r: r["createdAt"], reverse=True)[:10]
+    rating, count = _rating(state, doctor["id"])
+    return _ok(doctor | {
+        "workingHours": json.loads(doctor["workingHours"]) if doctor["workingHours"] else None,
+        "rating": rating, "reviewCount": count, "ratingHistogram": _rating_histogram(state, doctor["id"]),
+        "reviews": reviews,
+        "isActive": doctor["approved"] and state.user(doctor["userId"])["status"] == "ACTIVE",
+    })
+
+
+SLOT_MAX_RANGE_DAYS = 31
+
+
+def _parse_day(value) -> datetime | None:
+    """UTC midnight of a "YYYY-MM-DD..." value, like parseDay in src/lib/slots.ts."""
+    match = re.match(r"(\d{4})-(\d{2})-(\d{2})", str(value))
+    try:
+        return datetime(*map(int, match.groups()), tzinfo=timezone.utc) if match else None
+    except ValueError:
+        return None
+
+
+def _parse_time(value) -> str | None:
+    """"9:00" -> "09:00", like parseTime in src/lib/slots.ts."""
+    match = re.fullmatch(r"(\d{1,2}):(\d{2})", str(value).strip())
+    if not match or int(match[1]) > 23 or int(match[2]) > 59:
+        return None
+    return f"{match[1].zfill(2)}:{match[2]}"
+
+
+def _slot_taken(state, doctor_id: int, day: str, time: str, skip_id: int | None = None) -> bool:
+    """Whether a non-cancelled appointment holds the slot, like appointments_active_slot_key."""
+    return any(a["doctorId"] == doctor_id and a["date"][:10] == day[:10] and a["time"] == time
+               and a["status"] != "CANCELLED" and a["id"] != skip_id for a in state.data["appointments"])
+
+
+@route("GET", "/api/doctors/[id]/slots")
+def _slots(state, id, query, **_):
+    doctor = state.doctor(int(id)) if id.isdigit() else None
+    if doctor is None or not doctor["approved"]:
+        return _error("الطبيب غير موجود", 404)
+    start = _parse_day(query["from"]) if query.get("from") else _today()
+    end = _parse_day(query["to"]) if query.get("to") else start and start + timedelta(days=6)
+    if start is None or end is None or end < start:
+        return _error("نطاق التاريخ غير صالح", 400)
+    if (end - start).days >= SLOT_MAX_RANGE_DAYS:
+        return _error(f"لا يمكن طلب أكثر من {SLOT_MAX_RANGE_DAYS} يوماً", 400)
+    hours = json.loads(doctor["workingHours"]) if doctor["workingHours"] else {}
+    today = _today().date()
+    days = []
+    for offset in range((end - start).days + 1):
+        day = (start + timedelta(days=offset)).date()
+        # Python weekday() counts from Monday, the working hours keys from Sunday
+        span = hours.get(["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"][day.weekday()])
+        slots = []
+        if span and day >= today:
+            minute, stop = (int(span[k][:2]) * 60 + int(span[k][3:5]) for k in ("start", "end"))
+            for m in range(minute, stop, 30):
+                time = f"{m // 60:02d}:{m % 60:02d}"
+                if not _slot_taken(state, doctor["id"], day.isoformat(), time):
+                    slots.append(time)
+        days.append({"date": day.isoformat(), "slots": slots})
+    return _ok({"doctorId": doctor["id"], "from": start.date().isoformat(), "to": end.date().isoformat(),
+                "slotMinutes": 30, "days": days})
+
+
+@route("PUT", "/api/doctors/[id]")
+def _update_doctor(state, id, body, **_):
+    doctor = state.doctor(int(id))
+    if doctor is None:
+        return _error("الطبيب غير موجود", 404)
+    for key, value in body.items():
+        if key in doctor and key not in ("id", "userId", "approved"):
+            doctor[key] = json.dumps(value) if key == "workingHours" and isinstance(value, dict) else value
+    return _ok(doctor, message="تم تحديث البيانات بنجاح")
+
+
+@route("GET", "/api/specialties")
+def _specialties(state, **_):
+    names = set(catalog.specialties()) | {d["specialty"] for d in state.data["doctors"] if d["approved"]}
+    return _ok(sorted(names))
+
+
+@route("GET", "/api/reviews")
+def _reviews(state, query, **_):
+    reviews = [r for r in state.data["reviews"] if str(r["doctorId"]) == query.get("doctorId")]
+    page, pagination = _paginate(sorted(reviews, key=lambda r: r["createdAt"], reverse=True), query, 10)
+    return _ok({"reviews": page, "pagination": pagination})
+
+
+@route("POST", "/api/reviews")
+def _create_review(state, body, **_):
+    review = {"id": len(state.data["reviews"]) + 1, "doctorId": body.get("doctorId"),
+              "patientName": body.get("patientName"), "rating": body.get("rating"),
+              "comment": body.get("comment"), "createdAt": _iso(datetime.now(timezone.utc))}
+    state.data["reviews"].append(review)
+    return _ok(review, message="شكراً لك! تم إضافة تقييمك بنجاح")
+
+
+@route("GET", "/api/subscriptions/plans")
+def _plans(state, **_):
+    return _ok(sorted((p for p in state.data["plans"] if p["active"]), key=lambda p: p["priority"]))
+
+
+@route("PUT", "/api/subscriptions/plans/[id]")
+def _update_plan(state, id, body, **_):
+    plan = next((p for p in state.data["plans"] if p["id"] == int(id)), None)
+    if plan is None:
+        return _error("الباقة غير موجودة", 404)
+    plan.update({k: v for k, v in body.items() if k in plan and k != "id"})
+    return _ok(plan, message="تم تحديث الباقة بنجاح")
+
+
+# ---------------------------------------------------------------------------
+# Appointments and the doctor dashboard
+# ---------------------------------------------------------------------------
+
+def _with_relations(state, appointment):
+    doctor = state.doctor(appointment["doctorId"])
+    patient = next(p for p in state.data["patients"] if p["id"] == appointment["patientId"])
+    return appointment | {"patient": patient, "doctor": {k: doctor[k] for k in ("id", "name", "specialty", "priceRange")}}
+
+
+@route("GET", "/api/appointments")
+def _appointments(state, query, **_):
+    session = state.session().get("user", {})
+    doctor_id = session.get("doctorId") or (int(query["doctorId"]) if query.get("doctorId") else None)
+    items = [a for a in state.data["appointments"] if doctor_id is None or a["doctorId"] == doctor_id]
+    if query.get("status"):
+        items = [a for a in items if a["status"] == query["status"]]
+    if query.get("date"):
+        items = [a for a in items if a["date"].startswith(query["date"][:10])]
+    items.sort(key=lambda a: (a["date"], a["time"]))
+    page, pagination = _paginate(items, query, 20)
+    return _ok({"appointments": [_with_relations(state, a) for a in page], "pagination": pagination})
+
+
+@route("POST", "/api/appointments")
+def _book(state, body, **_):
+    required = ("doctorId", "patientName", "patientPhone", "date", "time")
+    if not all(body.get(k) for k in required):
+        return _error("جميع الحقول المطلوبة يجب أن تكون مملوءة", 400)
+    # The stored spelling of the slot, so "9:00" and "09:00" are the same booking
+    day, time = _parse_day(body["date"]), _parse_time(body["time"])
+    if day is None or time is None:
+        return _error("التاريخ أو الوقت غير صالح", 400)
+    doctor = state.doctor(int(body["doctorId"]))
+    if doctor is None or not doctor["approved"]:
+        return _error("الطبيب غير متاح حالياً", 400)
+    if _slot_taken(state, doctor["id"], _iso(day), time):
+        return _error("هذا الموعد محجوز، يرجى اختيار وقت آخر", 409)
+    now = _iso(datetime.now(timezone.utc))
+    patient = next((p for p in state.data["patients"] if p["phone"] == body["patientPhone"]), None)
+    if patient is None:
+        patient = {"id": len(state.data["patients"]) + 1, "name": body["patientName"],
+                   "phone": body["patientPhone"], "email": body.get("patientEmail"), "notes": None,
+                   "createdAt": now, "updatedAt": now}
+        state.data["patients"].append(patient)
+    appointment = {"id": len(state.data["appointments"]) + 1, "doctorId": doctor["id"], "patientId": patient["id"],
+                   "date": _iso(day), "time": time, "status": "PENDING", "notes": body.get("notes"),
+                   "actualPrice": None, "createdAt": now, "updatedAt": now}
+    state.data["appointments"].append(appointment)
+    return _ok(_with_relations(state, appointment), message="تم حجز الموعد بنجاح. سيتم التأكيد قريباً")
+
+
+@route("PUT", "/api/appointments/[id]")
+def _update_appointment(state, id, body, **_):
+    appointment = next((a for a in state.data["appointments"] if a["id"] == int(id)), None)
+    if appointment is None:
+        return _error("الموعد غير موجود", 404)
+    day = _parse_day(body["date"]) if body.get("date") else None
+    time = _parse_time(body["time"]) if body.get("time") else None
+    if (body.get("date") and day is None) or (body.get("time") and time is None):
+        return _error("التاريخ أو الوقت غير صالح", 400)
+    body = body | ({"date": _iso(day)} if day else {}) | ({"time": time} if time else {})
+    moved = {k: body.get(k) or appointment[k] for k in ("date", "time", "status")}
+    if moved["status"] != "CANCELLED" and _slot_taken(state, appointment["doctorId"], moved["date"], moved["time"],
+                                                      skip_id=appointment["id"]):
+        return _error("هذا الموعد محجوز، يرجى اختيار وقت آخر", 409)
+    appointment.update({k: v for k, v in body.items() if k in ("status", "notes", "date", "time", "actualPrice")})
+    appointment["updatedAt"] = _iso(datetime.now(timezone.utc))
+    return _ok(_with_relations(state, appointment), message="تم تحديث الموعد بنجاح")
+
+
+@route("DELETE", "/api/appointments/[id]")
+def _cancel_appointment(state, id, **_):
+    return _update_appointment(state, id, {"status": "CANCELLED"})
+
+
+@route("GET", "/api/dashboard/stats")
+def _dashboard_stats(state, **_):
+    doctor_id = state.session().get("user", {}).get("doctorId")
+    if not doctor_id:
+        return _error("غير مصرح", 401)
+    today = _today()
+    mine = [a for a in state.data["appointments"] if a["doctorId"] == doctor_id]
+    today_iso, tomorrow_iso = _iso(today), _iso(today + timedelta(days=1))
+    month_iso = _iso(today.replace(day=1))
+    completed = [a for a in mine if a["status"] == "COMPLETED" and a["actualPrice"] is not None]
+    sub = _active_subscription(state, doctor_id)
+    plan = sub and next(p for p in state.data["plans"] if p["id"] == sub["planId"])
+    upcoming = sorted((a for a in mine if a["date"] >= today_iso), key=lambda a: (a["date"], a["time"]))[:5]
+    return _ok({
+        "totalAppointments": len(mine),
+        "todayAppointments": sum(today_iso <= a["date"] < tomorrow_iso for a in mine),
+        "monthlyAppointments": sum(a["date"] >= month_iso for a in mine),
+        "pendingAppointments": sum(a["status"] == "PENDING" for a in mine),
+        "completedAppointments": sum(a["status"] == "COMPLETED" for a in mine),
+        "totalPatients": len({a["patientId"] for a in mine}),
+        "recentAppointments": [_with_relations(state, a) for a in upcoming],
+        "todayEarnings": sum(a["actualPrice"] for a in completed if today_iso <= a["updatedAt"] < tomorrow_iso),
+        "monthlyEarnings": sum(a["actualPrice"] for a in completed if a["updatedAt"] >= month_iso),
+        "totalEarnings": sum(a["actualPrice"] for a in completed),
+        "subscription": sub and {
+            "planName": plan["nameAr"], "startDate": sub["startDate"], "endDate": sub["endDate"],
+            "daysRemaining": max(0, (datetime.fromisoformat(sub["endDate"].replace("Z", "+00:00")) - today).days),
+            "totalDays": 30,
+            "usedDays": (today - datetime.fromisoformat(sub["startDate"].replace("Z", "+00:00"))).days,
+        },
+    })
+
+
+@route("GET", "/api/subscriptions/doctor")
+def _doctor_subscription(state, **_):
+    doctor_id = state.session().get("user", {}).get("doctorId")
+    subs = [s | {"plan": next(p for p in state.data["plans"] if p["id"] == s["planId"])}
+            for s in state.data["subscriptions"] if s["doctorId"] == doctor_id]
+    return _ok(sorted(subs, key=lambda s: s["createdAt"], reverse=True))
+
+
+# ---------------------------------------------------------------------------
+# Admin
+# ---------------------------------------------------------------------------
+
+def _is_admin(state) -> bool:
+    return state.session().get("user", {}).get("role") == "ADMIN"
+
+
+@route("GET", "/api/admin/stats")
+def _admin_stats(state, **_):
+    if not _is_admin(state):
+        return _error("غير مصرح", 403)
+    doctors, subs = state.data["doctors"], state.data["subscriptions"]
+    month_iso = _iso(_today().replace(day=1))
+    return _ok({
+        "totalDoctors": len(doctors),
+        "activeDoctors": sum(d["approved"] and state.user(d["userId"])["status"] == "ACTIVE" for d in doctors),
+        "pendingDoctors": sum(not d["approved"] for d in doctors),
+        "totalPatients": len(state.data["patients"]),
+        "totalAppointments": len(state.data["appointments"]),
+        "monthlyAppointments": sum(a["createdAt"] >= month_iso for a in state.data["appointments"]),
+        "pendingSubscriptions": sum(s["status"] == "PENDING" for s in subs),
+        "activeSubscriptions": sum(s["status"] == "ACTIVE" for s in subs),
+        "monthlyRevenue": sum(next(p["price"] for p in state.data["plans"] if p["id"] == s["planId"])
+                              for s in subs if s["status"] == "ACTIVE" and (s["startDate"] or "") >= month_iso),
+    })
+
+
+@route("GET", "/api/admin/doctors")
+def _admin_doctors(state, query, **_):
+    if not _is_admin(state):
+        return _error("غير مصرح", 403)
+    doctors = state.data["doctors"]
+    status = query.get("status")
+    if status == "pending":
+        doctors = [d for d in doctors if not d["approved"]]
+    elif status == "active":
+        doctors = [d for d in doctors if d["approved"] and state.user(d["userId"])["status"] == "ACTIVE"]
+    elif status == "suspended":
+        doctors = [d for d in doctors if state.user(d["userId"])["status"] == "SUSPENDED"]
+    if query.get("search"):
+        term = query["search"]
+        doctors = [d for d in doctors
+                   if term in d["name"] or term in d["city"] or term in state.user(d["userId"])["email"]]
+    page, pagination = _paginate(sorted(doctors, key=lambda d: d["createdAt"], reverse=True), query, 20)
+    rows = []
+    for d in page:
+        sub = _active_subscription(state, d["id"])
+        user = state.user(d["userId"])
+        rows.append(d | {
+            "user": {k: user[k] for k in ("id", "email", "status", "createdAt")},
+            "subscriptions": [sub | {"plan": next(p for p in state.data["plans"] if p["id"] == sub["planId"])}] if sub else [],
+            "_count": {"appointments": sum(a["doctorId"] == d["id"] for a in state.data["appointments"]),
+                       "reviews": sum(r["doctorId"] == d["id"] for r in state.data["reviews"])},
+            "daysRemaining": None,
+        })
+    return _ok({"doctors": rows, "pagination": pagination})
+
+
+@route("PUT", "/api/admin/doctors/[id]")
+def _admin_doctor_action(state, id, body, **_):
+    if not _is_admin(state):
+        return _error("غير مصرح", 403)
+    doctor = state.doctor(int(id))
+    if doctor is None:
+        return _error("الطبيب غير موجود", 404)
+    user = state.user(doctor["userId"])
+    action = body.get("action")
+    if action == "approve":
+        doctor["approved"], user["status"] = True, "ACTIVE"
+        return _ok(message="تم الموافقة على الطبيب بنجاح")
+    if action in ("suspend", "activate"):
+        user["status"] = "SUSPENDED" if action == "suspend" else "ACTIVE"
+        return _ok(message="تم تعليق حساب الطبيب" if action == "suspend" else "تم تفعيل حساب الطبيب")
+    if action == "reject":
+        state.data["doctors"].remove(doctor)
+        state.data["users"].remove(user)
+        return _ok(message="تم رفض الطبيب وحذف حسابه")
+    return _ok(message="")
+
+
+@route("GET", "/api/admin/subscriptions")
+def _admin_subscriptions(state, query, **_):
+    if not _is_admin(state):
+        return _error("غير مصرح", 403)
+    subs = state.data["subscriptions"]
+    if query.get("status") and query["status"] != "all":
+        subs = [s for s in subs if s["status"] == query["status"].upper()]
+    page, pagination = _paginate(sorted(subs, key=lambda s: s["createdAt"], reverse=True), query, 20)
+    rows = [s | {"doctor": state.doctor(s["doctorId"]),
+                 "plan": next(p for p in state.data["plans"] if p["id"] == s["planId"])} for s in page]
+    return _ok({"subscriptions": rows, "pagination": pagination})
+
+
+@route("PUT", "/api/admin/subscriptions/[id]")
+def _admin_subscription_action(state, id, body, **_):
+    if not _is_admin(state):
+        return _error("غير مصرح", 403)
+    sub = next((s for s in state.data["subscriptions"] if s["id"] == int(id)), None)
+    if sub is None:
+        return _error("الاشتراك غير موجود", 404)
+    now = datetime.now(timezone.utc)
+    if body.get("action") == "approve":
+        for other in state.data["subscriptions"]:
+            if other["doctorId"] == sub["doctorId"] and other["status"] == "ACTIVE":
+                other["status"] = "EXPIRED"
+        days = int(body.get("durationDays") or 30)
+        sub.update(status="ACTIVE", startDate=_iso(now), endDate=_iso(now + timedelta(days=days)))
+    elif body.get("action") == "reject":
+        sub["status"] = "CANCELLED"
+    sub["updatedAt"] = _iso(now)
+    return _ok(sub)
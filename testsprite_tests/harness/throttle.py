@@ -0,0 +1,182 @@
+"""Network and CPU throttling profiles, and the matrix that compares them.
+
+``python -m harness throttle`` runs the flows in ``FLOWS`` (home search,
+doctor detail, booking, doctor dashboard) once per profile and prints their
+load and interaction timings side by side. A profile is applied to every
+page of a context through CDP before the flow navigates:
+
+* ``Network.emulateNetworkConditions`` with the latency and throughput of
+  Chrome DevTools' presets (latency is the request round trip, throughput
+  in bytes per second),
+* ``Emulation.setCPUThrottlingRate`` for the CPU slowdown.
+
+Slower profiles also stretch the harness's waits (``harness.waits``) and
+the contexts' default timeouts by ``timeoutScale``. Explicit ``timeout=``
+arguments in the TC scripts stay as they are, so a flow can fail under a
+slow profile; the table then marks it and shows the timings it reached.
+
+``HARNESS_THROTTLE=<profile>`` applies one profile to a normal ``run``.
+"""
+import asyncio
+import json
+import os
+import statistics
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import config, waits
+
+RESULTS_PATH = config.TMP_DIR / "throttle_results.json"
+
+PROFILES = {
+    "none": {"timeoutScale": 1.0},
+    "fast-4g": {"latencyMs": 165, "downloadBps": 9_000_000 * 0.9 / 8, "uploadBps": 1_500_000 * 0.9 / 8,
+                "connectionType": "cellular4g", "timeoutScale": 1.5},
+    "slow-3g": {"latencyMs": 2000, "downloadBps": 500_000 * 0.8 / 8, "uploadBps": 500_000 * 0.8 / 8,
+                "connectionType": "cellular3g", "timeoutScale": 4.0},
+    "cpu-4x": {"cpuRate": 4, "timeoutScale": 3.0},
+    # The phone most patients book from: fast 4G on a mid-range CPU
+    "mid-android": {"latencyMs": 165, "downloadBps": 9_000_000 * 0.9 / 8, "uploadBps": 1_500_000 * 0.9 / 8,
+                    "connectionType": "cellular4g", "cpuRate": 4, "timeoutScale": 4.0},
+}
+
+DEFAULT_MATRIX = ("none", "fast-4g", "slow-3g", "cpu-4x")
+
+# Flow name -> TC script that exercises it
+FLOWS = {
+    "home search": "TC002",
+    "doctor detail": "TC008",
+    "booking": "TC009",
+    "dashboard load": "TC013",
+}
+
+
+_BASE_TEST_TIMEOUT = config.TEST_TIMEOUT
+
+
+def activate(name: str) -> None:
+    """Throttle every context from now on ("" for none) and stretch the timeouts to match."""
+    scale = PROFILES[name]["timeoutScale"] if name else 1.0
+    # Exported so worker processes started for --workers use the same profile
+    config.THROTTLE = os.environ["HARNESS_THROTTLE"] = name
+    config.TEST_TIMEOUT = _BASE_TEST_TIMEOUT * scale
+    waits.TIMEOUT_SCALE = scale
+
+
+class Throttle:
+    """Applies one profile to every page of a context."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.profile = PROFILES[name]
+        self._applied: dict = {}
+
+    async def install(self, context) -> None:
+        # Popups and pages opened by the app; pages opened by the flow are
+        # throttled by apply() before new_page() returns
+        context.on("page", lambda page: self.apply(context, page))
+
+    def apply(self, context, page) -> asyncio.Future:
+        if page not in self._applied:
+            self._applied[page] = asyncio.ensure_future(self._emulate(context, page))
+        return self._applied[page]
+
+    async def _emulate(self, context, page) -> None:
+        profile = self.profile
+        if "latencyMs" not in profile and "cpuRate" not in profile:
+            return
+        try:
+            cdp = await context.new_cdp_session(page)
+            if "latencyMs" in profile:
+                await cdp.send("Network.enable")
+                await cdp.send("Network.emulateNetworkConditions", {
+                    "offline": False,
+                    "latency": profile["latencyMs"],
+                    "downloadThroughput": profile["downloadBps"],
+                    "uploadThroughput": profile["uploadBps"],
+                    "connectionType": profile["connectionType"],
+                })
+            if "cpuRate" in profile:
+                await cdp.send("Emulation.setCPUThrottlingRate", {"rate": profile["cpuRate"]})
+        except Exception:
+            pass  # page closed before the session attached
+
+
+def summarize(result: dict) -> dict:
+    """Load and interaction timings of one test result."""
+    visits = result.get("pages", [])
+    hard = [v["metrics"] for v in visits if not v["soft"]]
+    interactions = result.get("interactions", [])
+
+    def peak(metric):
+        values = [m[metric] for m in hard if metric in m]
+        return max(values) if values else None
+
+    return {
+        "passed": result["testStatus"] == "PASSED",
+        "flowMs": round(result["durationMs"], 1),
+        "firstLoadMs": hard[0].get("load") if hard else None,
+        "ttfbMs": peak("ttfb"),
+        "lcpMs": peak("lcp"),
+        "apiMs": max((v["metrics"].get("apiMs", 0.0) for v in visits), default=None),
+        "interactionMs": round(sum(i["settleMs"] for i in interactions), 1) if interactions else None,
+        "longTaskMs": round(sum(v["metrics"].get("longTaskMs", 0.0) for v in visits), 1),
+    }
+
+
+def combine(runs: list[dict]) -> dict:
+    """Median of each timing over repeated runs of one flow and profile."""
+    combined = {"passed": sum(r["passed"] for r in runs), "runs": len(runs)}
+    for metric in ("flowMs", "firstLoadMs", "ttfbMs", "lcpMs", "apiMs", "interactionMs", "longTaskMs"):
+        values = [r[metric] for r in runs if r.get(metric) is not None]
+        combined[metric] = round(statistics.median(values), 1) if values else None
+    return combined
+
+
+def write_report(report: dict, path: Path = RESULTS_PATH) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"created": datetime.now(timezone.utc).isoformat(), **report}, fh, indent=2,
+                  ensure_ascii=False)
+    return path
+
+
+_METRICS = (
+    ("flowMs", "flow"),
+    ("firstLoadMs", "first load"),
+    ("ttfbMs", "TTFB (max)"),
+    ("lcpMs", "LCP (max)"),
+    ("apiMs", "slowest /api"),
+    ("interactionMs", "interactions"),
+    ("longTaskMs", "long tasks"),
+)
+
+
+def _cell(value, base) -> str:
+    if value is None:
+        return "-"
+    text = f"{value / 1000:.2f}s"
+    if base:
+        text += f" ({value / base:.1f}x)"
+    return text
+
+
+def format_report(report: dict) -> str:
+    """Flows x metrics, one column per profile, relative to the first profile."""
+    profiles = report["profiles"]
+    rows = [("Flow", "Metric", *profiles)]
+    for flow, by_profile in report["flows"].items():
+        first = by_profile.get(profiles[0], {})
+        status = ["" if p not in by_profile else
+                  f"{by_profile[p]['passed']}/{by_profile[p]['runs']} passed" for p in profiles]
+        rows.append((flow, "", *status))
+        for metric, label in _METRICS:
+            values = [by_profile.get(p, {}).get(metric) for p in profiles]
+            if all(v is None for v in values):
+                continue
+            rows.append(("", label, _cell(values[0], None),
+                         *[_cell(v, first.get(metric)) for v in values[1:]]))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
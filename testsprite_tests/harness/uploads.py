@@ -0,0 +1,268 @@
+"""Upload throughput benchmark against the local Cloudinary stand-in.
+
+``python -m harness upload-bench`` repeats what the dashboard does for each
+file, end to end:
+
+1. ``POST`` the file as multipart to the stand-in
+   (``/v1_1/<cloud>/raw/upload``, or ``image`` for ``--kind avatar``),
+2. record it in the app as the signed-in demo doctor: ``POST /api/files``
+   for a patient of that doctor, or ``POST /api/upload`` for an avatar.
+
+For every combination of ``--sizes`` and ``--concurrency`` it runs
+``--uploads`` uploads, ``concurrency`` at a time, each worker on its own
+keep-alive connections, and reports the bytes per second over the cell's
+wall clock, uploads per second and p50/p95/p99 of the upload, the record
+step and the total. Files are random bytes behind a PDF or PNG header, so
+nothing compresses them.
+
+By default the stand-in is started for the run (``--cloudinary launch``)
+with a throwaway storage directory; ``external`` uses the one already on
+``HARNESS_CLOUDINARY_URL``. The patient file records are deleted
+afterwards unless ``--keep`` is given.
+"""
+import asyncio
+import json
+import random
+import re
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from . import cloudinary, config, load
+
+RESULTS_PATH = config.TMP_DIR / "upload_results.json"
+
+DEFAULT_SIZES = ("100K", "1M", "5M")
+DEFAULT_CONCURRENCY = (1, 4, 16)
+
+_UNITS = {"": 1, "K": 2 ** 10, "M": 2 ** 20}
+
+
+def parse_size(text: str) -> int:
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([KM]?)B?", text.strip().upper())
+    if not match:
+        raise ValueError(f"bad size {text!r}; use e.g. 512K or 5M")
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def _label(size: int) -> str:
+    if size >= 2 ** 20:
+        return f"{size / 2 ** 20:g} MB"
+    return f"{size / 2 ** 10:g} KB" if size >= 2 ** 10 else f"{size} B"
+
+
+def make_file(kind: str, size: int, rng: random.Random) -> tuple[str, str, bytes]:
+    """(file name, content type, bytes) of ``size`` bytes for ``kind``."""
+    if kind == "avatar":
+        ihdr = struct.pack(">IIBBBBB", 512, 512, 8, 6, 0, 0, 0)
+        head = (b"\x89PNG\r\n\x1a\n" + struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr
+                + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr)))
+        return "avatar.png", "image/png", head + rng.randbytes(max(size - len(head), 0))
+    head = b"%PDF-1.4\n"
+    return "analyse.pdf", "application/pdf", head + rng.randbytes(max(size - len(head), 0))
+
+
+def multipart(fields: dict[str, str], name: str, ctype: str, data: bytes) -> tuple[str, bytes]:
+    boundary = "----harness" + "".join(random.choices("0123456789abcdef", k=16))
+    parts = [f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"\r\n\r\n{value}\r\n'.encode()
+             for key, value in fields.items()]
+    parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{name}"\r\n'
+                 f"Content-Type: {ctype}\r\n\r\n".encode() + data + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return f"multipart/form-data; boundary={boundary}", b"".join(parts)
+
+
+class UploadBench:
+    def __init__(self, base_url: str = config.BASE_URL, cloudinary_url: str = config.CLOUDINARY_URL,
+                 sizes: list[int] | None = None, concurrency: list[int] | None = None, uploads: int = 20,
+                 kind: str = "file", cloud: str = cloudinary.DEFAULT_CLOUD,
+                 preset: str = cloudinary.DEFAULT_PRESET, keep: bool = False, seed: int = 1):
+        self.base_url = base_url
+        self.cloudinary_url = cloudinary_url
+        self.sizes = sizes or [parse_size(s) for s in DEFAULT_SIZES]
+        self.concurrency = concurrency or list(DEFAULT_CONCURRENCY)
+        self.uploads = uploads
+        self.kind = kind
+        self.cloud = cloud
+        self.preset = preset
+        self.keep = keep
+        self.rng = random.Random(seed)
+        self.meta = {
+            "baseUrl": base_url, "cloudinaryUrl": cloudinary_url, "kind": kind, "uploads": uploads,
+            "seed": seed, "created": datetime.now(timezone.utc).isoformat(),
+        }
+        self._cookies: dict[str, str] = {}
+        self._patient: int | None = None
+        self._records: list[int] = []
+
+    async def _prepare(self) -> None:
+        self._cookies = await load.LoadTest(self.base_url).login("doctor")
+        if self.kind != "file":
+            return
+        conn = self._app()
+        try:
+            status, data = await conn.request("GET", "/api/patients?" + urlencode({"limit": 1}))
+        finally:
+            await conn.close()
+        patients = json.loads(data)["data"]["patients"] if status == 200 else []
+        if not patients:
+            raise load.HttpError("The demo doctor has no patients to attach files to; seed the database first")
+        self._patient = patients[0]["id"]
+
+    def _app(self) -> load.Connection:
+        conn = load.Connection(self.base_url)
+        conn.cookies = dict(self._cookies)
+        return conn
+
+    async def _one(self, cdn: load.Connection, app: load.Connection, body: tuple[str, bytes],
+                   name: str, ctype: str, size: int, stats: dict[str, load.EndpointStats]) -> None:
+        resource_type = "image" if self.kind == "avatar" else "raw"
+        started = time.perf_counter()
+        try:
+            status, data = await cdn.request("POST", f"/v1_1/{self.cloud}/{resource_type}/upload", raw=body)
+            code = str(status)
+        except Exception as exc:
+            status, data, code = 0, b"", type(exc).__name__
+        uploaded = time.perf_counter()
+        stats["upload"].add((uploaded - started) * 1000, code)
+        if status != 200:
+            stats["total"].add((uploaded - started) * 1000, code)
+            return
+        url = json.loads(data)["secure_url"]
+        try:
+            if self.kind == "avatar":
+                status, data = await app.request("POST", "/api/upload", {"url": url})
+            else:
+                status, data = await app.request("POST", "/api/files", {
+                    "patientId": self._patient, "filePath": url, "fileName": name,
+                    "fileType": ctype, "fileSize": size,
+                })
+            code = str(status)
+        except Exception as exc:
+            status, data, code = 0, b"", type(exc).__name__
+        done = time.perf_counter()
+        stats["record"].add((done - uploaded) * 1000, code)
+        stats["total"].add((done - started) * 1000, code)
+        if status == 200 and self.kind == "file":
+            self._records.append(json.loads(data)["data"]["id"])
+
+    async def _cell(self, size: int, concurrency: int) -> dict:
+        name, ctype, data = make_file(self.kind, size, self.rng)
+        body = multipart({"upload_preset": self.preset}, name, ctype, data)
+        stats = {step: load.EndpointStats() for step in ("upload", "record", "total")}
+        pending = iter(range(self.uploads))
+
+        async def worker() -> None:
+            cdn, app = load.Connection(self.cloudinary_url), self._app()
+            try:
+                for _ in pending:
+                    await self._one(cdn, app, body, name, ctype, size, stats)
+            finally:
+                await cdn.close()
+                await app.close()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        seconds = time.perf_counter() - started
+        done = stats["total"].statuses.get("200", 0)
+        return {
+            "sizeBytes": size,
+            "concurrency": concurrency,
+            "uploads": self.uploads,
+            "completed": done,
+            "wallS": round(seconds, 3),
+            "mbPerS": round(done * size / 2 ** 20 / seconds, 2) if seconds else 0.0,
+            "uploadsPerS": round(done / seconds, 2) if seconds else 0.0,
+            **{step: s.summary(seconds) for step, s in stats.items()},
+        }
+
+    async def _cleanup(self) -> None:
+        conn = self._app()
+        try:
+            for record in self._records:
+                await conn.request("DELETE", f"/api/files/{record}")
+        finally:
+            await conn.close()
+        self._records.clear()
+
+    async def run(self, on_cell=None) -> dict:
+        await self._prepare()
+        cells = []
+        try:
+            for size in self.sizes:
+                for concurrency in self.concurrency:
+                    cell = await self._cell(size, concurrency)
+                    cells.append(cell)
+                    if on_cell:
+                        on_cell(cell)
+        finally:
+            if not self.keep:
+                await self._cleanup()
+        return {"meta": self.meta, "cells": cells}
+
+
+class LaunchedStandIn:
+    """``python -m harness cloudinary`` in a subprocess with throwaway storage."""
+
+    def __init__(self, url: str = config.CLOUDINARY_URL, latency_ms: float = 0.0, bandwidth_mbps: float = 0.0):
+        self.url = url
+        self.args = ["--latency-ms", str(latency_ms), "--bandwidth-mbps", str(bandwidth_mbps)]
+        self._storage = None
+        self._process = None
+
+    def __enter__(self):
+        self._storage = tempfile.TemporaryDirectory(prefix="harness-cloudinary-")
+        host, port = urlsplit(self.url).hostname, urlsplit(self.url).port or 80
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "harness", "cloudinary", "--port", str(port), "--storage", self._storage.name,
+             *self.args],
+            cwd=config.TESTS_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise load.HttpError(f"Cloudinary stand-in exited: {self._process.stderr.read().decode().strip()}")
+            try:
+                socket.create_connection((host, port), timeout=1).close()
+                return self
+            except OSError:
+                time.sleep(0.1)
+        self.__exit__()
+        raise load.HttpError(f"Cloudinary stand-in did not listen on {self.url}")
+
+    def __exit__(self, *exc):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait(timeout=10)
+            self._process = None
+        if self._storage is not None:
+            self._storage.cleanup()
+            self._storage = None
+
+
+def write_report(report: dict, path: Path = RESULTS_PATH) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+    return path
+
+
+def format_report(report: dict) -> str:
+    rows = [("Size", "Conc", "Done", "Errors", "MB/s", "Uploads/s", "Upload p50/p95", "Record p50/p95",
+             "Total p50/p95")]
+    for c in report["cells"]:
+        rows.append((
+            _label(c["sizeBytes"]), str(c["concurrency"]), f"{c['completed']}/{c['uploads']}",
+            str(c["upload"]["errors"] + c["record"]["errors"]), f"{c['mbPerS']:.2f}", f"{c['uploadsPerS']:.1f}",
+            *[f"{c[step]['p50Ms']:.0f}/{c[step]['p95Ms']:.0f} ms" for step in ("upload", "record", "total")],
+        ))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
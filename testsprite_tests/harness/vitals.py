@@ -0,0 +1,196 @@
+"""Per-page Web Vitals, navigation timing and /api call durations.
+
+An init script observes every document the test loads. It splits the
+document's lifetime into *visits*: the initial load, then one visit per
+client-side route change (``history.pushState`` from the Next.js router).
+For each visit it keeps
+
+* Navigation Timing of the document (TTFB, DOMContentLoaded, load),
+* the latest LCP candidate and the cumulative layout shift,
+* long tasks (> 50 ms),
+* every ``/api/*`` fetch/XHR the page issued, with its duration and status,
+* *marks*: the first time an element matching a budget-file selector
+  appeared, measured from the last user input (or from the start of the
+  visit when there was none).
+
+Snapshots are pushed to Python through an exposed binding whenever the page
+is hidden, on route changes, every half second while something changed, and
+right before the harness closes the context.
+
+Budgets live in ``harness/budgets/*.json``, one file per page route::
+
+    {"page": "/doctors/[id]",
+     "marks": {"timeToSlots": "form .flex-wrap > button.btn-sm"},
+     "budgets": {"lcp": 2500, "api:/api/doctors/[id]/slots": 800, "mark:timeToSlots": 1000}}
+
+Metric names: ``ttfb``, ``domContentLoaded``, ``load``, ``lcp``, ``cls``,
+``longTaskMs``, ``longTasks``, ``apiMs`` (slowest call), ``api:<route>``
+(slowest call to that route) and ``mark:<name>``.
+"""
+import json
+from pathlib import Path
+
+BUDGETS_DIR = Path(__file__).resolve().parent / "budgets"
+
+_INIT_SCRIPT = r"""
+(() => {
+  if (window.top !== window || window.__harnessVitalsInstalled) return;
+  window.__harnessVitalsInstalled = true;
+  const marks = %(marks)s;
+  const doc = Math.random().toString(36).slice(2);
+  const visits = [];
+  let dirty = false, lastInput = null;
+  const routeOf = (path) => path.replace(/\/\d+(?=\/|$)/g, '/[id]');
+  const current = () => visits[visits.length - 1];
+  const startVisit = (soft) => {
+    const path = location.pathname;
+    visits.push({doc, index: visits.length, url: location.href, route: routeOf(path), soft,
+                 start: soft ? performance.now() : 0, lcp: null, cls: 0, longTasks: [], api: [], marks: {}});
+    dirty = true;
+  };
+  const visitAt = (t) => {
+    for (let i = visits.length - 1; i >= 0; i--) if (visits[i].start <= t) return visits[i];
+    return visits[0];
+  };
+  startVisit(false);
+
+  const observe = (type, cb) => {
+    try { new PerformanceObserver((list) => { list.getEntries().forEach(cb); dirty = true; })
+            .observe({type, buffered: true}); } catch (e) {}
+  };
+  observe('largest-contentful-paint', (e) => { visits[0].lcp = e.startTime; });
+  observe('layout-shift', (e) => { if (!e.hadRecentInput) visitAt(e.startTime).cls += e.value; });
+  observe('longtask', (e) => { visitAt(e.startTime).longTasks.push([e.startTime, e.duration]); });
+  observe('resource', (e) => {
+    if (!['fetch', 'xmlhttprequest'].includes(e.initiatorType)) return;
+    const url = new URL(e.name, location.href);
+    if (url.origin !== location.origin || !url.pathname.startsWith('/api/')) return;
+    visitAt(e.startTime).api.push({path: url.pathname, route: routeOf(url.pathname), query: url.search,
+      start: e.startTime, ms: e.responseEnd - e.startTime, status: e.responseStatus || null,
+      bytes: e.transferSize || 0});
+  });
+
+  ['pointerdown', 'keydown', 'input', 'change'].forEach((t) =>
+    addEventListener(t, () => { lastInput = performance.now(); }, true));
+  const checkMarks = () => {
+    const visit = current();
+    const selectors = marks[visit.route] || {};
+    for (const [name, selector] of Object.entries(selectors)) {
+      if (visit.marks[name] === undefined && document.querySelector(selector)) {
+        const now = performance.now();
+        const from = lastInput !== null && lastInput >= visit.start ? lastInput : visit.start;
+        visit.marks[name] = now - from;
+        dirty = true;
+      }
+    }
+  };
+  new MutationObserver(checkMarks).observe(document, {childList: true, subtree: true});
+
+  const flush = () => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    visits[0].navigation = nav ? {ttfb: nav.responseStart, domContentLoaded: nav.domContentLoadedEventEnd,
+                                  load: nav.loadEventEnd || null, transferSize: nav.transferSize} : null;
+    dirty = false;
+    if (window.__harnessVitals) return window.__harnessVitals(JSON.stringify(visits));
+  };
+  window.__harnessFlush = flush;
+  for (const name of ['pushState', 'replaceState']) {
+    const original = history[name];
+    history[name] = function (...args) {
+      const before = location.pathname;
+      const result = original.apply(this, args);
+      if (location.pathname !== before) { flush(); startVisit(true); }
+      return result;
+    };
+  }
+  addEventListener('popstate', () => { flush(); startVisit(true); });
+  addEventListener('pagehide', flush);
+  document.addEventListener('visibilitychange', () => { if (document.hidden) flush(); });
+  setInterval(() => { if (dirty) flush(); }, 500);
+})();
+"""
+
+
+def load_budgets(directory: Path = BUDGETS_DIR) -> dict[str, dict]:
+    """Budget files keyed by page route."""
+    budgets = {}
+    for path in sorted(directory.glob("*.json")):
+        with open(path, encoding="utf-8") as fh:
+            spec = json.load(fh)
+        budgets[spec["page"]] = spec
+    return budgets
+
+
+class VitalsCollector:
+    """Receives visit snapshots from every page of one context."""
+
+    def __init__(self, budgets: dict[str, dict] | None = None):
+        self.budgets = load_budgets() if budgets is None else budgets
+        self._visits: dict[tuple[str, int], dict] = {}
+
+    async def install(self, context) -> None:
+        marks = {page: spec.get("marks", {}) for page, spec in self.budgets.items()}
+        await context.expose_binding("__harnessVitals", self._receive)
+        await context.add_init_script(_INIT_SCRIPT % {"marks": json.dumps(marks)})
+
+    def _receive(self, source, payload: str) -> None:
+        for visit in json.loads(payload):
+            self._visits[(visit["doc"], visit["index"])] = visit
+
+    async def flush(self, context) -> None:
+        for page in context.pages:
+            try:
+                await page.evaluate("window.__harnessFlush && window.__harnessFlush()")
+            except Exception:
+                pass  # page already gone or mid-navigation
+
+    @property
+    def visits(self) -> list[dict]:
+        return [summarize(v) for v in sorted(self._visits.values(), key=lambda v: (v["doc"], v["index"]))
+                if not v["url"].startswith("about:")]
+
+
+def summarize(visit: dict) -> dict:
+    """Flatten one raw visit into the metrics that budgets refer to."""
+    nav = visit.get("navigation") or {}
+    long_tasks = visit.get("longTasks", [])
+    api = visit.get("api", [])
+    metrics = {
+        "ttfb": nav.get("ttfb"),
+        "domContentLoaded": nav.get("domContentLoaded"),
+        "load": nav.get("load"),
+        "lcp": visit.get("lcp"),
+        "cls": round(visit.get("cls", 0.0), 4),
+        "longTasks": len(long_tasks),
+        "longTaskMs": round(sum(d for _, d in long_tasks), 1),
+        "apiMs": round(max((c["ms"] for c in api), default=0.0), 1),
+    }
+    for call in api:
+        key = f"api:{call['route']}"
+        metrics[key] = round(max(metrics.get(key, 0.0), call["ms"]), 1)
+    for name, value in visit.get("marks", {}).items():
+        metrics[f"mark:{name}"] = round(value, 1)
+    if visit.get("soft"):
+        for key in ("ttfb", "domContentLoaded", "load", "lcp"):
+            metrics.pop(key)
+    return {
+        "url": visit["url"],
+        "route": visit["route"],
+        "soft": visit.get("soft", False),
+        "metrics": {k: v for k, v in metrics.items() if v is not None},
+        "api": [{k: c[k] for k in ("path", "query", "ms", "status", "bytes")} for c in api],
+    }
+
+
+def check_budgets(visits: list[dict], budgets: dict[str, dict]) -> list[str]:
+    """Human-readable violations for every visit of a budgeted page."""
+    violations = []
+    for visit in visits:
+        spec = budgets.get(visit["route"])
+        if not spec:
+            continue
+        for metric, limit in spec.get("budgets", {}).items():
+            value = visit["metrics"].get(metric)
+            if value is not None and value > limit:
+                violations.append(f"{visit['route']} {metric} = {value:g} > budget {limit:g} ({visit['url']})")
+    return violations
@@ -0,0 +1,144 @@
+"""Event-driven waits for the TC flows.
+
+The generated scripts slept a fixed three seconds before every action. These
+helpers wait for a concrete signal instead:
+
+* the target locator becoming visible (Playwright's own actionability checks
+  then cover enabled/stable/receiving events),
+* the matching ``/api/...`` response completing, when the caller names one,
+* client-side ``fetch``/XHR traffic of the page's context going quiet.
+
+None of them sleep for longer than the page actually needs.
+"""
+import asyncio
+import re
+import time
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+# Same overall budget a step had before: 3 s sleep + 5 s action timeout
+ACTION_TIMEOUT = 8000
+API_TIMEOUT = 15000
+# Fetch traffic must stay at zero this long before the page counts as idle
+QUIET_MS = 250
+IDLE_TIMEOUT = 10000
+
+# Multiplier for every timeout below; harness.throttle raises it for slow profiles
+TIMEOUT_SCALE = 1.0
+
+_TRACKED_TYPES = {"fetch", "xhr"}
+
+
+class _Inflight:
+    """Counts in-flight fetch/XHR requests across a browser context."""
+
+    def __init__(self, context):
+        self.pending = set()
+        self.last_change = time.monotonic()
+        context.on("request", self._started)
+        context.on("requestfinished", self._settled)
+        context.on("requestfailed", self._settled)
+
+    def _started(self, request):
+        if request.resource_type in _TRACKED_TYPES:
+            self.pending.add(request)
+            self.last_change = time.monotonic()
+
+    def _settled(self, request):
+        if request in self.pending:
+            self.pending.discard(request)
+            self.last_change = time.monotonic()
+
+    async def idle(self, quiet_ms: float = QUIET_MS, timeout: float = IDLE_TIMEOUT,
+                   since: float | None = None) -> bool:
+        # `since` lets a caller count the quiet window from its own action, so
+        # a fetch the action is about to start is not missed
+        deadline = time.monotonic() + timeout * TIMEOUT_SCALE / 1000
+        while time.monotonic() < deadline:
+            last = max(self.last_change, since or 0.0)
+            if not self.pending and (time.monotonic() - last) * 1000 >= quiet_ms:
+                return True
+            await asyncio.sleep(0.025)
+        return False
+
+
+_trackers: dict[int, _Inflight] = {}
+
+
+def track(context) -> _Inflight:
+    """Start (or return) fetch tracking for ``context``.
+
+    The harness calls this as soon as it creates a context so the very first
+    page load is covered; flows run standalone start tracking on first use.
+    """
+    key = id(context)
+    if key not in _trackers:
+        _trackers[key] = _Inflight(context)
+        context.on("close", lambda _: _trackers.pop(key, None))
+    return _trackers[key]
+
+
+def _matcher(path: str, method: str | None):
+    pattern = re.compile(re.escape(path).replace(r"\*", "[^/?]+") + r"(?:[/?]|$)")
+
+    def matches(response) -> bool:
+        url = response.url.split("://", 1)[-1]
+        url = url[url.find("/"):] if "/" in url else "/"
+        if method and response.request.method != method.upper():
+            return False
+        return bool(pattern.match(url))
+    return matches
+
+
+async def network_idle(page, quiet_ms: float = QUIET_MS, timeout: float = IDLE_TIMEOUT) -> bool:
+    """Wait until no fetch/XHR of ``page``'s context has been open for ``quiet_ms``."""
+    return await track(page.context).idle(quiet_ms, timeout)
+
+
+async def actionable(locator, timeout: float = ACTION_TIMEOUT) -> None:
+    await locator.wait_for(state="visible", timeout=timeout * TIMEOUT_SCALE)
+
+
+async def api_response(page, path: str, action, method: str | None = None,
+                       timeout: float = API_TIMEOUT):
+    """Run ``action`` (a coroutine) and wait for the ``path`` response it triggers.
+
+    ``path`` may use ``*`` for one URL segment, e.g. ``/api/doctors/*``.
+    Returns the response, or ``None`` if it never arrived; the flow's own
+    assertions decide what that means, as they did after a fixed sleep.
+    """
+    acted = False
+    try:
+        async with page.expect_response(_matcher(path, method), timeout=timeout * TIMEOUT_SCALE) as info:
+            await action
+            acted = True
+        return await info.value
+    except PlaywrightTimeoutError:
+        if not acted:
+            raise
+        return None
+
+
+async def click(locator, api: str | None = None, method: str | None = None,
+                timeout: float = ACTION_TIMEOUT):
+    """Click once the element is actionable, then wait for the fetches it caused."""
+    page = locator.page
+    tracker = track(page.context)
+    await actionable(locator, timeout)
+    acted_at = time.monotonic()
+    response = None
+    if api:
+        response = await api_response(page, api, locator.click(timeout=timeout * TIMEOUT_SCALE), method)
+    else:
+        await locator.click(timeout=timeout * TIMEOUT_SCALE)
+    await tracker.idle(since=acted_at)
+    return response
+
+
+async def fill(locator, value: str, timeout: float = ACTION_TIMEOUT) -> None:
+    """Fill once the field is actionable; controlled inputs may refetch on change."""
+    tracker = track(locator.page.context)
+    await actionable(locator, timeout)
+    acted_at = time.monotonic()
+    await locator.fill(value, timeout=timeout * TIMEOUT_SCALE)
+    await tracker.idle(since=acted_at)